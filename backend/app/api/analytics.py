@@ -0,0 +1,146 @@
+"""
+Teacher-facing aggregates, read from the user_daily_stats rollup that
+each stored session updates. A class overview is a few grouped queries
+over (students x days) rows, however long the session history is.
+"""
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_async_db
+from app.models.stats import UserDailyStat, UserStat
+from app.models.user import User
+from app.routers.auth import get_current_user
+from app.schemas.analytics import ClassOverview, DailyPoint, StudentSummary, StudentTrend
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+DEFAULT_DAYS = 30
+MAX_DAYS = 365
+
+DAILY_SUMS = [
+    func.sum(UserDailyStat.sessions).label("sessions"),
+    func.sum(UserDailyStat.wpm_total).label("wpm_total"),
+    func.sum(UserDailyStat.accuracy_total).label("accuracy_total"),
+    func.sum(UserDailyStat.words_correct).label("words_correct"),
+    func.sum(UserDailyStat.reading_seconds).label("reading_seconds"),
+]
+
+
+def _window_start(days: int):
+    # Rollup days are UTC, like sessions.created_at
+    return datetime.utcnow().date() - timedelta(days=days - 1)
+
+
+def _mean(total, sessions) -> float:
+    return round(total / sessions, 1) if sessions else 0.0
+
+
+def _daily_point(row, active_students: int = 1) -> DailyPoint:
+    return DailyPoint(
+        day=row.day,
+        sessions=row.sessions,
+        active_students=active_students,
+        avg_wpm=_mean(row.wpm_total, row.sessions),
+        avg_accuracy=_mean(row.accuracy_total, row.sessions),
+        words_correct=row.words_correct,
+        reading_minutes=round(row.reading_seconds / 60, 1),
+    )
+
+
+def _require_staff(current_user: User):
+    if current_user.role not in ("teacher", "admin"):
+        raise HTTPException(status_code=403, detail="Teacher or admin access required")
+
+
+@router.get("/class/{school_group}", response_model=ClassOverview)
+async def class_overview(
+    school_group: int,
+    days: int = Query(DEFAULT_DAYS, ge=1, le=MAX_DAYS),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Per-student summaries, the class's daily trend and its level distribution"""
+    _require_staff(current_user)
+    since = _window_start(days)
+    in_class = (User.school_group == school_group) & (User.role == "student")
+
+    students = await db.execute(
+        select(User.id, User.name, UserStat.level, UserStat.sessions, UserStat.last_wpm, UserStat.last_accuracy)
+        .outerjoin(UserStat, UserStat.user_id == User.id)
+        .where(in_class)
+        .order_by(User.name)
+    )
+    per_student = await db.execute(
+        select(UserDailyStat.user_id, func.max(UserDailyStat.day).label("last_active"), *DAILY_SUMS)
+        .join(User, User.id == UserDailyStat.user_id)
+        .where(in_class, UserDailyStat.day >= since)
+        .group_by(UserDailyStat.user_id)
+    )
+    per_day = await db.execute(
+        select(UserDailyStat.day, func.count(UserDailyStat.user_id).label("active_students"), *DAILY_SUMS)
+        .join(User, User.id == UserDailyStat.user_id)
+        .where(in_class, UserDailyStat.day >= since)
+        .group_by(UserDailyStat.day)
+        .order_by(UserDailyStat.day)
+    )
+
+    window = {row.user_id: row for row in per_student}
+    overview = ClassOverview(school_group=school_group, days=days)
+    for row in students:
+        level = row.level or 1
+        overview.level_distribution[level] = overview.level_distribution.get(level, 0) + 1
+        summary = StudentSummary(
+            user_id=row.id,
+            name=row.name,
+            level=level,
+            total_sessions=row.sessions or 0,
+            last_wpm=row.last_wpm or 0,
+            last_accuracy=row.last_accuracy or 0,
+        )
+        recent = window.get(row.id)
+        if recent is not None:
+            summary.sessions = recent.sessions
+            summary.avg_wpm = _mean(recent.wpm_total, recent.sessions)
+            summary.avg_accuracy = _mean(recent.accuracy_total, recent.sessions)
+            summary.last_active = recent.last_active
+        overview.students.append(summary)
+    overview.daily = [_daily_point(row, row.active_students) for row in per_day]
+    return overview
+
+
+@router.get("/student/{user_id}", response_model=StudentTrend)
+async def student_trend(
+    user_id: int,
+    days: int = Query(DEFAULT_DAYS, ge=1, le=MAX_DAYS),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """One student's daily WPM/accuracy trend (self, teacher, or admin only)"""
+    if current_user.id != user_id:
+        _require_staff(current_user)
+
+    student = (await db.execute(
+        select(User.id, User.name, User.school_group, UserStat.level, UserStat.sessions)
+        .outerjoin(UserStat, UserStat.user_id == User.id)
+        .where(User.id == user_id)
+    )).first()
+    if student is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    rows = await db.execute(
+        select(UserDailyStat)
+        .where(UserDailyStat.user_id == user_id, UserDailyStat.day >= _window_start(days))
+        .order_by(UserDailyStat.day)
+    )
+    return StudentTrend(
+        user_id=student.id,
+        name=student.name,
+        school_group=student.school_group,
+        days=days,
+        level=student.level or 1,
+        total_sessions=student.sessions or 0,
+        daily=[_daily_point(row) for row in rows.scalars()],
+    )
@@ -0,0 +1,68 @@
+import json
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.adaptivity import CARD_SIZE, adapt
+from app.core.cards import generate_card
+from app.core.word_index import word_index
+from app.db.database import get_async_db
+from app.models.stats import UserStat, UserWordStat, WordStat
+from app.models.user import User
+from app.models.word import Word
+from app.routers.auth import get_current_user
+from app.schemas.card import CardRead
+
+router = APIRouter(prefix="/card", tags=["card"])
+
+
+@router.get("/next", response_model=CardRead)
+async def next_card(
+    level: int = Query(None, ge=1, le=3),
+    size: int = Query(CARD_SIZE, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Adaptive next card for the current student, from precomputed word stats"""
+    if level is None:
+        user_stat = await db.get(UserStat, current_user.id)
+        level = user_stat.level if user_stat else 1
+
+    await word_index.ensure_loaded(db)
+    pool = word_index.texts(level)
+
+    user_rows = await db.execute(
+        select(UserWordStat.word, UserWordStat.attempts, UserWordStat.errors)
+        .where(UserWordStat.user_id == current_user.id)
+    )
+    word_rows = await db.execute(
+        select(WordStat.word, WordStat.attempts, WordStat.errors)
+        .join(Word, Word.text == WordStat.word)
+        .where(Word.difficulty_level == level)
+    )
+
+    card = adapt(
+        pool,
+        {word: (attempts, errors) for word, attempts, errors in user_rows},
+        {word: (attempts, errors) for word, attempts, errors in word_rows},
+        size=size,
+    )
+    return {"level": level, **card}
+
+
+@router.get("/generate", response_model=CardRead)
+async def generate(
+    test_id: int = Query(..., ge=0),
+    level: int = Query(..., ge=1, le=3),
+    size: int = Query(CARD_SIZE, ge=1, le=200),
+):
+    """One card, reproducible by test_id (replaces downloading dmt_tests.json)"""
+    card = {"test_id": test_id, "level": level, "words": generate_card(test_id, level, size), "review_words": []}
+    # Serialize directly: response_model validation would cost more than generating the card.
+    # Same inputs always give the same card, so browsers may keep it
+    return Response(
+        content=json.dumps(card, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=86400"},
+    )
@@ -0,0 +1,54 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.leaderboard import current_week, leaderboards, week_start
+from app.db.database import get_async_db
+from app.models.stats import UserStat
+from app.models.user import User
+from app.routers.auth import get_current_user
+from app.schemas.leaderboard import LeaderboardRead, LeaderboardRow
+
+router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
+
+DEFAULT_TOP = 10
+MAX_TOP = 100
+
+
+@router.get("/", response_model=LeaderboardRead)
+async def get_leaderboard(
+    level: Optional[int] = Query(None, ge=1, le=3),
+    week: Optional[date] = Query(None, description="Any day of the week; defaults to this week"),
+    school_group: Optional[int] = Query(None, ge=1, le=8),
+    limit: int = Query(DEFAULT_TOP, ge=1, le=MAX_TOP),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Top WPM in a group for one week and DMT level, plus the caller's own rank.
+    Students see their own group; teachers and admins pick one.
+    """
+    if current_user.role in ("teacher", "admin"):
+        school_group = school_group or current_user.school_group
+    else:
+        school_group = current_user.school_group
+    if school_group is None:
+        raise HTTPException(status_code=400, detail="school_group is required")
+    if level is None:
+        user_stat = await db.get(UserStat, current_user.id)
+        level = user_stat.level if user_stat else 1
+    week = week_start(week) if week else current_week()
+
+    board = await leaderboards.board(db, week, school_group, level)
+    names = leaderboards.names
+    entries = [
+        LeaderboardRow(rank=rank, user_id=user_id, name=names.get(user_id, ""), wpm=wpm)
+        for rank, user_id, wpm in board.top(limit)
+    ]
+    me = None
+    mine = board.rank(current_user.id)
+    if mine is not None:
+        me = LeaderboardRow(rank=mine[0], user_id=current_user.id, name=current_user.name, wpm=mine[1])
+    return LeaderboardRead(school_group=school_group, week=week, level=level, size=len(board), entries=entries, me=me)
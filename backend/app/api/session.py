@@ -1,9 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from datetime import datetime
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+import base64
 
-from app.db.database import get_db
+from app.core.export import (
+    COLUMNS, ENCODERS, EXPORT_BATCH_SIZE, MEDIA_TYPES, WORD_COLUMNS, ExportUnavailable, check_available,
+)
+from app.core.scoring import score_alignment, score_cards
+from app.db.database import AsyncSessionLocal, get_async_db
+from app.db.sessions import save_reading_session
 from app.models.session import ReadingSession
 from app.models.user import User
 from app.schemas.session import SessionCreate, SessionRead
@@ -11,51 +19,201 @@ from app.routers.auth import get_current_user
 
 router = APIRouter(prefix="/session", tags=["session"])
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Columns returned by ?summary=true (everything except the word arrays)
+SUMMARY_COLUMNS = [
+    ReadingSession.id,
+    ReadingSession.user_id,
+    ReadingSession.created_at,
+    ReadingSession.duration_seconds,
+    ReadingSession.total_words,
+    ReadingSession.correct_words,
+    ReadingSession.errors,
+    ReadingSession.self_corrections,
+    ReadingSession.wpm,
+    ReadingSession.accuracy,
+    ReadingSession.level,
+]
+
+
+def _encode_cursor(created_at: datetime, session_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{session_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str):
+    try:
+        created_at, session_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(session_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def _session_page(db: AsyncSession, user_id: int, limit: Optional[int], cursor: Optional[str], summary: bool, response: Response):
+    """
+    One page of a user's sessions, newest first, keyset-paginated on
+    (created_at, id) so the cost stays O(page) however long the history is.
+    The cursor for the next page is returned in the X-Next-Cursor header.
+
+    Without limit or cursor the whole history is returned, as before paging
+    existed, so clients that don't follow X-Next-Cursor lose nothing.
+    """
+    if limit is None and cursor:
+        limit = DEFAULT_PAGE_SIZE
+    query = select(*SUMMARY_COLUMNS) if summary else select(ReadingSession)
+    query = query.where(ReadingSession.user_id == user_id)
+    if cursor:
+        created_at, session_id = _decode_cursor(cursor)
+        query = query.where(or_(
+            ReadingSession.created_at < created_at,
+            and_(ReadingSession.created_at == created_at, ReadingSession.id < session_id),
+        ))
+    query = query.order_by(ReadingSession.created_at.desc(), ReadingSession.id.desc())
+    if limit is not None:
+        query = query.limit(limit + 1)
+
+    result = await db.execute(query)
+    rows = [dict(row) for row in result.mappings()] if summary else result.scalars().all()
+
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        if summary:
+            response.headers["X-Next-Cursor"] = _encode_cursor(last["created_at"], last["id"])
+        else:
+            response.headers["X-Next-Cursor"] = _encode_cursor(last.created_at, last.id)
+    return rows
+
 
 @router.post("/", response_model=SessionRead)
-def create_session(
+async def create_session(
     session_data: SessionCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    # Calculate derived stats if not provided? 
-    # For now trust the client but overwrite user_id
-    
-    session = ReadingSession(
-        user_id=current_user.id,
-        total_words=session_data.total_words,
-        correct_words=session_data.correct_words,
-        duration_seconds=session_data.duration_seconds,
-        errors=session_data.errors,
-        self_corrections=session_data.self_corrections,
-        wpm=session_data.wpm,
-        accuracy=session_data.accuracy,
-        words_presented=session_data.words_presented,
-        words_read=session_data.words_read,
-        created_at=datetime.utcnow()
+    # Always overwrite user_id. Whenever card words are sent we score the
+    # transcripts ourselves; the client's counts are only kept for sessions
+    # scored by hand, where there is no transcript
+    posted = session_data.cards
+    if not posted and session_data.words_presented:
+        posted = [session_data]
+    cards = [(card.words_presented, card.words_read, card.duration_seconds) for card in posted]
+
+    card_metrics = ()
+    level = session_data.level
+    if cards:
+        readings, metrics = score_cards(cards)
+        duration_seconds = sum(duration for _, _, duration in cards)
+        words_presented = [w for presented, _, _ in cards for w in presented]
+        words_read = [w for _, read, _ in cards for w in read]
+        # Each card ranks at its own level with its own WPM
+        card_metrics = [
+            {"level": card.level, "duration_seconds": card.duration_seconds,
+             **score_alignment(alignment, card.duration_seconds)}
+            for card, (_, alignment) in zip(posted, readings)
+        ]
+        level = posted[0].level if len(posted) == 1 else None
+    else:
+        readings = ()
+        metrics = {
+            "total_words": session_data.total_words,
+            "correct_words": session_data.correct_words,
+            "errors": session_data.errors,
+            "self_corrections": session_data.self_corrections,
+            "wpm": session_data.wpm,
+            "accuracy": session_data.accuracy,
+        }
+        duration_seconds = session_data.duration_seconds
+        words_presented, words_read = [], session_data.words_read
+
+    return await save_reading_session(
+        db,
+        current_user,
+        duration_seconds,
+        words_presented,
+        words_read,
+        metrics,
+        readings,
+        level=level,
+        cards=card_metrics,
     )
 
-    db.add(session)
-    db.commit()
-    db.refresh(session)
 
-    return session
+def _export_query(start, end, school_group, user_id, include_words):
+    columns = [User.school_group if name == "school_group" else getattr(ReadingSession, name) for name in COLUMNS]
+    if include_words:
+        columns += [getattr(ReadingSession, name) for name in WORD_COLUMNS]
+    query = select(*columns).join(User, User.id == ReadingSession.user_id)
+    if start:
+        query = query.where(ReadingSession.created_at >= datetime.combine(start, time.min))
+    if end:
+        query = query.where(ReadingSession.created_at < datetime.combine(end + timedelta(days=1), time.min))
+    if school_group is not None:
+        query = query.where(User.school_group == school_group)
+    if user_id is not None:
+        query = query.where(ReadingSession.user_id == user_id)
+    return query.order_by(ReadingSession.id)
+
+
+async def _export_batches(query):
+    # Own session: a dependency's session is closed before a streamed body is sent
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for partition in result.partitions(EXPORT_BATCH_SIZE):
+            yield partition
+
 
+@router.get("/export")
+async def export_sessions(
+    format: str = Query("csv", regex="^(csv|ndjson|parquet|arrow)$"),
+    start: Optional[date] = Query(None, description="First day (UTC), inclusive"),
+    end: Optional[date] = Query(None, description="Last day (UTC), inclusive"),
+    school_group: Optional[int] = Query(None, ge=1, le=8),
+    user_id: Optional[int] = Query(None),
+    include_words: bool = Query(False),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream sessions as CSV, NDJSON, Parquet or an Arrow IPC stream, oldest
+    first, in constant memory. Teachers and admins export any group or
+    student; students only their own sessions.
+    """
+    if current_user.role not in ("teacher", "admin"):
+        if user_id not in (None, current_user.id):
+            raise HTTPException(status_code=403, detail="Not authorized to export other users' sessions")
+        user_id, school_group = current_user.id, None
+    try:
+        check_available(format)
+    except ExportUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
 
-@router.get("/me", response_model=List[SessionRead])
-def get_user_sessions(
+    columns = list(COLUMNS) + (list(WORD_COLUMNS) if include_words else [])
+    batches = _export_batches(_export_query(start, end, school_group, user_id, include_words))
+    filename = "sessions" + "".join(f"-{part}" for part in (start, end) if part) + f".{format}"
+    return StreamingResponse(
+        ENCODERS[format](batches, columns),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# exclude_unset drops the word arrays from ?summary=true rows
+@router.get("/me", response_model=List[SessionRead], response_model_exclude_unset=True)
+async def get_user_sessions(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    summary: bool = Query(False),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all sessions for the current authenticated user"""
+    """Get the current user's sessions (one page at a time with ?limit / ?cursor)"""
     try:
-        sessions = (
-            db.query(ReadingSession)
-            .filter(ReadingSession.user_id == current_user.id)
-            .order_by(ReadingSession.created_at.desc())
-            .all()
-        )
-        return sessions
+        return await _session_page(db, current_user.id, limit, cursor, summary, response)
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         print(f"Error fetching user sessions: {str(e)}")
@@ -63,17 +221,19 @@ def get_user_sessions(
         # Return empty list instead of crashing
         return []
 
-@router.get("/user/{user_id}", response_model=list[SessionRead])
-def get_sessions_for_user(user_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    """Get sessions for a specific user (self, teacher, or admin only)"""
+@router.get("/user/{user_id}", response_model=list[SessionRead], response_model_exclude_unset=True)
+async def get_sessions_for_user(
+    user_id: int,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    summary: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a user's sessions, optionally paged (self, teacher, or admin only)"""
     # Check authorization: must be self, teacher, or admin
     if current_user.id != user_id and current_user.role not in ["admin", "teacher"]:
         raise HTTPException(status_code=403, detail="Not authorized to view other users' sessions")
     
-    sessions = (
-        db.query(ReadingSession)
-        .filter(ReadingSession.user_id == user_id)
-        .order_by(ReadingSession.created_at.desc())
-        .all()
-    )
-    return sessions
+    return await _session_page(db, user_id, limit, cursor, summary, response)
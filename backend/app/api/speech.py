@@ -1,75 +1,250 @@
 """
-Speech-to-Text WebSocket Proxy for Deepgram
+Speech-to-Text WebSocket Proxy for Deepgram (or another speech backend)
 Keeps API key secure on the server side
 """
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from starlette.websockets import WebSocketState
 import websockets
 import asyncio
+import itertools
+import json
 import os
-from dotenv import load_dotenv
+import time
 
-load_dotenv()
+from app.core.audio_buffer import AudioBuffer
+from app.core.scoring import LiveScorer
+from app.core.metrics import Histogram
+from app.core.speech_backends import DEEPGRAM_API_KEY, get_speech_backend
+from app.core.speech_pool import get_speech_pool
+from app.db.database import AsyncSessionLocal
+from app.schemas.session import MAX_SESSION_WORDS
+from app.routers.auth import get_current_user
 
 router = APIRouter(prefix="/api/speech", tags=["speech"])
 
-DEEPGRAM_API_KEY = os.getenv("DEEPGRAM_API_KEY", "")
-DEEPGRAM_URL = "wss://api.deepgram.com/v1/listen?model=nova-2&language=nl&smart_format=true&interim_results=false"
+# How long to wait for the last transcripts after the reader stops sending audio
+UPSTREAM_DRAIN_SECONDS = float(os.getenv("SPEECH_UPSTREAM_DRAIN_SECONDS", "3"))
+# How long a live-mode client may take to send its start message
+LIVE_START_TIMEOUT_SECONDS = float(os.getenv("SPEECH_LIVE_START_TIMEOUT_SECONDS", "10"))
+
+
+class ConnectionStats:
+    """Per-reader counters, listed live on /api/speech/stats"""
+
+    def __init__(self, connection_id: int, buffer: AudioBuffer):
+        self.id = connection_id
+        self.buffer = buffer
+        self.opened = time.monotonic()
+        self.warm_upstream = None
+        self.first_audio_sent = None
+        self.bytes_in = 0       # audio from the browser
+        self.bytes_up = 0       # audio sent upstream (after drops)
+        self.bytes_out = 0      # transcripts sent to the browser
+        self.messages_out = 0
+        self.upstream_send = Histogram()   # seconds per upstream send
+        self.transcript_lag = Histogram()  # wall clock behind the audio a result covers
+
+    def observe_transcript(self, message: str):
+        if self.first_audio_sent is None:
+            return
+        try:
+            result = json.loads(message)
+            audio_end = result["start"] + result["duration"]
+        except (ValueError, KeyError, TypeError):
+            return
+        self.transcript_lag.observe(max(0.0, time.monotonic() - self.first_audio_sent - audio_end))
+
+    def snapshot(self) -> dict:
+        b = self.buffer
+        return {
+            "id": self.id,
+            "warm_upstream": self.warm_upstream,
+            "age_seconds": round(time.monotonic() - self.opened, 1),
+            "bytes_in": self.bytes_in,
+            "bytes_up": self.bytes_up,
+            "bytes_out": self.bytes_out,
+            "messages_out": self.messages_out,
+            "queue_depth": b.depth,
+            "queue_bytes": b.size,
+            "max_queue_bytes": b.max_size,
+            "frames_up": b.frames,
+            "chunks_in": b.chunks_in,
+            "dropped_chunks": b.dropped_chunks,
+            "dropped_bytes": b.dropped_bytes,
+            "blocked_seconds": round(b.blocked_seconds, 3),
+            "upstream_send_p95_ms": round(self.upstream_send.percentile(0.95) * 1000, 3),
+            "transcript_lag_p95_ms": round(self.transcript_lag.percentile(0.95) * 1000, 3),
+        }
+
+
+_connection_ids = itertools.count(1)
+_live_connections = {}  # id -> ConnectionStats
+
+
+def _final_transcript(message: str) -> str:
+    """Transcript text of a final Deepgram result, else an empty string"""
+    try:
+        result = json.loads(message)
+        if result.get("type") == "Results" and result.get("is_final", True):
+            return result["channel"]["alternatives"][0]["transcript"]
+    except (ValueError, KeyError, IndexError, TypeError, AttributeError):
+        pass
+    return ""
+
+
+async def _authenticate(token: str):
+    async with AsyncSessionLocal() as db:
+        return await get_current_user(token=token, db=db)
 
 
 @router.websocket("/transcribe")
-async def websocket_transcribe(websocket: WebSocket):
+async def websocket_transcribe(websocket: WebSocket, mode: str = "relay"):
     """
-    WebSocket endpoint that proxies audio to Deepgram.
-    Client sends audio chunks, we forward to Deepgram and send back transcripts.
+    WebSocket endpoint that proxies audio to the speech backend (Deepgram).
+    Client sends audio chunks, we forward them upstream and send back transcripts.
+    Audio passes through a bounded AudioBuffer so a slow upstream applies
+    backpressure to this reader instead of growing memory.
+
+    mode=live: the client first sends {"type": "start", "token": "<JWT>",
+    "words": [...card...]} (the token is sent in a message, not the URL, to
+    keep it out of access logs). Transcripts are aligned here and only
+    compact progress deltas are sent back. {"type": "stop",
+    "duration_seconds": n} ends the card: it is scored and the metrics are
+    returned in a final message, with the transcript tokens. Nothing is
+    stored per card; the client posts each card's words and transcript
+    through POST /session/ once the test is done, and they are scored again
+    there.
     """
     await websocket.accept()
-    
-    if not DEEPGRAM_API_KEY:
+
+    backend = get_speech_backend()
+    if not backend.configured:
         await websocket.send_json({"error": "Deepgram API key not configured"})
         await websocket.close()
         return
-    
-    deepgram_ws = None
-    
+
+    user = None
+    scorer = None
+    start = {}  # the client's start message (token, card words)
+    if mode == "live":
+        try:
+            start = await asyncio.wait_for(websocket.receive_json(), LIVE_START_TIMEOUT_SECONDS)
+            if not isinstance(start, dict) or start.get("type") != "start":
+                raise ValueError("expected a start message")
+            words = start.get("words")
+            if (not isinstance(words, list) or len(words) > MAX_SESSION_WORDS
+                    or not all(isinstance(w, str) for w in words)):
+                raise ValueError(f"words must be a list of at most {MAX_SESSION_WORDS} strings")
+            user = await _authenticate(start.get("token") or "")
+        except (HTTPException, WebSocketDisconnect, asyncio.TimeoutError, ValueError, KeyError) as e:
+            error = f"Invalid start message: {e}" if isinstance(e, ValueError) else "Could not validate credentials"
+            try:
+                await websocket.send_json({"error": error})
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            except Exception:
+                pass
+            return
+        scorer = LiveScorer(words)
+
+    upstream = None
+    buffer = AudioBuffer()
+    stats = ConnectionStats(next(_connection_ids), buffer)
+    _live_connections[stats.id] = stats
+    stop = {}  # the client's stop message, once received
+
     try:
-        # Connect to Deepgram with API key in header
-        extra_headers = {
-            "Authorization": f"Token {DEEPGRAM_API_KEY}"
-        }
-        
-        deepgram_ws = await websockets.connect(
-            DEEPGRAM_URL,
-            extra_headers=extra_headers
-        )
-        
-        print("[Speech] Connected to Deepgram")
-        
+        # Usually a pre-warmed session, so the handshake isn't in the countdown
+        upstream, stats.warm_upstream = await get_speech_pool().acquire()
+
+        print(f"[Speech] Connected to {backend.name} ({'warm' if stats.warm_upstream else 'cold'})")
+
+        async def send_to_client(text: str):
+            if websocket.client_state != WebSocketState.CONNECTED:
+                return  # reader left; still drain the final results
+            await websocket.send_text(text)
+            stats.bytes_out += len(text)
+            stats.messages_out += 1
+
         async def forward_to_client():
-            """Forward Deepgram responses to client"""
+            """Forward transcripts (or, in live mode, progress deltas) to client"""
             try:
-                async for message in deepgram_ws:
-                    await websocket.send_text(message)
+                async for message in upstream:
+                    stats.observe_transcript(message)
+                    if user is None:
+                        await send_to_client(message)
+                        continue
+                    transcript = _final_transcript(message)
+                    delta = scorer.add_transcript(transcript) if transcript else None
+                    if delta:
+                        await send_to_client(json.dumps(delta))
             except Exception as e:
-                print(f"[Speech] Deepgram receive error: {e}")
-        
-        async def forward_to_deepgram():
-            """Forward client audio to Deepgram"""
+                print(f"[Speech] Upstream receive error: {e}")
+
+        async def receive_audio():
+            """Queue client audio; blocks here while the buffer is over its high watermark"""
             try:
                 while True:
-                    data = await websocket.receive_bytes()
-                    await deepgram_ws.send(data)
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        raise WebSocketDisconnect(message.get("code", 1000))
+                    data = message.get("bytes")
+                    if data is not None:
+                        stats.bytes_in += len(data)
+                        await buffer.put(data)
+                        continue
+                    control = json.loads(message.get("text") or "{}")
+                    if control.get("type") == "stop":
+                        stop.update(control)
+                        return
             except WebSocketDisconnect:
                 print("[Speech] Client disconnected")
             except Exception as e:
                 print(f"[Speech] Client receive error: {e}")
-        
-        # Run both directions concurrently
-        await asyncio.gather(
-            forward_to_client(),
-            forward_to_deepgram(),
-            return_exceptions=True
-        )
-        
+            finally:
+                buffer.close()
+
+        async def forward_upstream():
+            """Send coalesced audio frames upstream until the client is done"""
+            while True:
+                frame = await buffer.get()
+                if frame is None:
+                    return
+                started = time.monotonic()
+                await upstream.send(frame)
+                stats.upstream_send.observe(time.monotonic() - started)
+                if stats.first_audio_sent is None:
+                    stats.first_audio_sent = started
+                stats.bytes_up += len(frame)
+
+        receiver = asyncio.ensure_future(receive_audio())
+        sender = asyncio.ensure_future(forward_upstream())
+        relay = asyncio.ensure_future(forward_to_client())
+        try:
+            done, _ = await asyncio.wait({sender, relay}, return_when=asyncio.FIRST_COMPLETED)
+            if sender in done and sender.exception() is None:
+                # Client finished; give the recognizer a moment to return the last results
+                try:
+                    await upstream.send(json.dumps({"type": "CloseStream"}))
+                    await asyncio.wait_for(asyncio.shield(relay), UPSTREAM_DRAIN_SECONDS)
+                except (asyncio.TimeoutError, websockets.ConnectionClosed):
+                    pass
+        finally:
+            # Upstream gone or drained: stop reading audio nobody will transcribe
+            for task in (receiver, sender, relay):
+                task.cancel()
+
+        # Only a card the reader finished (explicit stop) is scored
+        if scorer is not None and stop and websocket.client_state == WebSocketState.CONNECTED:
+            duration = stop.get("duration_seconds")
+            if not isinstance(duration, (int, float)) or duration <= 0:
+                duration = time.monotonic() - (stats.first_audio_sent or stats.opened)
+            duration = int(round(duration))
+            _, metrics = scorer.finish(duration)
+            await send_to_client(json.dumps({
+                "type": "final", "duration_seconds": duration, "words_read": scorer.words_read, **metrics,
+            }))
+            await websocket.close()
+
     except Exception as e:
         print(f"[Speech] Connection error: {e}")
         try:
@@ -77,15 +252,31 @@ async def websocket_transcribe(websocket: WebSocket):
         except:
             pass
     finally:
-        if deepgram_ws:
-            await deepgram_ws.close()
-        print("[Speech] Connection closed")
+        buffer.close()
+        _live_connections.pop(stats.id, None)
+        if upstream:
+            await upstream.close()
+        print(f"[Speech] Connection closed: {stats.snapshot()}")
 
 
 @router.get("/health")
 async def speech_health():
     """Check if speech service is configured"""
+    backend = get_speech_backend()
     return {
-        "status": "ok" if DEEPGRAM_API_KEY else "not_configured",
+        "status": "ok" if backend.configured else "not_configured",
+        "backend": backend.name,
         "has_api_key": bool(DEEPGRAM_API_KEY)
     }
+
+
+@router.get("/stats")
+async def speech_stats():
+    """Live per-connection buffer and throughput counters"""
+    connections = [s.snapshot() for s in _live_connections.values()]
+    return {
+        "active_connections": len(connections),
+        "queued_bytes": sum(c["queue_bytes"] for c in connections),
+        "upstream_pool": get_speech_pool().stats(),
+        "connections": connections,
+    }
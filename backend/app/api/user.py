@@ -1,54 +1,139 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.models.user import User                  # SQLAlchemy
-from app.schemas.user import UserCreate, UserRead # Pydantic
+from app.schemas.user import UserCreate, UserRead, RosterImportReport # Pydantic
+from app.schemas.word import BulkRowError
+from app.core.ingest import RowError, iter_records
 from app.routers.auth import get_current_user
+from app.core.user_cache import user_cache
 
 router = APIRouter(prefix="/user", tags=["user"])
 
 
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async, get_password_hashes_async
+
+# A whole school is ~500 students; anything far beyond that is a mistake
+MAX_ROSTER_ROWS = 2000
 
 @router.post("/", response_model=UserRead)
-def create_user(user: UserCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     """Create a new user (admin only)"""
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    existing_user = db.query(User).filter(User.email == user.email).first()
-    if existing_user:
+    result = await db.execute(select(User).where(User.email == user.email))
+    if result.scalars().first():
         raise HTTPException(status_code=400, detail="User with this email already exists")
 
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(
         name=user.name,
         email=user.email,
         hashed_password=hashed_password,
-        age=user.age,
         school_group=user.school_group,
         role=user.role
     )
 
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    user_cache.invalidate_email(db_user.email)
 
     return db_user
 
 
 @router.get("/", response_model=list[UserRead])
-def list_users(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def list_users(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     """List all users (admin only)"""
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
-    return db.query(User).all()
+    result = await db.execute(select(User))
+    return result.scalars().all()
+
+
+@router.post("/roster", response_model=RosterImportReport)
+async def import_roster(
+    request: Request,
+    school_group: int = Query(..., ge=1, le=8),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Create a class of students from a CSV (name,email,password header).
+    Emails are checked with one query, passwords are hashed in parallel on
+    the hashing pool and all new users are inserted in one transaction.
+    Rows whose email already exists are reported and skipped.
+    """
+    if current_user.role not in ("teacher", "admin"):
+        raise HTTPException(status_code=403, detail="Teacher or admin access required")
+
+    report = RosterImportReport()
+    students = []
+    seen = set()
+    async for line_no, record in iter_records(request.stream(), "csv"):
+        if len(students) + len(report.errors) >= MAX_ROSTER_ROWS:
+            raise HTTPException(status_code=413, detail=f"Roster is limited to {MAX_ROSTER_ROWS} rows")
+        if isinstance(record, RowError):
+            report.errors.append(BulkRowError(line=line_no, error=str(record)))
+            continue
+        try:
+            student = UserCreate(
+                name=(record.get("name") or "").strip(),
+                email=(record.get("email") or "").strip(),
+                password=record.get("password") or "",
+                school_group=school_group,
+                role="student",
+            )
+        except ValidationError as e:
+            report.errors.append(BulkRowError(
+                line=line_no,
+                error="; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            ))
+            continue
+        if not student.name or not student.password:
+            report.errors.append(BulkRowError(line=line_no, error="name and password are required"))
+            continue
+        if student.email in seen:
+            report.errors.append(BulkRowError(line=line_no, error="email appears earlier in the roster"))
+            continue
+        seen.add(student.email)
+        students.append(student)
+
+    if students:
+        result = await db.execute(select(User.email).where(User.email.in_([s.email for s in students])))
+        taken = set(result.scalars())
+        report.existing = sorted(taken)
+        students = [s for s in students if s.email not in taken]
+
+    if students:
+        hashes = await get_password_hashes_async([s.password for s in students])
+        new_users = [
+            User(
+                name=s.name,
+                email=s.email,
+                hashed_password=hashed,
+                school_group=s.school_group,
+                role=s.role
+            )
+            for s, hashed in zip(students, hashes)
+        ]
+        db.add_all(new_users)
+        await db.commit()
+        for new_user in new_users:
+            user_cache.invalidate_email(new_user.email)
+        report.created = new_users
+
+    return report
 
 
 @router.get("/{user_id}", response_model=UserRead)
-def get_user(user_id: int, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
+async def get_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalars().first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -1,31 +1,119 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.ingest import RowError, detect_format, iter_records
+from app.core.matcher import add_vocabulary_words
+from app.core.word_index import word_index
+from app.db.database import get_async_db
 from app.models.word import Word
-from app.schemas.word import WordRead, WordCreate
+from app.schemas.word import WordRead, WordCreate, BulkImportReport, BulkRowError
+
+BULK_BATCH_SIZE = 1000
+# Cap the per-row report so a garbage upload can't produce a huge response
+MAX_REPORTED_ERRORS = 1000
 
 router = APIRouter(prefix="/word", tags=["word"])
 
+
+def _cached_response(request: Request, cached):
+    """Pre-serialized body with its ETag; 304 if the client already has it"""
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match == "*" or cached.etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
 @router.get("/", response_model=list[WordRead])
-def list_words(level: int = Query(None), db: Session = Depends(get_db)):
-    query = db.query(Word)
-    if level:
-        query = query.filter(Word.difficulty_level == level)
-    return query.all()
+async def list_words(
+    request: Request,
+    level: int = Query(None),
+    tag: str = Query(None),
+    length: int = Query(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    await word_index.ensure_loaded(db)
+    return _cached_response(request, word_index.list_body(level, tag, length))
 
 @router.get("/{word_id}", response_model=WordRead)
-def get_word(word_id: int, db: Session = Depends(get_db)):
-    return db.query(Word).filter(Word.id == word_id).first()
+async def get_word(word_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    await word_index.ensure_loaded(db)
+    cached = word_index.item_body(word_id)
+    if cached is None:
+        raise HTTPException(status_code=404, detail="Word not found")
+    return _cached_response(request, cached)
 
 @router.post("/", response_model=WordRead)
-def create_word(word: WordCreate, db: Session = Depends(get_db)):
+async def create_word(word: WordCreate, db: AsyncSession = Depends(get_async_db)):
     db_word = Word(
         text=word.text,
         difficulty_level=word.difficulty_level,
-        pattern_tags=word.pattern_tags
+        pattern_tags=word.pattern_tags,
+        syllables=word.syllables,
+        frequency_rank=word.frequency_rank
     )
     db.add(db_word)
-    db.commit()
-    db.refresh(db_word)
+    await db.commit()
+    await db.refresh(db_word)
+    word_index.invalidate()
+    add_vocabulary_words([db_word.text])
     return db_word
 
+
+@router.post("/bulk", response_model=BulkImportReport)
+async def bulk_create_words(
+    request: Request,
+    format: str = Query(None, regex="^(csv|ndjson)$"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Stream a CSV (text,difficulty_level,pattern_tags header) or NDJSON body.
+    Rows are validated as they arrive, words already in the table or earlier
+    in the upload are skipped, and inserts are committed in batches.
+    """
+    await word_index.ensure_loaded(db)
+    seen = {w["text"] for w in word_index.by_id.values()}
+    report = BulkImportReport()
+    batch = []
+    new_texts = []
+
+    async def flush():
+        if batch:
+            await db.execute(insert(Word), batch)
+            await db.commit()
+            report.inserted += len(batch)
+            new_texts.extend(row["text"] for row in batch)
+            batch.clear()
+
+    def reject(line_no, error):
+        if len(report.errors) < MAX_REPORTED_ERRORS:
+            report.errors.append(BulkRowError(line=line_no, error=error))
+
+    fmt = detect_format(request.headers.get("content-type"), format)
+    async for line_no, record in iter_records(request.stream(), fmt):
+        if isinstance(record, RowError):
+            reject(line_no, str(record))
+            continue
+        try:
+            word = WordCreate(**{k: v for k, v in record.items() if v not in ("", None)})
+        except ValidationError as e:
+            reject(line_no, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+            continue
+        text = word.text.strip()
+        if not text or "\n" in text or word.difficulty_level not in (1, 2, 3):
+            reject(line_no, "text must be a single non-empty line and difficulty_level 1, 2 or 3")
+            continue
+        if text in seen:
+            report.duplicates += 1
+            continue
+        seen.add(text)
+        batch.append({**word.dict(), "text": text})
+        if len(batch) >= BULK_BATCH_SIZE:
+            await flush()
+    await flush()
+
+    if new_texts:
+        word_index.invalidate()
+        add_vocabulary_words(new_texts)
+    return report
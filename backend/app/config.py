@@ -11,6 +11,14 @@ class Settings(BaseSettings):
         default=f"sqlite:///{os.path.join(BASE_DIR, 'dmt.db')}",
         env="DATABASE_URL"
     )
+    # "default" keeps SQLite's stock rollback journal; "production" turns on
+    # WAL + tuned pragmas and a persistent connection pool (see db/database.py)
+    sqlite_mode: str = Field(default="default", env="SQLITE_MODE")
+    sqlite_busy_timeout_ms: int = Field(default=5000, env="SQLITE_BUSY_TIMEOUT_MS")
+    sqlite_mmap_size: int = Field(default=64 * 1024 * 1024, env="SQLITE_MMAP_SIZE")
+    sqlite_cache_size_kb: int = Field(default=16 * 1024, env="SQLITE_CACHE_SIZE_KB")
+    db_pool_size: int = Field(default=5, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, env="DB_MAX_OVERFLOW")
     secret_key: str = Field(
         default="your_secret_key_here",
         env="SECRET_KEY"
@@ -23,6 +31,3 @@ class Settings(BaseSettings):
 
 # Instantiate a single settings object
 settings = Settings()
-
-# Log the database path on startup (helps debug)
-print(f"[Config] Using database: {settings.database_url}")
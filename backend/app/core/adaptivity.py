@@ -1,2 +1,93 @@
-def adapt():
-    return {}
+"""
+Adaptive word selection for the next DMT card.
+
+Works purely from precomputed counters (see models/stats.py): a student's
+per-word attempts/errors and the same counters across all students. Error
+rates are smoothed towards the word's global rate so a single slip on a
+word doesn't dominate, and unseen words borrow the global rate outright.
+"""
+import random
+from collections import Counter
+
+CARD_SIZE = 120
+
+# Share of the card reserved for words this student tends to get wrong
+REVIEW_SHARE = 0.3
+# Pseudo-attempts given to the global rate when smoothing a student's rate
+PRIOR_WEIGHT = 2
+# A word only counts as "needs review" above this smoothed error rate
+REVIEW_THRESHOLD = 0.2
+
+LEVEL_UP_ACCURACY = 95
+LEVEL_DOWN_ACCURACY = 75
+# Don't move levels on a card the student barely started
+LEVEL_MIN_ATTEMPTED = 20
+MAX_LEVEL = 3
+
+
+def word_outcomes(card_words, alignment):
+    """Per-word attempts and errors for the part of the card that was read"""
+    missed = {ci for op, ci, _ in alignment.ops if op in ("substitution", "skip")}
+    attempts, errors = Counter(), Counter()
+    for i in range(alignment.attempted):
+        word = card_words[i]
+        attempts[word] += 1
+        if i in missed:
+            errors[word] += 1
+    return attempts, errors
+
+
+def next_level(level, accuracy, attempted):
+    """Move one level up or down based on the card just read (accuracy in %)"""
+    if attempted < LEVEL_MIN_ATTEMPTED:
+        return level
+    if accuracy >= LEVEL_UP_ACCURACY:
+        return min(level + 1, MAX_LEVEL)
+    if accuracy < LEVEL_DOWN_ACCURACY:
+        return max(level - 1, 1)
+    return level
+
+
+def global_error_rate(attempts, errors):
+    # ~10% until a word has real data behind it
+    return (errors + 1) / (attempts + 10)
+
+
+def smoothed_error_rate(attempts, errors, prior):
+    return (errors + PRIOR_WEIGHT * prior) / (attempts + PRIOR_WEIGHT)
+
+
+def adapt(pool, user_word_stats, word_stats, size=CARD_SIZE, rng=None):
+    """
+    Pick the next card from pool.
+
+    user_word_stats and word_stats map word -> (attempts, errors).
+    Returns {"words": [...], "review_words": [...]}.
+    """
+    rng = rng or random.Random()
+    pool = list(dict.fromkeys(pool))
+    size = min(size, len(pool))
+
+    scored = []
+    for word in pool:
+        g_attempts, g_errors = word_stats.get(word, (0, 0))
+        prior = global_error_rate(g_attempts, g_errors)
+        u_attempts, u_errors = user_word_stats.get(word, (0, 0))
+        scored.append((smoothed_error_rate(u_attempts, u_errors, prior), u_attempts, word))
+
+    # Review: the student's weakest words they've actually met before
+    review_candidates = sorted(
+        (s for s in scored if s[1] > 0 and s[0] >= REVIEW_THRESHOLD),
+        key=lambda s: -s[0],
+    )
+    review = [word for _, _, word in review_candidates[:int(size * REVIEW_SHARE)]]
+
+    # Fill the rest with the least-practised words, random among equals
+    chosen = set(review)
+    fresh = [s for s in scored if s[2] not in chosen]
+    rng.shuffle(fresh)
+    fresh.sort(key=lambda s: s[1])
+    words = review + [word for _, _, word in fresh[:size - len(review)]]
+    rng.shuffle(words)
+
+    return {"words": words, "review_words": review}
@@ -0,0 +1,200 @@
+"""
+Server-side alignment of recognized speech against a DMT card.
+
+Children read a card top to bottom, so instead of a full O(card x spoken)
+edit-distance table we walk the card with a cursor and a short lookahead.
+Each recognized token either matches the word at (or just past) the
+cursor, repeats the previous word, or is held as a pending misread until
+the next match tells us whether it was a substitution, an insertion or a
+self-correction. The walk is linear in the number of spoken tokens.
+
+When the window misses, the reader may have skipped a row or misread a
+run of words. Two consecutive pending tokens that match two consecutive
+card words further on re-anchor the cursor there (a single word is too
+weak: short words recur across a card). Only missed tokens pay for that
+scan.
+"""
+import re
+from functools import lru_cache
+from typing import Callable, NamedTuple, Optional
+
+# How many card words a reader may skip before a match needs a two-word anchor
+LOOKAHEAD = 4
+
+FILLERS = {"eh", "euh", "uh", "uhm", "ehm", "hm", "hmm", "mm"}
+
+_PUNCTUATION = re.compile(r"[.,/#!$%^&*;:{}=\-_`~()?'\"\s]")
+
+
+@lru_cache(maxsize=65536)
+def normalize_phonetic(word: str) -> str:
+    """Collapse spellings a recognizer confuses for Dutch (mirrors the frontend)"""
+    word = word.lower()
+    word = word.replace("b", "p").replace("d", "t").replace("z", "s")
+    word = re.sub(r"f+$", "v", word).replace("v", "f").replace("ij", "ei")
+    word = word.replace("y", "i").replace("ch", "g").replace("c", "k")
+    word = word.replace("x", "ks").replace("qu", "kw")
+    return _PUNCTUATION.sub("", word)
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """True if a and b differ by at most one insertion, deletion or substitution"""
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la > lb:
+        a, b, la, lb = b, a, lb, la
+    i = 0
+    while i < la and a[i] == b[i]:
+        i += 1
+    if la == lb:
+        return a[i + 1:] == b[i + 1:]
+    return a[i:] == b[i + 1:]
+
+
+def is_match(spoken: str, target: str) -> bool:
+    """Match two normalized words; one edit is tolerated on longer words"""
+    if spoken == target:
+        return True
+    return len(target) >= 4 and within_one_edit(spoken, target)
+
+
+class Alignment(NamedTuple):
+    total_words: int        # words on the card
+    attempted: int          # card positions up to where the reader got
+    correct: int            # positions read correctly, including after self-correction
+    substitutions: int      # a card word read as something else
+    skips: int              # card words passed over
+    insertions: int         # extra spoken words not on the card
+    self_corrections: int   # misread, then read correctly straight after
+    repetitions: int        # previous word read again (not an error)
+    ops: list               # (op, card_index, spoken_index), card order
+
+    @property
+    def errors(self) -> int:
+        # Self-corrected misreads count as errors here and are subtracted
+        # again by dmt_rules, matching how the counts are reported on paper
+        return self.substitutions + self.skips + self.insertions + self.self_corrections
+
+
+class IncrementalAligner:
+    """
+    The card walk, fed tokens as they are recognized (live scoring over the
+    speech websocket). feed() returns the ops it settled; counts are
+    running totals, with misreads still pending left out until resolved.
+    """
+
+    def __init__(self, card_words, matcher: Optional[Callable[[str, str], bool]] = None):
+        self.match = matcher or is_match
+        self.card = [normalize_phonetic(w) for w in card_words]
+        self.cursor = 0
+        self.pending = []  # spoken indices not yet explained by a match
+        self._pending_tokens = []  # their normalized tokens, for _resync
+        self.ops = []
+        self.spoken = 0    # tokens fed so far, including fillers
+        self.correct = self.substitutions = self.skips = 0
+        self.insertions = self.self_corrections = self.repetitions = 0
+
+    def feed(self, spoken_words) -> list:
+        first_op = len(self.ops)
+        card, n, match = self.card, len(self.card), self.match
+        for raw in spoken_words:
+            si = self.spoken
+            self.spoken += 1
+            token = normalize_phonetic(raw)
+            if not token or token in FILLERS:
+                continue
+
+            cursor = self.cursor
+            hit = None
+            for p in range(cursor, min(cursor + LOOKAHEAD + 1, n)):
+                if match(token, card[p]):
+                    hit = p
+                    break
+
+            if hit is None:
+                if not self.pending and cursor > 0 and match(token, card[cursor - 1]):
+                    self.repetitions += 1
+                    self.ops.append(("repeat", cursor - 1, si))
+                    continue
+                anchor = self._resync(token)
+                if anchor is None:
+                    self.pending.append(si)
+                    self._pending_tokens.append(token)
+                    continue
+                # The previous token starts the run the reader jumped to
+                self._pending_tokens.pop()
+                self._settle(anchor, self.pending.pop())
+                hit = anchor + 1
+            self._settle(hit, si)
+        return self.ops[first_op:]
+
+    def _resync(self, token) -> Optional[int]:
+        """Card position p past the window where the last pending token and token read p, p + 1"""
+        if not self._pending_tokens:
+            return None
+        previous, card, match = self._pending_tokens[-1], self.card, self.match
+        for p in range(self.cursor, len(card) - 1):
+            if match(previous, card[p]) and match(token, card[p + 1]):
+                return p
+        return None
+
+    def _settle(self, hit, si):
+        """Record a match at card position hit, explaining the pending misreads before it"""
+        cursor, pending = self.cursor, self.pending
+        gap = hit - cursor
+        if pending and gap == 0:
+            self.self_corrections += 1
+            self.insertions += len(pending) - 1
+            self.ops.append(("self_correction", hit, pending[-1]))
+        else:
+            # Misreads fill the skipped positions first; the rest are extra words
+            n_subs = min(len(pending), gap)
+            for k in range(n_subs):
+                self.ops.append(("substitution", cursor + k, pending[k]))
+            for p in range(cursor + n_subs, hit):
+                self.ops.append(("skip", p, None))
+            self.substitutions += n_subs
+            self.skips += gap - n_subs
+            self.insertions += len(pending) - n_subs
+
+        self.ops.append(("match", hit, si))
+        self.correct += 1
+        self.cursor = hit + 1
+        self.pending = []
+        self._pending_tokens = []
+
+    @property
+    def errors(self) -> int:
+        return self.substitutions + self.skips + self.insertions + self.self_corrections
+
+    def finish(self) -> Alignment:
+        # Time ran out mid-word: the leftover tokens were an attempt at the next word
+        pending, n = self.pending, len(self.card)
+        if pending and self.cursor < n:
+            self.ops.append(("substitution", self.cursor, pending[0]))
+            self.substitutions += 1
+            self.insertions += len(pending) - 1
+            self.cursor += 1
+        elif pending:
+            self.insertions += len(pending)
+        self.pending = []
+        self._pending_tokens = []
+
+        return Alignment(
+            total_words=n,
+            attempted=self.cursor,
+            correct=self.correct,
+            substitutions=self.substitutions,
+            skips=self.skips,
+            insertions=self.insertions,
+            self_corrections=self.self_corrections,
+            repetitions=self.repetitions,
+            ops=self.ops,
+        )
+
+
+def align(card_words, spoken_words, matcher: Optional[Callable[[str, str], bool]] = None) -> Alignment:
+    aligner = IncrementalAligner(card_words, matcher)
+    aligner.feed(spoken_words)
+    return aligner.finish()
@@ -0,0 +1,129 @@
+"""
+Bounded audio queue between a reader's websocket and the speech upstream.
+
+Chunks are held in a byte-bounded deque. Once more than high_watermark
+bytes are queued the policy applies:
+
+  block        stop reading from the client until the queue drains to
+               low_watermark; the browser's socket buffers instead of us
+  drop_oldest  discard the oldest queued chunks (never the stream's first
+               chunk, which carries the container header)
+
+The consumer always coalesces whatever is queued into one frame of at most
+max_frame bytes, so a backlog is flushed in a few large sends rather than
+hundreds of 100 ms ones.
+"""
+import asyncio
+import os
+from collections import deque
+from typing import Optional
+
+SPEECH_BUFFER_HIGH_WATERMARK = int(os.environ.get("SPEECH_BUFFER_HIGH_WATERMARK", str(64 * 1024)))
+SPEECH_BUFFER_LOW_WATERMARK = int(os.environ.get("SPEECH_BUFFER_LOW_WATERMARK", str(16 * 1024)))
+SPEECH_BUFFER_POLICY = os.environ.get("SPEECH_BUFFER_POLICY", "block")
+SPEECH_MAX_FRAME_BYTES = int(os.environ.get("SPEECH_MAX_FRAME_BYTES", str(32 * 1024)))
+
+POLICIES = ("block", "drop_oldest")
+
+
+class AudioBuffer:
+    def __init__(
+        self,
+        high_watermark: int = SPEECH_BUFFER_HIGH_WATERMARK,
+        low_watermark: int = SPEECH_BUFFER_LOW_WATERMARK,
+        policy: str = SPEECH_BUFFER_POLICY,
+        max_frame: int = SPEECH_MAX_FRAME_BYTES,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown speech buffer policy {policy!r}, expected one of {POLICIES}")
+        if low_watermark > high_watermark:
+            raise ValueError("low_watermark must not exceed high_watermark")
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.policy = policy
+        self.max_frame = max_frame
+
+        self._chunks = deque()
+        self._header_queued = False  # first chunk of the stream still in the queue
+        self._seen_first = False
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self.closed = False
+
+        self.size = 0
+        self.max_size = 0
+        self.dropped_chunks = 0
+        self.dropped_bytes = 0
+        self.blocked_seconds = 0.0
+        self.frames = 0
+        self.chunks_in = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._chunks)
+
+    async def put(self, chunk: bytes):
+        """Queue a client chunk, waiting or dropping per the policy"""
+        if self.policy == "block" and not self._writable.is_set():
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            await self._writable.wait()
+            self.blocked_seconds += loop.time() - started
+        if self.closed:
+            return
+
+        if not self._seen_first:
+            self._seen_first = self._header_queued = True
+        self._chunks.append(chunk)
+        self.size += len(chunk)
+        self.chunks_in += 1
+
+        if self.size > self.high_watermark:
+            if self.policy == "drop_oldest":
+                self._drop_oldest()
+            else:
+                self._writable.clear()
+        self.max_size = max(self.max_size, self.size)
+        self._readable.set()
+
+    def _drop_oldest(self):
+        keep_header = self._header_queued
+        while self.size > self.low_watermark and len(self._chunks) > 1 + keep_header:
+            if keep_header:
+                # Drop the oldest chunk after the header
+                header = self._chunks.popleft()
+                dropped = self._chunks.popleft()
+                self._chunks.appendleft(header)
+            else:
+                dropped = self._chunks.popleft()
+            self.size -= len(dropped)
+            self.dropped_chunks += 1
+            self.dropped_bytes += len(dropped)
+
+    async def get(self) -> Optional[bytes]:
+        """Next coalesced frame, or None once closed and drained"""
+        while not self._chunks:
+            if self.closed:
+                return None
+            self._readable.clear()
+            await self._readable.wait()
+
+        parts = [self._chunks.popleft()]
+        length = len(parts[0])
+        while self._chunks and length + len(self._chunks[0]) <= self.max_frame:
+            chunk = self._chunks.popleft()
+            parts.append(chunk)
+            length += len(chunk)
+        self._header_queued = False
+        self.size -= length
+        self.frames += 1
+        if self.size <= self.low_watermark:
+            self._writable.set()
+        return parts[0] if len(parts) == 1 else b"".join(parts)
+
+    def close(self):
+        """No more input; get() drains what is queued, then returns None"""
+        self.closed = True
+        self._readable.set()
+        self._writable.set()
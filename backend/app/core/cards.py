@@ -0,0 +1,56 @@
+"""
+Reproducible DMT card generation.
+
+Level pools are built once from dmt_tests.json plus the curated lists in
+dmt_word_lists.json, bucketed the same way the portable frontend does it
+(level 1: under 4 letters, level 2: 4+ letters, level 3: curated
+compounds only). A card is a seeded sample from its pool, so the same
+(test_id, level, size) always yields the same words.
+"""
+import json
+import os
+import random
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+DMT_TESTS_PATH = os.path.join(BACKEND_DIR, "dmt_tests.json")
+WORD_LISTS_PATH = os.path.join(BACKEND_DIR, "dmt_word_lists.json")
+
+LEVELS = (1, 2, 3)
+
+_pools = None
+
+
+def _build_pools():
+    with open(WORD_LISTS_PATH, encoding="utf-8") as f:
+        curated = {int(level): words for level, words in json.load(f).items()}
+    with open(DMT_TESTS_PATH, encoding="utf-8") as f:
+        tests = json.load(f)
+
+    short, long = [], []
+    for test in tests:
+        for sheet in test["sheets"].values():
+            for word in sheet:
+                word = word.lower()
+                (short if len(word) < 4 else long).append(word)
+
+    pools = {
+        1: [w for w in curated[1] if len(w) < 4] + short,
+        2: [w for w in curated[1] if len(w) >= 4] + curated[2] + long,
+        3: list(curated[3]),
+    }
+    # Deduplicate in first-seen order; the order is part of what makes a
+    # test_id reproducible, so don't sort or shuffle here
+    return {level: tuple(dict.fromkeys(words)) for level, words in pools.items()}
+
+
+def level_pools():
+    global _pools
+    if _pools is None:
+        _pools = _build_pools()
+    return _pools
+
+
+def generate_card(test_id: int, level: int, size: int):
+    pool = level_pools()[level]
+    rng = random.Random(f"dmt:{test_id}:{level}")
+    return rng.sample(pool, min(size, len(pool)))
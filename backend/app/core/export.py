@@ -0,0 +1,179 @@
+"""
+Streaming encoders for GET /session/export.
+
+Rows come from a server-side cursor in batches of EXPORT_BATCH_SIZE and
+each batch is encoded and handed to the response before the next one is
+fetched, so memory stays at one batch however long the date range is.
+
+  csv      header plus one line per session; word lists space-joined
+  ndjson   one JSON object per line
+  parquet  one row group per batch
+  arrow    Arrow IPC stream, one record batch per batch
+
+parquet and arrow need pyarrow, imported on first use.
+"""
+import csv
+import io
+import json
+import os
+from datetime import date, datetime
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# name -> Arrow type name; order is the column order of every format
+COLUMNS = {
+    "id": "int64",
+    "user_id": "int64",
+    "school_group": "int32",
+    "created_at": "timestamp",
+    "level": "int32",
+    "duration_seconds": "int32",
+    "total_words": "int32",
+    "correct_words": "int32",
+    "errors": "int32",
+    "self_corrections": "int32",
+    "wpm": "int32",
+    "accuracy": "int32",
+}
+WORD_COLUMNS = ("words_presented", "words_read")
+
+
+class ExportUnavailable(Exception):
+    pass
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+async def encode_csv(batches, columns):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    async for batch in batches:
+        for row in batch:
+            writer.writerow([
+                " ".join(v) if isinstance(v, list) else v.isoformat() if isinstance(v, datetime) else v
+                for v in row
+            ])
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+async def encode_ndjson(batches, columns):
+    async for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), default=_json_default, separators=(",", ":")) + "\n"
+            for row in batch
+        ).encode("utf-8")
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ExportUnavailable("parquet/arrow export needs pyarrow installed on the server")
+    return pyarrow
+
+
+def _arrow_schema(pa, columns):
+    types = {
+        "int64": pa.int64(),
+        "int32": pa.int32(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }
+    fields = [pa.field(name, types[COLUMNS[name]]) for name in columns if name in COLUMNS]
+    fields += [pa.field(name, pa.list_(pa.string())) for name in columns if name in WORD_COLUMNS]
+    return pa.schema(fields)
+
+
+def _record_batch(pa, schema, batch):
+    arrays = [pa.array([row[i] for row in batch], type=field.type) for i, field in enumerate(schema)]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _ChunkSink:
+    """Write-only file object the Arrow writers fill; drained after every batch"""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+async def _encode_arrow(batches, columns, parquet: bool):
+    pa = _pyarrow()
+    schema = _arrow_schema(pa, columns)
+    sink = _ChunkSink()
+    if parquet:
+        writer = pa.parquet.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    async for batch in batches:
+        if not batch:
+            continue  # Parquet rejects an empty row group
+        record_batch = _record_batch(pa, schema, batch)
+        if parquet:
+            writer.write_batch(record_batch, row_group_size=len(batch))
+        else:
+            writer.write_batch(record_batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+async def encode_parquet(batches, columns):
+    async for chunk in _encode_arrow(batches, columns, parquet=True):
+        yield chunk
+
+
+async def encode_arrow(batches, columns):
+    async for chunk in _encode_arrow(batches, columns, parquet=False):
+        yield chunk
+
+
+ENCODERS = {
+    "csv": encode_csv,
+    "ndjson": encode_ndjson,
+    "parquet": encode_parquet,
+    "arrow": encode_arrow,
+}
+
+
+def check_available(fmt: str):
+    """Fail before the response starts rather than halfway through it"""
+    if fmt in ("parquet", "arrow"):
+        _pyarrow()
@@ -0,0 +1,151 @@
+"""
+Incremental CSV / NDJSON parsing of request bodies.
+
+Rows are yielded as the body streams in, so large uploads are validated
+and inserted batch by batch without holding the whole file in memory.
+CSV input must have a header row; quoted fields may span lines.
+"""
+import codecs
+import csv
+import json
+from collections import deque
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+class RowError(ValueError):
+    pass
+
+
+def detect_format(content_type: str, explicit: str = None) -> str:
+    if explicit:
+        return explicit
+    if any(t in (content_type or "") for t in NDJSON_TYPES):
+        return "ndjson"
+    return "csv"
+
+
+async def iter_lines(stream):
+    """Decode a byte stream into text lines without buffering the whole body"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in stream:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+def _ends_quoted(line: str, quoted: bool) -> bool:
+    """
+    Whether a record is still inside a quoted field after line, given
+    whether it was before. Follows csv's default dialect: a quote only opens
+    a field at its start, and "" inside a quoted field is a literal quote,
+    so 5"inch is an ordinary unquoted value.
+    """
+    if not quoted and '"' not in line:
+        return False
+    field_start = not quoted
+    i = 0
+    while i < len(line):
+        c = line[i]
+        if quoted:
+            if c == '"':
+                if line[i + 1:i + 2] == '"':
+                    i += 1
+                else:
+                    quoted = False
+        elif c == '"' and field_start:
+            quoted = True
+        field_start = c == "," and not quoted
+        i += 1
+    return quoted
+
+
+class _LineFeed:
+    """
+    The iterator a single csv.reader pulls lines from. Lines are pushed
+    from the async body only once a whole record (no quoted field left
+    open) is buffered, so the reader never runs dry halfway through a record.
+    """
+
+    def __init__(self):
+        self.lines = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def iter_records(stream, fmt: str):
+    """
+    Yield (line_number, record) pairs; record is a dict, or a RowError for
+    a line that could not be parsed (so callers can report and carry on).
+    """
+    header = None
+    line_no = 0
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    record_start = 0
+    record_size = 0
+    quoted = False
+
+    def parse():
+        """Parse the buffered record: (values, None) or (None, RowError)"""
+        try:
+            return next(reader), None
+        except csv.Error as e:
+            feed.lines.clear()
+            return None, RowError(f"Invalid CSV: {e}")
+
+    async for line in iter_lines(stream):
+        line_no += 1
+        if fmt == "ndjson":
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_no, RowError(f"Invalid JSON: {e}")
+                continue
+            if not isinstance(record, dict):
+                yield line_no, RowError("Expected a JSON object")
+                continue
+            yield line_no, record
+            continue
+
+        if not feed.lines:
+            if not line.strip():
+                continue
+            record_start = line_no
+        feed.lines.append(line + "\n")
+        quoted = _ends_quoted(line, quoted)
+        record_size += len(line)
+        # An open quoted field continues on the next line, up to the csv field
+        # limit (past it the reader reports the oversized field instead)
+        if quoted and record_size <= csv.field_size_limit():
+            continue
+        quoted, record_size = False, 0
+
+        values, error = parse()
+        if error is not None:
+            yield record_start, error
+            continue
+        if header is None:
+            header = [h.strip() for h in values]
+            continue
+        if len(values) > len(header):
+            yield record_start, RowError(f"Expected {len(header)} columns, got {len(values)}")
+            continue
+        yield record_start, {k: v.strip() for k, v in zip(header, values)}
+
+    if feed.lines:
+        feed.lines.clear()
+        yield record_start, RowError("Quoted field is not closed before the end of the file")
@@ -0,0 +1,150 @@
+"""
+In-process leaderboards: best WPM per student, per (school_group, week, level).
+
+A board is a sorted list of (-wpm, user_id) plus a user -> wpm map, so
+"my rank" is a bisect and top-N is a slice. Boards are loaded whole from
+leaderboard_entries (one primary-key range) on first use or at startup,
+updated in place when this worker stores a session, and reloaded after
+LEADERBOARD_REFRESH_SECONDS to pick up sessions other workers stored.
+
+Ties share a rank (1, 2, 2, 4).
+"""
+import os
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select
+
+from app.models.stats import LeaderboardEntry
+from app.models.user import User
+
+LEADERBOARD_REFRESH_SECONDS = float(os.getenv("LEADERBOARD_REFRESH_SECONDS", "10"))
+LEADERBOARD_MAX_BOARDS = int(os.getenv("LEADERBOARD_MAX_BOARDS", "512"))
+
+
+def week_start(day: date) -> date:
+    """Monday of the (UTC) week containing day"""
+    return day - timedelta(days=day.weekday())
+
+
+def current_week() -> date:
+    return week_start(datetime.utcnow().date())
+
+
+class Board:
+    __slots__ = ("ranking", "scores", "loaded_at")
+
+    def __init__(self, rows=()):
+        self.scores = {user_id: wpm for user_id, wpm in rows}
+        self.ranking = sorted((-wpm, user_id) for user_id, wpm in self.scores.items())
+        self.loaded_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.ranking)
+
+    def update(self, user_id: int, wpm: int) -> bool:
+        """Record a session's WPM; only a new personal best moves the board"""
+        old = self.scores.get(user_id)
+        if old is not None:
+            if wpm <= old:
+                return False
+            del self.ranking[bisect_left(self.ranking, (-old, user_id))]
+        self.scores[user_id] = wpm
+        insort(self.ranking, (-wpm, user_id))
+        return True
+
+    def rank_of(self, wpm: int) -> int:
+        return bisect_left(self.ranking, (-wpm,)) + 1
+
+    def rank(self, user_id: int):
+        """(rank, wpm) or None if the student hasn't read this week"""
+        wpm = self.scores.get(user_id)
+        if wpm is None:
+            return None
+        return self.rank_of(wpm), wpm
+
+    def top(self, n: int):
+        """[(rank, user_id, wpm)] for the first n places"""
+        rows = []
+        for i, (neg_wpm, user_id) in enumerate(self.ranking[:n]):
+            rank = rows[-1][0] if rows and rows[-1][2] == -neg_wpm else i + 1
+            rows.append((rank, user_id, -neg_wpm))
+        return rows
+
+
+class Leaderboards:
+    def __init__(self, max_boards: int = LEADERBOARD_MAX_BOARDS, refresh_seconds: float = LEADERBOARD_REFRESH_SECONDS):
+        self.max_boards = max_boards
+        self.refresh_seconds = refresh_seconds
+        self._boards = OrderedDict()  # (week, school_group, level) -> Board
+        self.names = {}  # user_id -> display name
+        self.loads = 0
+        self.updates = 0
+
+    def _put(self, key, board: Board):
+        self._boards[key] = board
+        self._boards.move_to_end(key)
+        while len(self._boards) > self.max_boards:
+            self._boards.popitem(last=False)
+
+    def _fresh(self, key):
+        board = self._boards.get(key)
+        if board is None or time.monotonic() - board.loaded_at > self.refresh_seconds:
+            return None
+        self._boards.move_to_end(key)
+        return board
+
+    async def _load(self, db, *conditions):
+        rows = await db.execute(
+            select(LeaderboardEntry.week, LeaderboardEntry.school_group, LeaderboardEntry.level,
+                   LeaderboardEntry.user_id, LeaderboardEntry.best_wpm, User.name)
+            .join(User, User.id == LeaderboardEntry.user_id)
+            .where(*conditions)
+        )
+        grouped = {}
+        for week, school_group, level, user_id, wpm, name in rows:
+            grouped.setdefault((week, school_group, level), []).append((user_id, wpm))
+            self.names[user_id] = name
+        self.loads += 1
+        return grouped
+
+    async def board(self, db, week: date, school_group: int, level: int) -> Board:
+        key = (week, school_group, level)
+        board = self._fresh(key)
+        if board is None:
+            grouped = await self._load(
+                db,
+                LeaderboardEntry.week == week,
+                LeaderboardEntry.school_group == school_group,
+                LeaderboardEntry.level == level,
+            )
+            board = Board(grouped.get(key, ()))
+            self._put(key, board)
+        return board
+
+    async def warm(self, db):
+        """Load every board of the current week in one query (startup)"""
+        grouped = await self._load(db, LeaderboardEntry.week == current_week())
+        for key, rows in grouped.items():
+            self._put(key, Board(rows))
+        print(f"[Leaderboard] Loaded {len(grouped)} boards for week {current_week()}")
+
+    def apply(self, user, level: int, wpm: int, created_at: datetime):
+        """Reflect a committed session on the board, if this worker holds it"""
+        self.names[user.id] = user.name
+        board = self._boards.get((week_start(created_at.date()), user.school_group, level))
+        if board is not None and board.update(user.id, wpm):
+            self.updates += 1
+
+    def stats(self) -> dict:
+        return {
+            "boards": len(self._boards),
+            "entries": sum(len(b) for b in self._boards.values()),
+            "loads": self.loads,
+            "updates": self.updates,
+        }
+
+
+leaderboards = Leaderboards()
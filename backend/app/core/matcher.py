@@ -0,0 +1,118 @@
+"""
+Fuzzy/phonetic matching of recognized Dutch tokens to card words.
+
+Words are reduced to a phonetic key (the frontend's normalization plus a
+few spelling-variant folds). A token matches a card word on an equal key,
+or on a close spelling (one edit from 4 letters, two from 8) as long as
+the token's key isn't itself a dictionary word. The aligner only compares
+a token with the handful of card positions around its cursor, so pairs
+are checked directly (and cached) rather than through a neighbourhood
+index.
+"""
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Set
+
+from app.core.alignment import normalize_phonetic, within_one_edit
+from app.core.wordpack import WORDS
+
+_DOUBLES = re.compile(r"(.)\1+")
+
+# Shortest keys that may be matched with one / two edits
+ONE_EDIT_MIN_LENGTH = 4
+TWO_EDIT_MIN_LENGTH = 8
+
+
+@lru_cache(maxsize=65536)
+def phonetic_key(word: str) -> str:
+    """Phonetic key: fiets/viets, feit/fijt, koud/kout and hout/haut collide"""
+    key = normalize_phonetic(word).replace("au", "ou")
+    return _DOUBLES.sub(r"\1", key)
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, or limit + 1 as soon as it must exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def allowed_edits(key: str) -> int:
+    if len(key) >= TWO_EDIT_MIN_LENGTH:
+        return 2
+    if len(key) >= ONE_EDIT_MIN_LENGTH:
+        return 1
+    return 0
+
+
+@lru_cache(maxsize=65536)
+def close_spelling(spoken_key: str, target_key: str) -> bool:
+    """Whether spoken_key is within target_key's allowed edits"""
+    limit = allowed_edits(target_key)
+    if limit == 0:
+        return False
+    if limit == 1:
+        return within_one_edit(spoken_key, target_key)
+    return edit_distance(spoken_key, target_key, limit) <= limit
+
+
+class CardMatcher:
+    """Matches tokens against one card, refusing matches to other real words"""
+
+    def __init__(self, card_words: List[str], vocabulary: Optional[Set[str]] = None):
+        self.card_words = card_words
+        self.vocabulary = vocabulary if vocabulary is not None else vocabulary_keys()
+        self._card_keys = {phonetic_key(w) for w in card_words}
+
+    def match(self, spoken: str, target: str) -> bool:
+        """Matcher for alignment.align: exact key, or a close non-word spelling"""
+        spoken_key, target_key = phonetic_key(spoken), phonetic_key(target)
+        if spoken_key == target_key:
+            return True
+        # "kan" for "kat" is a misread, not a recognizer spelling slip
+        if spoken_key in self.vocabulary:
+            return False
+        return close_spelling(spoken_key, target_key)
+
+    def join_compounds(self, tokens: List[str]) -> List[str]:
+        """Re-join compounds the recognizer split ("keuken tafel" -> "keukentafel")"""
+        keys = [phonetic_key(t) for t in tokens]
+        joined = []
+        i = 0
+        while i < len(tokens):
+            if i + 1 < len(tokens) and keys[i] not in self._card_keys:
+                # Keys concatenate except where a doubled letter spans the join
+                combined_key = keys[i] + keys[i + 1]
+                if keys[i][-1:] == keys[i + 1][:1]:
+                    combined_key = _DOUBLES.sub(r"\1", combined_key)
+                if combined_key in self._card_keys:
+                    joined.append(tokens[i] + tokens[i + 1])
+                    i += 2
+                    continue
+            joined.append(tokens[i])
+            i += 1
+        return joined
+
+
+_vocabulary = None
+
+
+def vocabulary_keys() -> Set[str]:
+    """Process-wide phonetic keys of the word dictionary (built on first use)"""
+    global _vocabulary
+    if _vocabulary is None:
+        _vocabulary = {phonetic_key(w) for w in WORDS}
+    return _vocabulary
+
+
+def add_vocabulary_words(words: Iterable[str]):
+    """Register new words (e.g. from POST /word/) with the shared key set"""
+    vocabulary_keys().update(phonetic_key(w) for w in words)
@@ -0,0 +1,342 @@
+"""
+Request, database and websocket metrics.
+
+MetricsMiddleware is a plain ASGI middleware: per request it costs two
+perf_counter calls, a dict lookup and a bisect into fixed histogram
+buckets. Series are keyed by (method, route template, status) so /word/12
+and /word/13 share one histogram. Database time is summed per request
+from SQLAlchemy cursor events into a context variable.
+
+Exposed as Prometheus text on /metrics and as percentiles on /stats.
+With METRICS_DIR set the cells are memory-mapped (see metrics_store) and
+both endpoints aggregate every worker on the node.
+"""
+import os
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.core.metrics_store import MmapStore, read_directory
+
+# Shared directory for multi-worker deployments (uvicorn --workers, gunicorn);
+# unset keeps the metrics in process memory
+METRICS_DIR = os.environ.get("METRICS_DIR", "")
+
+# Bucket upper bounds in seconds: 1-1.5-2-3-5-7 steps from 100 µs to 30 s,
+# fine enough that interpolated p99s are within ~25% of the true value
+BUCKETS = tuple(
+    round(m * 10 ** e, 6)
+    for e in range(-4, 2)
+    for m in (1, 1.5, 2, 3, 5, 7)
+    if m * 10 ** e <= 30
+)
+
+HISTOGRAM_CELLS = len(BUCKETS) + 3  # buckets, +Inf, sum, count
+
+UNMATCHED_ROUTE = "<unmatched>"
+_SEP = "\x1f"
+
+# Mutable [seconds] cell for the request being served; cursor events add to it
+_request_db_time = ContextVar("request_db_time", default=None)
+
+
+class Histogram:
+    """Bucket counts, sum and count in one flat cell array (a list, or mmap'd floats)"""
+    __slots__ = ("cells",)
+
+    def __init__(self, cells=None):
+        self.cells = cells if cells is not None else [0.0] * HISTOGRAM_CELLS
+
+    def observe(self, value: float):
+        cells = self.cells
+        cells[bisect_left(BUCKETS, value)] += 1
+        cells[-2] += value
+        cells[-1] += 1
+
+    def merge(self, cells):
+        for i, value in enumerate(cells):
+            self.cells[i] += value
+
+    @property
+    def counts(self):
+        return self.cells[:-2]
+
+    @property
+    def total(self) -> float:
+        return self.cells[-2]
+
+    @property
+    def count(self) -> int:
+        return int(self.cells[-1])
+
+    def percentile(self, q: float) -> float:
+        """Estimate by linear interpolation inside the bucket holding rank q"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = BUCKETS[i - 1] if i else 0.0
+                upper = BUCKETS[i] if i < len(BUCKETS) else BUCKETS[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return BUCKETS[-1]
+
+
+class RequestSeries:
+    __slots__ = ("latency", "db")
+
+    def __init__(self, latency: Histogram, db: Histogram):
+        self.latency = latency
+        self.db = db
+
+
+class Metrics:
+    """
+    Metric registry. With a store, every cell lives in this worker's mmap
+    file and stats()/render_prometheus() report the sum over all workers.
+    """
+
+    def __init__(self, store: Optional[MmapStore] = None):
+        self._reset(store)
+        self._route_paths = None
+
+    def _reset(self, store):
+        self.store = store
+        self.series = {}      # (method, route, status) -> RequestSeries
+        self.websockets = {}  # route -> [open, accepted]
+        self.in_flight = self._cells("in_flight", 1)  # one-cell gauge
+        self.workers = 1
+        self.started = time.time()
+
+    def after_fork(self):
+        """Give a forked worker (gunicorn --preload) its own file and zeroed cells"""
+        if self.store is not None:
+            self._reset(MmapStore(self.store.directory))
+
+    def _cells(self, key, ncells):
+        cells = self.store.allocate(key, ncells) if self.store is not None else None
+        return cells if cells is not None else [0.0] * ncells
+
+    def route_label(self, app, scope) -> str:
+        # Starlette leaves the matched endpoint in the scope; map it back to
+        # the route's path template (built once, routes don't change at runtime)
+        if self._route_paths is None:
+            self._route_paths = {
+                getattr(r, "endpoint", None) or getattr(r, "app", None): r.path
+                for r in getattr(app, "routes", ())
+            }
+        return self._route_paths.get(scope.get("endpoint"), UNMATCHED_ROUTE)
+
+    def request_series(self, method, route, status) -> RequestSeries:
+        key = (method, route, status)
+        series = self.series.get(key)
+        if series is None:
+            name = _SEP.join((method, route, str(status)))
+            series = self.series[key] = RequestSeries(
+                Histogram(self._cells(f"latency{_SEP}{name}", HISTOGRAM_CELLS)),
+                Histogram(self._cells(f"db{_SEP}{name}", HISTOGRAM_CELLS)),
+            )
+        return series
+
+    def observe_request(self, method, route, status, seconds, db_seconds):
+        series = self.series.get((method, route, status)) or self.request_series(method, route, status)
+        series.latency.observe(seconds)
+        series.db.observe(db_seconds)
+
+    def websocket_cells(self, route):
+        cells = self.websockets.get(route)
+        if cells is None:
+            cells = self.websockets[route] = self._cells(f"websockets{_SEP}{route}", 2)
+        return cells
+
+    def snapshot(self) -> "Metrics":
+        """This registry, or with a store the node-wide sum of every worker's file"""
+        if self.store is None:
+            return self
+        merged = Metrics()
+        merged.started = self.started
+        live_pids = set()
+        for pid, alive, key, cells in read_directory(self.store.directory):
+            if alive:
+                live_pids.add(pid)
+            kind, _, name = key.partition(_SEP)
+            if kind in ("latency", "db"):
+                method, route, status = name.split(_SEP)
+                series = merged.request_series(method, route, int(status))
+                getattr(series, kind).merge(cells)
+            elif kind == "websockets":
+                # Gauges of exited workers are dropped, counters are kept
+                merged.websocket_cells(name)[0] += cells[0] if alive else 0
+                merged.websocket_cells(name)[1] += cells[1]
+            elif kind == "in_flight" and alive:
+                merged.in_flight[0] += cells[0]
+        merged.workers = len(live_pids)
+        return merged
+
+    def totals(self) -> Histogram:
+        merged = Histogram()
+        for series in self.series.values():
+            merged.merge(series.latency.cells)
+        return merged
+
+    def stats(self) -> dict:
+        """Summary for /stats: overall and per-route percentiles in ms"""
+        m = self.snapshot()
+
+        def summarize(h, db=None):
+            summary = {
+                "count": h.count,
+                "mean_ms": round(h.total / h.count * 1000, 3) if h.count else 0,
+                "p50_ms": round(h.percentile(0.50) * 1000, 3),
+                "p95_ms": round(h.percentile(0.95) * 1000, 3),
+                "p99_ms": round(h.percentile(0.99) * 1000, 3),
+            }
+            if db is not None:
+                summary["db_mean_ms"] = round(db.total / db.count * 1000, 3) if db.count else 0
+            return summary
+
+        return {
+            "uptime_seconds": round(time.time() - m.started),
+            "workers": m.workers,
+            "in_flight": int(m.in_flight[0]),
+            "requests": summarize(m.totals()),
+            "routes": {
+                f"{method} {route} {status}": summarize(s.latency, s.db)
+                for (method, route, status), s in sorted(m.series.items())
+            },
+            "websockets_active": int(sum(c[0] for c in m.websockets.values())),
+            "websockets_total": int(sum(c[1] for c in m.websockets.values())),
+        }
+
+
+metrics = Metrics(MmapStore(METRICS_DIR) if METRICS_DIR else None)
+if METRICS_DIR:
+    os.register_at_fork(after_in_child=metrics.after_fork)
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{k}="{v}"' for k, v in labels.items())
+
+
+def _histogram_lines(name, h, labels):
+    cumulative = 0
+    for bound, n in zip(BUCKETS + ("+Inf",), h.counts):
+        cumulative += n
+        yield f'{name}_bucket{{{labels},le="{bound}"}} {int(cumulative)}'
+    yield f"{name}_sum{{{labels}}} {h.total}"
+    yield f"{name}_count{{{labels}}} {h.count}"
+
+
+def render_prometheus(m: Metrics = metrics) -> str:
+    """Prometheus text exposition format (version 0.0.4)"""
+    m = m.snapshot()
+    lines = [
+        "# HELP leesfeest_http_request_duration_seconds HTTP request latency",
+        "# TYPE leesfeest_http_request_duration_seconds histogram",
+    ]
+    series = sorted(m.series.items())
+    for (method, route, status), s in series:
+        lines.extend(_histogram_lines(
+            "leesfeest_http_request_duration_seconds", s.latency,
+            _labels(method=method, route=route, status=status)))
+    lines += [
+        "# HELP leesfeest_http_request_db_seconds Database time spent per HTTP request",
+        "# TYPE leesfeest_http_request_db_seconds histogram",
+    ]
+    for (method, route, status), s in series:
+        lines.extend(_histogram_lines(
+            "leesfeest_http_request_db_seconds", s.db,
+            _labels(method=method, route=route, status=status)))
+    lines += [
+        "# HELP leesfeest_http_requests_in_flight HTTP requests currently being served",
+        "# TYPE leesfeest_http_requests_in_flight gauge",
+        f"leesfeest_http_requests_in_flight {int(m.in_flight[0])}",
+        "# HELP leesfeest_websockets_active Open websocket connections",
+        "# TYPE leesfeest_websockets_active gauge",
+    ]
+    lines += [f'leesfeest_websockets_active{{{_labels(route=r)}}} {int(c[0])}' for r, c in sorted(m.websockets.items())]
+    lines += [
+        "# HELP leesfeest_websockets_total Websocket connections accepted",
+        "# TYPE leesfeest_websockets_total counter",
+    ]
+    lines += [f'leesfeest_websockets_total{{{_labels(route=r)}}} {int(c[1])}' for r, c in sorted(m.websockets.items())]
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware; avoids BaseHTTPMiddleware's per-request task and stream wrapping"""
+
+    def __init__(self, app, registry: Metrics = metrics):
+        self.app = app
+        self.metrics = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            await self._http(scope, receive, send)
+        elif scope["type"] == "websocket":
+            await self._websocket(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    async def _http(self, scope, receive, send):
+        m = self.metrics
+        status = 500  # reported if the app raises before sending headers
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        db_time = [0.0]
+        token = _request_db_time.set(db_time)
+        in_flight = m.in_flight
+        in_flight[0] += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_flight[0] -= 1
+            _request_db_time.reset(token)
+            m.observe_request(scope["method"], m.route_label(scope["app"], scope), status, elapsed, db_time[0])
+
+    async def _websocket(self, scope, receive, send):
+        m = self.metrics
+        cells = None  # [open, accepted] for the route, once accepted
+
+        async def send_wrapper(message):
+            nonlocal cells
+            if message["type"] == "websocket.accept":
+                cells = m.websocket_cells(m.route_label(scope["app"], scope))
+                cells[0] += 1
+                cells[1] += 1
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if cells is not None:
+                cells[0] -= 1
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    cell = _request_db_time.get()
+    if cell is not None and context is not None:
+        cell[0] += time.perf_counter() - context._metrics_started
+
+
+def instrument_engine(engine):
+    """Attribute cursor time on this (sync) engine to the current request"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,119 @@
+"""
+Memory-mapped metric cells shared between worker processes.
+
+Each worker owns one file in METRICS_DIR (metrics_<pid>.bin) and is its
+only writer. A file is a used-bytes header followed by records of
+(key length, cell count, key, float64 cells). Cells are 8-byte aligned,
+so a reader in another worker never sees a torn value, and the header is
+advanced only after a record is complete.
+
+Any worker answering /stats or /metrics reads every file in the directory
+and sums them, so the numbers cover the whole node without a network
+service. Files of workers that have exited are removed when a new worker
+starts, which restarts those counters along with it.
+"""
+import mmap
+import os
+import struct
+from typing import Iterator, Optional, Tuple
+
+METRICS_FILE_SIZE = int(os.environ.get("METRICS_FILE_SIZE", str(1 << 20)))
+
+_HEADER = struct.Struct("<Q")   # bytes used, including the header
+_RECORD = struct.Struct("<II")  # key length, cell count
+_PREFIX = "metrics_"
+_SUFFIX = ".bin"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _file_pid(name: str) -> Optional[int]:
+    if name.startswith(_PREFIX) and name.endswith(_SUFFIX):
+        try:
+            return int(name[len(_PREFIX):-len(_SUFFIX)])
+        except ValueError:
+            return None
+    return None
+
+
+class MmapStore:
+    def __init__(self, directory: str, size: int = METRICS_FILE_SIZE):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.remove_dead_files()
+        self.path = os.path.join(directory, f"{_PREFIX}{os.getpid()}{_SUFFIX}")
+        with open(self.path, "wb") as f:
+            f.truncate(size)
+        with open(self.path, "r+b") as f:
+            self._mmap = mmap.mmap(f.fileno(), size)
+        self._used = _HEADER.size
+        _HEADER.pack_into(self._mmap, 0, self._used)
+        self.full = False
+
+    def remove_dead_files(self):
+        for name in os.listdir(self.directory):
+            pid = _file_pid(name)
+            if pid is not None and not _pid_alive(pid):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass  # another worker starting at the same time got it first
+
+    def allocate(self, key: str, ncells: int) -> Optional[memoryview]:
+        """Zeroed float64 cells for key, or None once the file is full"""
+        raw = key.encode("utf-8")
+        padded = (len(raw) + 7) & ~7
+        offset = self._used
+        cells_at = offset + _RECORD.size + padded
+        end = cells_at + 8 * ncells
+        if end > len(self._mmap):
+            if not self.full:
+                print(f"[Metrics] {self.path} is full; new series are kept per-process only")
+                self.full = True
+            return None
+        _RECORD.pack_into(self._mmap, offset, len(raw), ncells)
+        self._mmap[offset + _RECORD.size:offset + _RECORD.size + len(raw)] = raw
+        self._used = end
+        _HEADER.pack_into(self._mmap, 0, end)  # publish only once the record is complete
+        return memoryview(self._mmap)[cells_at:end].cast("d")
+
+
+def read_file(path: str) -> Iterator[Tuple[str, Tuple[float, ...]]]:
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return
+        used = _HEADER.unpack(header)[0]
+        if used <= _HEADER.size:
+            return
+        data = header + f.read(used - _HEADER.size)
+    offset = _HEADER.size
+    while offset + _RECORD.size <= len(data):
+        key_length, ncells = _RECORD.unpack_from(data, offset)
+        key_at = offset + _RECORD.size
+        cells_at = key_at + ((key_length + 7) & ~7)
+        key = data[key_at:key_at + key_length].decode("utf-8")
+        yield key, struct.unpack_from(f"={ncells}d", data, cells_at)
+        offset = cells_at + 8 * ncells
+
+
+def read_directory(directory: str) -> Iterator[Tuple[int, bool, str, Tuple[float, ...]]]:
+    """(worker pid, alive, key, cells) for every record of every worker file"""
+    for name in sorted(os.listdir(directory)):
+        pid = _file_pid(name)
+        if pid is None:
+            continue
+        alive = _pid_alive(pid)
+        try:
+            for key, cells in read_file(os.path.join(directory, name)):
+                yield pid, alive, key, cells
+        except FileNotFoundError:
+            continue
@@ -1,9 +1,120 @@
+from app.core.alignment import IncrementalAligner, align
 from app.core.dmt_rules import calculate_dmt_score
+from app.core.matcher import CardMatcher, phonetic_key
+
+def align_card(words_presented, words_read):
+    """Align a transcript to its card using the phonetic matcher"""
+    matcher = CardMatcher(words_presented)
+    return align(words_presented, matcher.join_compounds(words_read), matcher=matcher.match)
+
+def _session_metrics(total_words, attempted, errors, self_corrections, duration_seconds):
+    """SessionRead metrics (accuracy as a percentage), whichever way the counts were obtained"""
+    score = calculate_dmt_score(attempted, errors, self_corrections, max(duration_seconds, 1))
+    return {
+        "total_words": total_words,
+        "correct_words": score["correct_words"],
+        "errors": errors,
+        "self_corrections": self_corrections,
+        "wpm": round(score["wpm"]),
+        "accuracy": round(score["accuracy"] * 100),
+    }
+
+def score_alignment(alignment, duration_seconds):
+    """SessionRead metrics for an aligned card"""
+    return _session_metrics(
+        alignment.total_words,
+        alignment.attempted,
+        alignment.errors,
+        alignment.self_corrections,
+        duration_seconds,
+    )
+
+def score_cards(cards):
+    """
+    Score the (words_presented, words_read, duration_seconds) cards of one
+    session. Returns the (card words, alignment) readings, one per card, and
+    SessionRead metrics for the cards together.
+    """
+    readings = [(words_presented, align_card(words_presented, words_read))
+                for words_presented, words_read, _ in cards]
+    alignments = [alignment for _, alignment in readings]
+    metrics = _session_metrics(
+        sum(a.total_words for a in alignments),
+        sum(a.attempted for a in alignments),
+        sum(a.errors for a in alignments),
+        sum(a.self_corrections for a in alignments),
+        sum(duration for _, _, duration in cards),
+    )
+    return readings, metrics
+
+class LiveScorer:
+    """
+    Scores a card while it is being read, one transcript at a time.
+
+    Tokens go through the same matcher and compound joining as align_card,
+    so the final alignment equals align_card(card, words_read). A trailing
+    token that could be the first half of a split compound is held back
+    until the next transcript (or finish) decides.
+    """
+
+    def __init__(self, card_words):
+        self.card_words = list(card_words)
+        self.matcher = CardMatcher(self.card_words)
+        self.aligner = IncrementalAligner(self.card_words, matcher=self.matcher.match)
+        self._card_keys = {phonetic_key(w) for w in self.card_words}
+        self._held = []
+        self.words_read = []  # transcript tokens as recognized
+
+    def _could_start_compound(self, token):
+        key = phonetic_key(token)
+        return key not in self._card_keys and any(
+            len(card_key) > len(key) and card_key.startswith(key) for card_key in self._card_keys
+        )
+
+    def add_transcript(self, transcript: str):
+        """Feed one final transcript; returns a progress delta, or None if nothing settled"""
+        tokens = transcript.lower().split()
+        if not tokens:
+            return None
+        self.words_read.extend(tokens)
+        tokens = self._held + tokens
+        self._held = []
+        if self._could_start_compound(tokens[-1]):
+            self._held = [tokens.pop()]
+        ops = self.aligner.feed(self.matcher.join_compounds(tokens)) if tokens else []
+        if not ops:
+            return None
+        return self.progress([card_index for op, card_index, _ in ops if op == "match"])
+
+    def progress(self, matched=()):
+        a = self.aligner
+        return {
+            "type": "progress",
+            "cursor": a.cursor,
+            "matched": list(matched),
+            "correct": a.correct,
+            "errors": a.errors,
+            "self_corrections": a.self_corrections,
+        }
+
+    def finish(self, duration_seconds):
+        """(alignment, SessionRead metrics) once the card is done"""
+        if self._held:
+            self.aligner.feed(self.matcher.join_compounds(self._held))
+            self._held = []
+        alignment = self.aligner.finish()
+        return alignment, score_alignment(alignment, duration_seconds)
 
 def score_session(session):
-    words_read = len(session.words_read)
-    errors = session.errors
-    self_corrections = session.self_corrections
-    duration = session.duration_seconds
+    """SessionRead metrics for a session, in the same shape whichever branch scores it"""
+    # With the card and the transcript we can score it ourselves
+    if session.words_presented and session.words_read:
+        return score_alignment(align_card(session.words_presented, session.words_read), session.duration_seconds)
 
-    return calculate_dmt_score(words_read, errors, self_corrections, duration)
+    return _session_metrics(
+        session.total_words,
+        len(session.words_read),
+        session.errors,
+        session.self_corrections,
+        session.duration_seconds,
+    )
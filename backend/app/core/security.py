@@ -1,9 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import jwt
 from passlib.context import CryptContext
 
+import asyncio
 import os
+import threading
 
 # Configuration - Read from environment variables
 SECRET_KEY = os.environ.get("SECRET_KEY")
@@ -18,12 +21,61 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.environ.get("ACCESS_TOKEN_EXPIRE_MINUTES",
 # Use pbkdf2_sha256 instead of bcrypt to avoid compatibility issues
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
+# pbkdf2 is CPU-bound; run it on a small dedicated pool so a login burst
+# can't stall the event loop (and the live speech websockets with it)
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", "2"))
+
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="pwd-hash")
+_hash_lock = threading.Lock()
+_hash_stats = {"queued": 0, "running": 0, "completed": 0}
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+def _run_tracked(fn, *args):
+    with _hash_lock:
+        _hash_stats["queued"] -= 1
+        _hash_stats["running"] += 1
+    try:
+        return fn(*args)
+    finally:
+        with _hash_lock:
+            _hash_stats["running"] -= 1
+            _hash_stats["completed"] += 1
+
+def _submit_hash_job(fn, *args):
+    with _hash_lock:
+        _hash_stats["queued"] += 1
+    return _hash_executor.submit(_run_tracked, fn, *args)
+
+async def verify_password_async(plain_password, hashed_password):
+    """Verify on the hashing pool without blocking the event loop"""
+    return await asyncio.wrap_future(_submit_hash_job(verify_password, plain_password, hashed_password))
+
+async def get_password_hash_async(password):
+    return await asyncio.wrap_future(_submit_hash_job(get_password_hash, password))
+
+async def get_password_hashes_async(passwords):
+    """
+    Hash a batch (e.g. a class roster) on the shared pool. At most one job
+    per worker is queued at a time, so logins arriving mid-import wait for
+    one hash round instead of the whole batch.
+    """
+    slots = asyncio.Semaphore(PASSWORD_HASH_WORKERS)
+
+    async def hash_one(password):
+        async with slots:
+            return await get_password_hash_async(password)
+
+    return await asyncio.gather(*(hash_one(p) for p in passwords))
+
+def hashing_stats():
+    with _hash_lock:
+        return {"workers": PASSWORD_HASH_WORKERS, **_hash_stats}
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
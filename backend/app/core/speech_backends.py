@@ -0,0 +1,68 @@
+"""
+Speech-to-text upstreams for /api/speech/transcribe.
+
+A backend opens one upstream session per reader. An upstream accepts audio
+bytes (and JSON control strings such as CloseStream) through send(), yields
+Deepgram-shaped JSON result strings when iterated, and is shut with close().
+A websockets client connection already has exactly that shape.
+
+  deepgram  the hosted recognizer (SPEECH_UPSTREAM_URL overrides the URL,
+            e.g. to point at a mock server started from speech_mock)
+  mock      in-process scripted recognizer with no network, for load tests
+            and offline development
+
+Selected with SPEECH_BACKEND (default deepgram).
+"""
+import os
+
+import websockets
+from dotenv import load_dotenv
+
+from app.core.speech_mock import MockUpstream
+
+load_dotenv()
+
+DEEPGRAM_API_KEY = os.getenv("DEEPGRAM_API_KEY", "")
+DEEPGRAM_URL = "wss://api.deepgram.com/v1/listen?model=nova-2&language=nl&smart_format=true&interim_results=false"
+
+SPEECH_BACKEND = os.getenv("SPEECH_BACKEND", "deepgram")
+SPEECH_UPSTREAM_URL = os.getenv("SPEECH_UPSTREAM_URL", DEEPGRAM_URL)
+
+
+class DeepgramBackend:
+    name = "deepgram"
+
+    def __init__(self, api_key: str = DEEPGRAM_API_KEY, url: str = SPEECH_UPSTREAM_URL):
+        self.api_key = api_key
+        self.url = url
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    async def connect(self):
+        # API key stays server side, in the upstream handshake header
+        return await websockets.connect(self.url, extra_headers={"Authorization": f"Token {self.api_key}"})
+
+
+class MockBackend:
+    name = "mock"
+    configured = True
+
+    async def connect(self):
+        return MockUpstream()
+
+
+BACKENDS = {"deepgram": DeepgramBackend, "mock": MockBackend}
+
+_backend = None
+
+
+def get_speech_backend():
+    global _backend
+    if _backend is None:
+        if SPEECH_BACKEND not in BACKENDS:
+            raise ValueError(f"Unknown SPEECH_BACKEND {SPEECH_BACKEND!r}, expected one of {sorted(BACKENDS)}")
+        _backend = BACKENDS[SPEECH_BACKEND]()
+        print(f"[Speech] Using {_backend.name} backend")
+    return _backend
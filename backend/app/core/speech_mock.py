@@ -0,0 +1,150 @@
+"""
+Scripted stand-in for the Deepgram live transcription API.
+
+MockUpstream "hears" words at a steady reading pace as audio bytes arrive
+and answers with Deepgram-shaped final Results messages: one per group of
+words (utterance endpointing), delivered after a jittered recognition
+latency. CloseStream flushes the words heard so far, like Deepgram does.
+
+The script is a word file (SPEECH_MOCK_SCRIPT) or, by default, the level 1
+card of test 1, so a session looks like a child reading a real card.
+
+It runs in-process as SPEECH_BACKEND=mock, or as a websocket server that
+the deepgram backend can point at through SPEECH_UPSTREAM_URL:
+
+    cd backend && python -m app.core.speech_mock --port 8799
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+from typing import List, Optional
+
+SPEECH_MOCK_SCRIPT = os.getenv("SPEECH_MOCK_SCRIPT", "")
+# MediaRecorder's webm/opus runs at roughly 32 kbit/s
+SPEECH_MOCK_BYTES_PER_SECOND = float(os.getenv("SPEECH_MOCK_BYTES_PER_SECOND", "4000"))
+SPEECH_MOCK_WORDS_PER_SECOND = float(os.getenv("SPEECH_MOCK_WORDS_PER_SECOND", "1.0"))
+SPEECH_MOCK_WORDS_PER_RESULT = int(os.getenv("SPEECH_MOCK_WORDS_PER_RESULT", "3"))
+SPEECH_MOCK_LATENCY_MS = float(os.getenv("SPEECH_MOCK_LATENCY_MS", "300"))
+
+_default_script = None
+
+
+def default_script() -> List[str]:
+    global _default_script
+    if _default_script is None:
+        if SPEECH_MOCK_SCRIPT:
+            with open(SPEECH_MOCK_SCRIPT, encoding="utf-8") as f:
+                _default_script = f.read().split()
+        else:
+            from app.core.cards import generate_card
+            _default_script = generate_card(1, 1, 120)
+    return _default_script
+
+
+def result_message(words: List[str], start: float, seconds_per_word: float, confidence: float = 0.93) -> str:
+    timed = [
+        {
+            "word": w, "start": round(start + i * seconds_per_word, 3),
+            "end": round(start + (i + 0.8) * seconds_per_word, 3),
+            "confidence": confidence, "punctuated_word": w,
+        }
+        for i, w in enumerate(words)
+    ]
+    return json.dumps({
+        "type": "Results",
+        "channel_index": [0, 1],
+        "duration": round(len(words) * seconds_per_word, 3),
+        "start": round(start, 3),
+        "is_final": True,
+        "speech_final": True,
+        "channel": {"alternatives": [{"transcript": " ".join(words), "confidence": confidence, "words": timed}]},
+        "metadata": {"request_id": "mock"},
+    })
+
+
+class MockUpstream:
+    def __init__(self, script: Optional[List[str]] = None, rng: Optional[random.Random] = None):
+        self.script = script or default_script()
+        self.rng = rng or random.Random()
+        self._results = asyncio.Queue()
+        self._audio_bytes = 0
+        self._words_sent = 0
+        self.closed = False
+
+    def _heard(self) -> int:
+        seconds = self._audio_bytes / SPEECH_MOCK_BYTES_PER_SECOND
+        return int(seconds * SPEECH_MOCK_WORDS_PER_SECOND)
+
+    def _emit(self, flush: bool = False):
+        loop = asyncio.get_running_loop()
+        heard = self._heard()
+        seconds_per_word = 1 / SPEECH_MOCK_WORDS_PER_SECOND
+        delay = 0.0
+        while heard - self._words_sent >= SPEECH_MOCK_WORDS_PER_RESULT or (flush and heard > self._words_sent):
+            count = min(SPEECH_MOCK_WORDS_PER_RESULT, heard - self._words_sent)
+            words = [self.script[(self._words_sent + i) % len(self.script)] for i in range(count)]
+            message = result_message(words, self._words_sent * seconds_per_word, seconds_per_word)
+            self._words_sent += count
+            # Recognition latency, +-30%; results keep their order
+            delay = max(delay, SPEECH_MOCK_LATENCY_MS / 1000 * self.rng.uniform(0.7, 1.3))
+            loop.call_later(delay, self._results.put_nowait, message)
+        return delay
+
+    async def send(self, data):
+        if self.closed:
+            return
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            self._audio_bytes += len(data)
+            self._emit()
+        elif json.loads(data).get("type") == "CloseStream":
+            delay = self._emit(flush=True)
+            asyncio.get_running_loop().call_later(delay, self._results.put_nowait, None)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        while True:
+            message = await self._results.get()
+            if message is None:
+                return
+            yield message
+
+    async def close(self):
+        self.closed = True
+        self._results.put_nowait(None)
+
+
+async def _serve_connection(websocket):
+    upstream = MockUpstream()
+
+    async def relay():
+        async for message in upstream:
+            await websocket.send(message)
+        await websocket.close()
+
+    relay_task = asyncio.ensure_future(relay())
+    try:
+        async for data in websocket:
+            await upstream.send(data)
+        await relay_task
+    finally:
+        relay_task.cancel()
+        await upstream.close()
+
+
+async def serve(host: str, port: int):
+    import websockets
+    async with websockets.serve(_serve_connection, host, port, max_size=None):
+        print(f"[SpeechMock] Listening on ws://{host}:{port}")
+        await asyncio.Future()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scripted Deepgram stand-in for offline runs and load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8799)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port))
@@ -0,0 +1,182 @@
+"""
+Pre-warmed upstream speech sessions.
+
+Opening a Deepgram stream costs a TLS + websocket handshake, which used to
+land in the reader's 3-2-1 countdown. The pool keeps up to
+SPEECH_POOL_SIZE sessions connected (held open with KeepAlive messages)
+and hands one to each new reader, refilling in the background.
+
+Sessions are single use: a reader's stream is closed when it ends. When
+no reader has asked for a session for SPEECH_POOL_IDLE_SECONDS the pool
+lets its sessions go and stays empty until the next reader arrives.
+A session that has waited SPEECH_POOL_MAX_IDLE_SECONDS without a reader
+is replaced: KeepAlives don't stop the provider from eventually closing a
+stream that never receives audio.
+"""
+import asyncio
+import json
+import os
+import time
+from collections import deque
+
+from app.core.speech_backends import get_speech_backend
+
+SPEECH_POOL_SIZE = int(os.getenv("SPEECH_POOL_SIZE", "2"))
+SPEECH_POOL_IDLE_SECONDS = float(os.getenv("SPEECH_POOL_IDLE_SECONDS", "600"))
+# Deepgram drops streams that see no audio or KeepAlive for ~10 s
+SPEECH_POOL_KEEPALIVE_SECONDS = float(os.getenv("SPEECH_POOL_KEEPALIVE_SECONDS", "4"))
+SPEECH_POOL_MAX_IDLE_SECONDS = float(os.getenv("SPEECH_POOL_MAX_IDLE_SECONDS", "60"))
+
+KEEPALIVE_MESSAGE = json.dumps({"type": "KeepAlive"})
+
+
+def _is_closed(upstream) -> bool:
+    return bool(getattr(upstream, "closed", False))
+
+
+class SpeechSessionPool:
+    def __init__(
+        self,
+        backend,
+        size: int = SPEECH_POOL_SIZE,
+        idle_seconds: float = SPEECH_POOL_IDLE_SECONDS,
+        keepalive_seconds: float = SPEECH_POOL_KEEPALIVE_SECONDS,
+        max_idle_seconds: float = SPEECH_POOL_MAX_IDLE_SECONDS,
+    ):
+        self.backend = backend
+        self.size = size
+        self.idle_seconds = idle_seconds
+        self.keepalive_seconds = keepalive_seconds
+        self.max_idle_seconds = max_idle_seconds
+        self._idle = deque()  # (upstream, connected_at), oldest first
+        self._warming = 0
+        self._last_demand = time.monotonic()
+        self._maintenance = None
+
+        self.hits = 0
+        self.misses = 0
+        self.handshakes = 0
+        self.handshake_seconds = 0.0
+        self.saved_seconds = 0.0
+        self.expired = 0
+
+    @property
+    def mean_handshake(self) -> float:
+        return self.handshake_seconds / self.handshakes if self.handshakes else 0.0
+
+    async def _connect(self):
+        started = time.monotonic()
+        upstream = await self.backend.connect()
+        self.handshakes += 1
+        self.handshake_seconds += time.monotonic() - started
+        return upstream
+
+    def start(self):
+        """Warm the pool now (app startup) rather than on the first reader"""
+        if self.size <= 0 or not self.backend.configured:
+            return
+        if self._maintenance is None:
+            self._maintenance = asyncio.ensure_future(self._maintain())
+        self._refill()
+
+    async def acquire(self):
+        """(upstream, warm): a pooled session if one is ready, else a fresh one"""
+        self._last_demand = time.monotonic()
+        self.start()
+        self._expire_stale()
+        while self._idle:
+            upstream, _ = self._idle.popleft()
+            if _is_closed(upstream):
+                self.expired += 1
+                continue
+            self.hits += 1
+            self.saved_seconds += self.mean_handshake
+            self._refill()
+            return upstream, True
+        self.misses += 1
+        upstream = await self._connect()
+        return upstream, False
+
+    def _expire_stale(self):
+        """Drop sessions connected longer than max_idle_seconds ago"""
+        cutoff = time.monotonic() - self.max_idle_seconds
+        while self._idle and self._idle[0][1] < cutoff:
+            upstream, _ = self._idle.popleft()
+            self.expired += 1
+            asyncio.ensure_future(self._close(upstream))
+
+    def _refill(self):
+        for _ in range(self.size - len(self._idle) - self._warming):
+            self._warming += 1
+            asyncio.ensure_future(self._warm_one())
+
+    async def _warm_one(self):
+        try:
+            upstream = await self._connect()
+            self._idle.append((upstream, time.monotonic()))
+        except Exception as e:
+            print(f"[SpeechPool] Warm-up connection failed: {e}")
+        finally:
+            self._warming -= 1
+
+    async def _maintain(self):
+        while True:
+            await asyncio.sleep(self.keepalive_seconds)
+            if time.monotonic() - self._last_demand > self.idle_seconds:
+                # Nobody has read for a while; don't hold upstream streams open
+                while self._idle:
+                    upstream, _ = self._idle.popleft()
+                    self.expired += 1
+                    await self._close(upstream)
+                continue
+            self._expire_stale()
+            dead = []
+            # Iterate a copy: readers may take sessions while we await a send
+            for entry in list(self._idle):
+                try:
+                    await entry[0].send(KEEPALIVE_MESSAGE)
+                except Exception:
+                    dead.append(entry)
+            for entry in dead:
+                if entry in self._idle:
+                    self._idle.remove(entry)
+                    self.expired += 1
+            self._refill()
+
+    @staticmethod
+    async def _close(upstream):
+        try:
+            await upstream.close()
+        except Exception:
+            pass
+
+    async def close(self):
+        if self._maintenance is not None:
+            self._maintenance.cancel()
+            self._maintenance = None
+        while self._idle:
+            upstream, _ = self._idle.popleft()
+            await self._close(upstream)
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend.name,
+            "size": self.size,
+            "idle": len(self._idle),
+            "warming": self._warming,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "mean_handshake_ms": round(self.mean_handshake * 1000, 1),
+            "handshake_saved_seconds": round(self.saved_seconds, 3),
+        }
+
+
+_pool = None
+
+
+def get_speech_pool() -> SpeechSessionPool:
+    global _pool
+    if _pool is None:
+        _pool = SpeechSessionPool(get_speech_backend())
+    return _pool
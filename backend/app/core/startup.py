@@ -0,0 +1,77 @@
+"""
+Cold-start bookkeeping and warm-up.
+
+StartupProfile times the import of app.main and each lifespan phase. The
+report is printed once per worker and served as /stats["startup"];
+benchmarks/bench_startup.py adds the per-package import breakdown.
+
+warm_up() runs inside the lifespan, before uvicorn accepts connections
+(and so before the platform health check can pass). It pays the first-use
+costs that would otherwise land on the first real requests: jose's JWT
+backend, passlib's hash handler, the matcher's vocabulary keys, the DMT
+card pools and SQLAlchemy's compiled-statement cache for the auth lookup.
+STARTUP_WARMUP=0 skips it, to measure what it saves.
+"""
+import os
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from jose import jwt
+from sqlalchemy import select
+
+from app.core.cards import level_pools
+from app.core.matcher import vocabulary_keys
+from app.core.scoring import align_card
+from app.core.security import ALGORITHM, SECRET_KEY, create_access_token, pwd_context
+from app.models.stats import UserStat
+from app.models.user import User
+
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "1") != "0"
+
+
+class StartupProfile:
+    def __init__(self):
+        self.phases = {}  # name -> seconds, in the order they ran
+        self.ready = False
+
+    def record(self, name: str, seconds: float):
+        self.phases[name] = seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def report(self) -> dict:
+        return {
+            "ready": self.ready,
+            "total_ms": round(sum(self.phases.values()) * 1000, 1),
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+        }
+
+    def print_report(self):
+        report = self.report()
+        phases = ", ".join(f"{name} {ms:.0f}" for name, ms in report["phases_ms"].items())
+        print(f"[Startup] Ready in {report['total_ms']:.0f} ms ({phases})")
+
+
+startup_profile = StartupProfile()
+
+
+async def warm_up(db):
+    with startup_profile.phase("warmup_auth"):
+        token = create_access_token(data={"sub": "warmup@localhost"}, expires_delta=timedelta(minutes=1))
+        jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        pwd_context.handler()
+    with startup_profile.phase("warmup_scoring"):
+        vocabulary_keys()
+        align_card(["de", "kat", "loopt"], ["de", "kat", "loopt"])
+        level_pools()
+    with startup_profile.phase("warmup_queries"):
+        # Compile (and cache) the statements behind every authenticated request
+        await db.execute(select(User).where(User.email == "warmup@localhost"))
+        await db.get(UserStat, 0)
@@ -0,0 +1,222 @@
+"""
+Precompressed, cache-friendly delivery of the portable frontend.
+
+Every file is read once at startup, fingerprinted (sha256) and held in
+memory together with its gzip and brotli encodings, so a request costs a
+dict lookup instead of a disk read and no compression on the hot path.
+
+  - The smallest variant the browser's Accept-Encoding allows is sent.
+  - ETags are content hashes; If-None-Match answers 304 without a body.
+  - HTML is rewritten so "/static/<name>" references carry ?v=<hash>.
+    Those versioned URLs are immutable (cached for a year); everything
+    else, index.html included, is revalidated on each visit.
+
+Compressing at startup uses fast settings. The build step
+
+    cd backend && python -m app.core.static_assets
+
+stores maximum-compression variants in STATIC_PRECOMPRESSED_DIR, keyed by
+content hash, and startup uses those instead of compressing again.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+
+from starlette.responses import Response
+
+from app.core.cards import BACKEND_DIR, DMT_TESTS_PATH
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+FRONTEND_DIR = os.path.join(BACKEND_DIR, "..", "frontend_portable")
+STATIC_PRECOMPRESSED_DIR = os.getenv(
+    "STATIC_PRECOMPRESSED_DIR", os.path.join(FRONTEND_DIR, ".precompressed")
+)
+# Below this the encoding overhead isn't worth it
+STATIC_MIN_COMPRESS_BYTES = int(os.getenv("STATIC_MIN_COMPRESS_BYTES", "1024"))
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+ENCODINGS = ("br", "gzip") if brotli else ("gzip",)
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+STATIC_REFERENCE = re.compile(r"""(["'])/static/([^"'?#]+)\1""")
+
+
+def compress(body: bytes, encoding: str, best: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if best else 5)
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+
+def accepted_encodings(header: str) -> set:
+    """Codings with a non-zero q-value in an Accept-Encoding header"""
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class StaticAsset:
+    def __init__(self, name: str, body: bytes):
+        self.name = name
+        self.body = body
+        self.digest = hashlib.sha256(body).hexdigest()
+        self.version = self.digest[:12]
+        self.media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        self.variants = {}  # encoding -> compressed body, only where smaller
+
+    def etag(self, encoding: str = "identity") -> str:
+        # Each representation needs its own strong validator
+        return f'"{self.version}"' if encoding == "identity" else f'"{self.version}-{encoding}"'
+
+    def compress(self, precompressed_dir: str = ""):
+        if len(self.body) < STATIC_MIN_COMPRESS_BYTES:
+            return
+        for encoding in ENCODINGS:
+            path = os.path.join(precompressed_dir, self.digest + SUFFIXES[encoding])
+            if precompressed_dir and os.path.exists(path):
+                with open(path, "rb") as f:
+                    data = f.read()
+            else:
+                data = compress(self.body, encoding)
+            if len(data) < len(self.body):
+                self.variants[encoding] = data
+
+
+class StaticAssets:
+    def __init__(self, directory: str = FRONTEND_DIR, extra_files=(), prefix: str = "/static",
+                 precompressed_dir: str = STATIC_PRECOMPRESSED_DIR):
+        self.directory = directory
+        self.extra_files = list(extra_files)
+        self.prefix = prefix
+        self.precompressed_dir = precompressed_dir
+        self.assets = {}
+        self.hits = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self.bytes_saved = 0
+
+    def _sources(self):
+        for root, dirs, files in os.walk(self.directory):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for filename in files:
+                if not filename.startswith("."):
+                    path = os.path.join(root, filename)
+                    yield os.path.relpath(path, self.directory).replace(os.sep, "/"), path
+        for path in self.extra_files:
+            yield os.path.basename(path), path
+
+    def load(self):
+        pages = []
+        for name, path in self._sources():
+            with open(path, "rb") as f:
+                body = f.read()
+            if name.endswith(".html"):
+                pages.append((name, body))  # after the assets they reference
+            else:
+                self.assets[name] = StaticAsset(name, body)
+        for name, body in pages:
+            self.assets[name] = StaticAsset(name, self._fingerprint_references(body))
+        for asset in self.assets.values():
+            asset.compress(self.precompressed_dir)
+        raw = sum(len(a.body) for a in self.assets.values())
+        encoded = sum(min([len(a.body)] + [len(v) for v in a.variants.values()]) for a in self.assets.values())
+        print(f"[Static] {len(self.assets)} assets, {raw // 1024} KB, {encoded // 1024} KB compressed")
+        return self
+
+    def url(self, name: str) -> str:
+        asset = self.assets.get(name)
+        return f"{self.prefix}/{name}?v={asset.version}" if asset else f"{self.prefix}/{name}"
+
+    def _fingerprint_references(self, html: bytes) -> bytes:
+        def versioned(match):
+            quote, name = match.group(1), match.group(2)
+            return f"{quote}{self.url(name)}{quote}" if name in self.assets else match.group(0)
+        return STATIC_REFERENCE.sub(versioned, html.decode("utf-8")).encode("utf-8")
+
+    def response(self, name: str, request) -> Response:
+        asset = self.assets.get(name)
+        if asset is None:
+            return Response(status_code=404)
+
+        accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+        encoding, body = "identity", asset.body
+        for candidate, data in asset.variants.items():
+            if candidate in accepted and len(data) < len(body):
+                encoding, body = candidate, data
+
+        versioned = request.query_params.get("v") == asset.version and not name.endswith(".html")
+        headers = {
+            "ETag": asset.etag(encoding),
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL if versioned else REVALIDATE_CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+
+        self.hits += 1
+        if self._not_modified(request.headers.get("if-none-match"), asset):
+            self.not_modified += 1
+            self.bytes_saved += len(body)
+            return Response(status_code=304, headers=headers)
+        self.bytes_sent += len(body)
+        self.bytes_saved += len(asset.body) - len(body)
+        if request.method == "HEAD":
+            headers["Content-Length"] = str(len(body))
+            body = b""
+        return Response(body, media_type=asset.media_type, headers=headers)
+
+    @staticmethod
+    def _not_modified(if_none_match, asset: StaticAsset) -> bool:
+        if not if_none_match:
+            return False
+        # Weak comparison; any encoding of the same content is still fresh
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return "*" in tags or any(asset.etag(e) in tags for e in ("identity",) + ENCODINGS)
+
+    def stats(self) -> dict:
+        return {
+            "assets": len(self.assets),
+            "encodings": list(ENCODINGS),
+            "hits": self.hits,
+            "not_modified": self.not_modified,
+            "bytes_sent": self.bytes_sent,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    def precompress(self):
+        """Write the best compression of every asset, keyed by content hash (build step)"""
+        os.makedirs(self.precompressed_dir, exist_ok=True)
+        for asset in self.assets.values():
+            if len(asset.body) < STATIC_MIN_COMPRESS_BYTES:
+                continue
+            for encoding in ENCODINGS:
+                path = os.path.join(self.precompressed_dir, asset.digest + SUFFIXES[encoding])
+                if not os.path.exists(path):
+                    with open(path, "wb") as f:
+                        f.write(compress(asset.body, encoding, best=True))
+                    print(f"[Static] {asset.name} -> {os.path.basename(path)}")
+
+
+frontend_assets = StaticAssets(extra_files=[DMT_TESTS_PATH])
+
+
+if __name__ == "__main__":
+    frontend_assets.load().precompress()
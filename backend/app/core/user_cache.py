@@ -0,0 +1,90 @@
+"""
+In-process cache of authenticated users, keyed by bearer token.
+Lets get_current_user skip the JWT decode and the users-table lookup
+on every protected request.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+USER_CACHE_SIZE = int(os.environ.get("USER_CACHE_SIZE", "1024"))
+USER_CACHE_TTL_SECONDS = int(os.environ.get("USER_CACHE_TTL_SECONDS", "300"))
+
+
+class CachedUser(NamedTuple):
+    """Read-only snapshot with the User columns endpoints actually use"""
+    id: int
+    email: str
+    name: str
+    role: str
+    school_group: Optional[int]
+
+    @classmethod
+    def from_orm(cls, user):
+        return cls(user.id, user.email, user.name, user.role, user.school_group)
+
+
+class UserCache:
+    def __init__(self, maxsize: int = USER_CACHE_SIZE, ttl: int = USER_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # token -> (expires_at, CachedUser)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[CachedUser]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, token: str, user: CachedUser, token_exp: Optional[float] = None):
+        # Never outlive the token itself
+        expires_at = time.time() + self.ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        with self._lock:
+            self._entries[token] = (expires_at, user)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate_email(self, email: str):
+        """Drop every cached token for this user (call after create/update)"""
+        with self._lock:
+            stale = [t for t, (_, u) in self._entries.items() if u.email == email]
+            for t in stale:
+                del self._entries[t]
+
+    def active_users(self) -> int:
+        """Distinct users whose token was validated within the TTL"""
+        now = time.time()
+        with self._lock:
+            return len({u.id for expires_at, u in self._entries.values() if expires_at > now})
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0,
+            }
+
+
+user_cache = UserCache()
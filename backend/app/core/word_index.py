@@ -0,0 +1,134 @@
+"""
+In-process index over the words table for /word/.
+
+Loaded on first use and dropped when this worker writes a word. Writes by
+other workers (or scripts like generate_dmt_data.py --import-db) are
+picked up by reloading after WORD_INDEX_REFRESH_SECONDS. List responses
+are serialized to JSON bytes once per filter combination and carry a
+content hash ETag, so repeat fetches are a dict lookup (or a 304), and an
+unchanged table keeps its ETags across reloads.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import defaultdict
+
+from sqlalchemy import select
+
+from app.models.word import Word
+
+WORD_INDEX_REFRESH_SECONDS = float(os.getenv("WORD_INDEX_REFRESH_SECONDS", "30"))
+
+
+def split_tags(pattern_tags):
+    return [t.strip() for t in (pattern_tags or "").split(",") if t.strip()]
+
+
+class CachedBody:
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+EMPTY_LIST = CachedBody(b"[]")
+
+
+class WordIndex:
+    def __init__(self, refresh_seconds: float = WORD_INDEX_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._lock = asyncio.Lock()
+        self._loaded = False
+        self._loaded_at = 0.0
+        self.by_id = {}
+        self.by_level = defaultdict(list)
+        self.by_tag = defaultdict(list)
+        self.by_length = defaultdict(list)
+        self._bodies = {}
+
+    def invalidate(self):
+        self._loaded = False
+
+    def _fresh(self) -> bool:
+        return self._loaded and time.monotonic() - self._loaded_at <= self.refresh_seconds
+
+    async def ensure_loaded(self, db):
+        if self._fresh():
+            return
+        async with self._lock:
+            if self._fresh():
+                return
+            rows = (await db.execute(select(Word).order_by(Word.id))).scalars().all()
+            self._build(rows)
+
+    def _build(self, rows):
+        by_id = {}
+        by_level, by_tag, by_length = defaultdict(list), defaultdict(list), defaultdict(list)
+        for row in rows:
+            # Same shape and field order as WordRead
+            word = {
+                "text": row.text,
+                "difficulty_level": row.difficulty_level,
+                "pattern_tags": row.pattern_tags,
+                "syllables": row.syllables,
+                "frequency_rank": row.frequency_rank,
+                "id": row.id,
+            }
+            by_id[row.id] = word
+            by_level[row.difficulty_level].append(word)
+            by_length[len(row.text)].append(word)
+            for tag in split_tags(row.pattern_tags):
+                by_tag[tag].append(word)
+        self.by_id, self.by_level, self.by_tag, self.by_length = by_id, by_level, by_tag, by_length
+        self._bodies = {}
+        self._loaded = True
+        self._loaded_at = time.monotonic()
+
+    def texts(self, level=None):
+        words = self.by_level.get(level, []) if level else self.by_id.values()
+        return [w["text"] for w in words]
+
+    def list_body(self, level=None, tag=None, length=None) -> CachedBody:
+        # Filters are client input: only cache combinations of values that
+        # exist, so the cache stays bounded by the data, not by the requests
+        if (level and level not in self.by_level) or (tag and tag not in self.by_tag) \
+                or (length and length not in self.by_length):
+            return EMPTY_LIST
+        key = ("list", level, tag, length)
+        cached = self._bodies.get(key)
+        if cached is None:
+            # Start from the narrowest index and filter the rest
+            if length:
+                words = self.by_length.get(length, [])
+            elif tag:
+                words = self.by_tag.get(tag, [])
+            elif level:
+                words = self.by_level.get(level, [])
+            else:
+                words = list(self.by_id.values())
+            words = [
+                w for w in words
+                if (not level or w["difficulty_level"] == level)
+                and (not tag or tag in split_tags(w["pattern_tags"]))
+            ]
+            cached = self._bodies[key] = CachedBody(json.dumps(words, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        return cached
+
+    def item_body(self, word_id) -> CachedBody:
+        key = ("item", word_id)
+        cached = self._bodies.get(key)
+        if cached is None:
+            word = self.by_id.get(word_id)
+            if word is None:
+                return None
+            cached = self._bodies[key] = CachedBody(json.dumps(word, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        return cached
+
+    def stats(self):
+        return {"loaded": self._loaded, "words": len(self.by_id), "cached_bodies": len(self._bodies)}
+
+
+word_index = WordIndex()
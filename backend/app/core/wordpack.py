@@ -0,0 +1,73 @@
+"""
+Compact binary encoding for per-session word lists.
+
+A DMT card reuses the same small vocabulary across thousands of sessions,
+so instead of JSON text we store each word as a 2-byte id into a frozen
+dictionary (word_dictionary.txt). Words outside the dictionary are kept
+verbatim after the id array, so encoding is lossless.
+
+Layout (little-endian):
+    u8   format version
+    u16  word count
+    u16  id per word (ESCAPE = word stored inline)
+    utf-8 inline words, newline separated
+"""
+import json
+import os
+import struct
+import sys
+from array import array
+
+FORMAT_VERSION = 1
+ESCAPE = 0xFFFF
+_HEADER = struct.Struct("<BH")
+MAX_WORDS = 0xFFFF  # the u16 count
+
+DICTIONARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "word_dictionary.txt")
+
+
+def _load_dictionary():
+    with open(DICTIONARY_PATH, encoding="utf-8") as f:
+        words = [line.rstrip("\n") for line in f if not line.startswith("#")]
+    return words, {word: i for i, word in enumerate(words)}
+
+
+WORDS, WORD_IDS = _load_dictionary()
+
+
+def pack_words(words) -> bytes:
+    if len(words) > MAX_WORDS:
+        raise ValueError(f"Cannot pack {len(words)} words, the format holds at most {MAX_WORDS}")
+    ids = array("H")
+    inline = []
+    for word in words:
+        word_id = WORD_IDS.get(word)
+        if word_id is None or "\n" in word:
+            word_id = ESCAPE
+            inline.append(word.replace("\n", " "))
+        ids.append(word_id)
+    if sys.byteorder == "big":
+        ids.byteswap()
+    return _HEADER.pack(FORMAT_VERSION, len(ids)) + ids.tobytes() + "\n".join(inline).encode("utf-8")
+
+
+def unpack_words(data: bytes) -> list:
+    if not data:
+        return []
+    # Rows written before packing was introduced hold JSON text
+    if data[:1] == b"[":
+        return json.loads(data)
+
+    version, count = _HEADER.unpack_from(data)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unknown packed word list version {version}")
+    ids_end = _HEADER.size + 2 * count
+    ids = array("H")
+    ids.frombytes(data[_HEADER.size:ids_end])
+    if sys.byteorder == "big":
+        ids.byteswap()
+
+    if ESCAPE not in ids:
+        return [WORDS[i] for i in ids]
+    inline = iter(data[ids_end:].decode("utf-8").split("\n"))
+    return [WORDS[i] if i != ESCAPE else next(inline) for i in ids]
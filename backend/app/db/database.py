@@ -1,11 +1,98 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.config import settings
 
-engine = create_engine(settings.database_url, connect_args={"check_same_thread": False})
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+    cursor.execute(f"PRAGMA mmap_size={settings.sqlite_mmap_size}")
+    # Negative cache_size is in KiB rather than pages
+    cursor.execute(f"PRAGMA cache_size=-{settings.sqlite_cache_size_kb}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def build_engine(database_url: str, sqlite_mode: str = "default"):
+    """Create the engine; SQLite in "production" mode gets WAL, pragmas and a pool"""
+    if not database_url.startswith("sqlite"):
+        return create_engine(
+            database_url,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_pre_ping=True,
+        )
+
+    if sqlite_mode != "production":
+        return create_engine(database_url, connect_args={"check_same_thread": False})
+
+    # Keep connections open so pragmas run once per connection rather than
+    # once per request (file SQLite otherwise gets a fresh connection each time)
+    sqlite_engine = create_engine(
+        database_url,
+        connect_args={
+            "check_same_thread": False,
+            "timeout": settings.sqlite_busy_timeout_ms / 1000,
+        },
+        poolclass=QueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+    )
+    event.listen(sqlite_engine, "connect", _apply_sqlite_pragmas)
+    return sqlite_engine
+
+
+def async_database_url(database_url: str) -> str:
+    """Map a sync URL onto its asyncio driver (aiosqlite / asyncpg)"""
+    if database_url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + database_url[len("sqlite:"):]
+    # Render/Heroku style URLs use the deprecated postgres:// scheme
+    for prefix in ("postgres://", "postgresql://", "postgresql+psycopg2://"):
+        if database_url.startswith(prefix):
+            return "postgresql+asyncpg://" + database_url[len(prefix):]
+    return database_url
+
+
+def build_async_engine(database_url: str, sqlite_mode: str = "default"):
+    """Async twin of build_engine, used by the request handlers"""
+    url = async_database_url(database_url)
+    if not database_url.startswith("sqlite"):
+        return create_async_engine(
+            url,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_pre_ping=True,
+        )
+
+    if sqlite_mode != "production":
+        return create_async_engine(url)
+
+    sqlite_engine = create_async_engine(
+        url,
+        connect_args={"timeout": settings.sqlite_busy_timeout_ms / 1000},
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+    )
+    event.listen(sqlite_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    return sqlite_engine
+
+
+# Sync engine: schema setup, seeding and scripts
+engine = build_engine(settings.database_url, settings.sqlite_mode)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()  # <-- this exists
 
+# Async engine: API routers, so a DB round trip doesn't hold a threadpool worker
+async_engine = build_async_engine(settings.database_url, settings.sqlite_mode)
+AsyncSessionLocal = sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -13,4 +100,7 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
 
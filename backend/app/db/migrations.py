@@ -0,0 +1,151 @@
+"""
+Idempotent schema upgrades for databases created before a change.
+create_all only creates missing tables, so anything added to an existing
+table (indexes, columns, data rewrites) is applied here on startup.
+
+Data migrations run once and are recorded in the schema_migrations table.
+"""
+import json
+
+from sqlalchemy import Column, MetaData, String, Table, inspect, text
+
+from app.core.wordpack import pack_words
+from app.db.database import Base
+
+BATCH_SIZE = 500
+
+_migration_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations", _migration_metadata,
+    Column("name", String, primary_key=True),
+)
+
+
+def ensure_indexes(engine):
+    """Create indexes declared on models that an older database lacks"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def _legacy_word_list(value):
+    """Decode a JSON-era value, or None if the value is already packed"""
+    if value is None:
+        return None
+    if isinstance(value, memoryview):
+        value = bytes(value)
+    if isinstance(value, bytes):
+        if value[:1] != b"[":
+            return None
+        value = value.decode("utf-8")
+    return json.loads(value)
+
+
+def pack_session_word_lists(conn):
+    """Rewrite JSON words_presented/words_read as packed word-id arrays"""
+    if conn.dialect.name == "postgresql":
+        columns = {c["name"]: c["type"] for c in inspect(conn).get_columns("sessions")}
+        for name in ("words_presented", "words_read"):
+            if columns[name].__class__.__name__ in ("JSON", "JSONB"):
+                conn.execute(text(
+                    f"ALTER TABLE sessions ALTER COLUMN {name} TYPE bytea "
+                    f"USING convert_to({name}::text, 'UTF8')"
+                ))
+
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            text("SELECT id, words_presented, words_read FROM sessions WHERE id > :last ORDER BY id LIMIT :n"),
+            {"last": last_id, "n": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        updates = []
+        for session_id, presented, read in rows:
+            presented, read = _legacy_word_list(presented), _legacy_word_list(read)
+            if presented is not None or read is not None:
+                updates.append({
+                    "id": session_id,
+                    "presented": pack_words(presented) if presented is not None else None,
+                    "read": pack_words(read) if read is not None else None,
+                })
+        if updates:
+            conn.execute(
+                text("UPDATE sessions SET "
+                     "words_presented = COALESCE(:presented, words_presented), "
+                     "words_read = COALESCE(:read, words_read) WHERE id = :id"),
+                updates,
+            )
+        last_id = rows[-1][0]
+
+
+def add_word_classification_columns(conn):
+    """words.syllables / words.frequency_rank for the classification pipeline"""
+    existing = {c["name"] for c in inspect(conn).get_columns("words")}
+    for name in ("syllables", "frequency_rank"):
+        if name not in existing:
+            conn.execute(text(f"ALTER TABLE words ADD COLUMN {name} INTEGER"))
+
+
+def backfill_user_daily_stats(conn):
+    """Build the /analytics rollup from sessions stored before it existed"""
+    day = "CAST(created_at AS DATE)" if conn.dialect.name == "postgresql" else "date(created_at)"
+    conn.execute(text(
+        "INSERT INTO user_daily_stats (user_id, day, sessions, wpm_total, accuracy_total, "
+        "words_total, words_correct, errors, reading_seconds) "
+        f"SELECT user_id, {day}, COUNT(*), SUM(wpm), SUM(accuracy), SUM(total_words), "
+        "SUM(correct_words), SUM(errors), SUM(duration_seconds) "
+        f"FROM sessions WHERE user_id IS NOT NULL AND created_at IS NOT NULL GROUP BY user_id, {day}"
+    ))
+
+
+def add_session_level_column(conn):
+    """sessions.level, the DMT card a session was read at"""
+    existing = {c["name"] for c in inspect(conn).get_columns("sessions")}
+    if "level" not in existing:
+        conn.execute(text("ALTER TABLE sessions ADD COLUMN level INTEGER"))
+
+
+def backfill_leaderboard_entries(conn):
+    """Best WPM per student per week/group/level from existing server-scored cards"""
+    if conn.dialect.name == "postgresql":
+        week = "CAST(date_trunc('week', s.created_at) AS DATE)"
+    else:
+        week = "date(s.created_at, 'weekday 0', '-6 days')"
+    # Cards that don't record their level aren't ranked, nor are hand-scored sessions (no cards)
+    conn.execute(text(
+        "INSERT INTO leaderboard_entries (week, school_group, level, user_id, best_wpm) "
+        f"SELECT {week}, u.school_group, c.level, s.user_id, MAX(c.wpm) "
+        "FROM session_cards c JOIN sessions s ON s.id = c.session_id JOIN users u ON u.id = s.user_id "
+        "WHERE u.role = 'student' AND u.school_group IS NOT NULL AND s.created_at IS NOT NULL "
+        "AND c.level IS NOT NULL "
+        f"GROUP BY {week}, u.school_group, c.level, s.user_id"
+    ))
+
+
+# Ordered; never rename or reorder an entry once it has shipped
+DATA_MIGRATIONS = [
+    ("0001_pack_session_word_lists", pack_session_word_lists),
+    ("0002_word_classification_columns", add_word_classification_columns),
+    ("0003_user_daily_stats", backfill_user_daily_stats),
+    ("0004_session_level_column", add_session_level_column),
+    ("0005_leaderboard_entries", backfill_leaderboard_entries),
+]
+
+
+def run_data_migrations(engine):
+    _migration_metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        applied = {row[0] for row in conn.execute(schema_migrations.select())}
+    for name, migrate in DATA_MIGRATIONS:
+        if name in applied:
+            continue
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.execute(schema_migrations.insert().values(name=name))
+        print(f"[Migrations] Applied {name}")
+
+
+def run_migrations(engine):
+    ensure_indexes(engine)
+    run_data_migrations(engine)
@@ -0,0 +1,49 @@
+"""
+Storing a scored reading session (POST /session/), together with the
+stats, rollups and leaderboard entries it feeds.
+"""
+from datetime import datetime
+
+from app.core.leaderboard import leaderboards
+from app.db.stats import record_daily_rollup, record_leaderboard_entry, record_session_stats
+from app.models.session import ReadingSession, SessionCard
+
+
+def ranked(user, level) -> bool:
+    """Only students in a group, and cards that say which level was read, appear on leaderboards"""
+    return user.role == "student" and user.school_group is not None and level is not None
+
+
+async def save_reading_session(db, user, duration_seconds, words_presented, words_read, metrics,
+                               readings=(), level=None, cards=()):
+    """
+    cards: per-card metrics (with their level) for server-scored cards; each
+    one ranks on its own level's leaderboard. Hand-scored sessions have none
+    and stay off the leaderboards.
+    """
+    # level stays None when the client doesn't send it: the adaptive level
+    # says what we'd serve next, not what this session read
+    session = ReadingSession(
+        user_id=user.id,
+        duration_seconds=duration_seconds,
+        words_presented=words_presented,
+        words_read=words_read,
+        created_at=datetime.utcnow(),
+        level=level,
+        **metrics
+    )
+
+    db.add(session)
+    await db.flush()  # session.id for its cards
+    db.add_all([SessionCard(session_id=session.id, **card) for card in cards])
+    # Keep the adaptivity counters, class rollups and leaderboard current in the same transaction
+    await record_session_stats(db, user.id, metrics, readings)
+    await record_daily_rollup(db, user.id, metrics, duration_seconds, session.created_at)
+    ranked_cards = [card for card in cards if ranked(user, card["level"])]
+    for card in ranked_cards:
+        await record_leaderboard_entry(db, user.id, user.school_group, card["level"], card["wpm"], session.created_at)
+    await db.commit()
+    await db.refresh(session)
+    for card in ranked_cards:
+        leaderboards.apply(user, card["level"], card["wpm"], session.created_at)
+    return session
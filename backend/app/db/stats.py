@@ -0,0 +1,115 @@
+"""
+Incremental maintenance of the counters in models/stats.py.
+Called inside the POST /session/ transaction.
+"""
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import case
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.adaptivity import next_level, word_outcomes
+from app.core.leaderboard import week_start
+from app.models.stats import LeaderboardEntry, UserDailyStat, UserStat, UserWordStat, WordStat
+
+
+def _insert(db, table):
+    """Dialect insert that supports ON CONFLICT (SQLite and Postgres)"""
+    if db.bind.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+async def _add_counts(db, model, key_columns, rows):
+    stmt = _insert(db, model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={
+            "attempts": model.attempts + stmt.excluded.attempts,
+            "errors": model.errors + stmt.excluded.errors,
+            **({"last_seen_at": stmt.excluded.last_seen_at} if model is UserWordStat else {}),
+        },
+    )
+    await db.execute(stmt, rows)
+
+
+async def record_session_stats(db, user_id, metrics, readings=()):
+    """readings: (card words, alignment) per server-scored card"""
+    now = datetime.utcnow()
+    if readings:
+        attempted = sum(alignment.attempted for _, alignment in readings)
+    else:
+        attempted = metrics["total_words"]
+
+    user_stat = await db.get(UserStat, user_id)
+    if user_stat is None:
+        user_stat = UserStat(user_id=user_id, sessions=0, words_attempted=0, words_correct=0, level=1)
+        db.add(user_stat)
+    user_stat.sessions += 1
+    user_stat.words_attempted += attempted
+    user_stat.words_correct += metrics["correct_words"]
+    user_stat.last_wpm = metrics["wpm"]
+    user_stat.last_accuracy = metrics["accuracy"]
+    user_stat.level = next_level(user_stat.level, metrics["accuracy"], attempted)
+    user_stat.updated_at = now
+
+    attempts, errors = Counter(), Counter()
+    for card_words, alignment in readings:
+        card_attempts, card_errors = word_outcomes(card_words, alignment)
+        attempts.update(card_attempts)
+        errors.update(card_errors)
+    if not attempts:
+        return
+    await _add_counts(db, UserWordStat, ["user_id", "word"], [
+        {"user_id": user_id, "word": w, "attempts": n, "errors": errors[w], "last_seen_at": now}
+        for w, n in attempts.items()
+    ])
+    await _add_counts(db, WordStat, ["word"], [
+        {"word": w, "attempts": n, "errors": errors[w]}
+        for w, n in attempts.items()
+    ])
+
+
+DAILY_COUNTERS = (
+    "sessions", "wpm_total", "accuracy_total", "words_total",
+    "words_correct", "errors", "reading_seconds",
+)
+
+
+async def record_daily_rollup(db, user_id, metrics, duration_seconds, created_at):
+    """Add one session to the student's row for that day"""
+    stmt = _insert(db, UserDailyStat).values(
+        user_id=user_id,
+        day=created_at.date(),
+        sessions=1,
+        wpm_total=metrics["wpm"],
+        accuracy_total=metrics["accuracy"],
+        words_total=metrics["total_words"],
+        words_correct=metrics["correct_words"],
+        errors=metrics["errors"],
+        reading_seconds=duration_seconds,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "day"],
+        set_={c: getattr(UserDailyStat, c) + getattr(stmt.excluded, c) for c in DAILY_COUNTERS},
+    )
+    await db.execute(stmt)
+
+
+async def record_leaderboard_entry(db, user_id, school_group, level, wpm, created_at):
+    """Keep the student's best WPM for that week's (group, level) board"""
+    stmt = _insert(db, LeaderboardEntry).values(
+        week=week_start(created_at.date()),
+        school_group=school_group,
+        level=level,
+        user_id=user_id,
+        best_wpm=wpm,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["week", "school_group", "level", "user_id"],
+        set_={"best_wpm": case(
+            (stmt.excluded.best_wpm > LeaderboardEntry.best_wpm, stmt.excluded.best_wpm),
+            else_=LeaderboardEntry.best_wpm,
+        )},
+    )
+    await db.execute(stmt)
@@ -0,0 +1,19 @@
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+from app.core.wordpack import pack_words, unpack_words
+
+
+class PackedWordList(TypeDecorator):
+    """list[str] column stored as dictionary-packed bytes (see core/wordpack.py)"""
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return pack_words(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return []
+        return unpack_words(value)
@@ -1,16 +1,56 @@
-from app.api import user, session, word, speech
+import time
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
+
+from app.api import user, session, word, speech, card, analytics, leaderboard
 from app.routers import auth
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.db.database import engine, Base
-from app.db.seed import seed_database
-import time
-from collections import deque
-from app.models import User, ReadingSession, Word
+from sqlalchemy.engine import make_url
+from app.config import settings
+from app.db.database import engine, async_engine, Base
+from app.db.migrations import run_migrations
+from app.models import User, ReadingSession, SessionCard, Word, UserStat, UserWordStat, WordStat, UserDailyStat, LeaderboardEntry
+from app.core.security import hashing_stats
+from app.core.user_cache import user_cache
+from app.core.word_index import word_index
+from app.core.leaderboard import leaderboards
+from app.core.metrics import MetricsMiddleware, instrument_engine, metrics, render_prometheus
+from app.core.speech_pool import get_speech_pool
+from app.core.static_assets import frontend_assets
+from app.core.startup import STARTUP_WARMUP, startup_profile, warm_up
+from app.db.database import AsyncSessionLocal
 
 import os
 
-app = FastAPI(title="Leesfeest - Technisch Lezen & Spelling")
+
+@asynccontextmanager
+async def lifespan(app):
+    # Runs once per worker before uvicorn accepts connections, so the
+    # first request (and the health check) finds everything ready
+    print(f"[Config] Using database: {make_url(settings.database_url).render_as_string(hide_password=True)}")
+    with startup_profile.phase("schema"):
+        # Ensure tables are created on startup (with models registered)
+        Base.metadata.create_all(bind=engine)
+        run_migrations(engine)
+    async with AsyncSessionLocal() as db:
+        with startup_profile.phase("word_index"):
+            await word_index.ensure_loaded(db)
+        with startup_profile.phase("leaderboards"):
+            await leaderboards.warm(db)
+        if STARTUP_WARMUP:
+            await warm_up(db)
+    with startup_profile.phase("static_assets"):
+        frontend_assets.load()
+    get_speech_pool().start()
+    startup_profile.ready = True
+    startup_profile.print_report()
+    yield
+    await get_speech_pool().close()
+
+
+app = FastAPI(title="Leesfeest - Technisch Lezen & Spelling", lifespan=lifespan)
 
 # CORS configuration - read allowed origins from environment
 ALLOWED_ORIGINS = os.environ.get("ALLOWED_ORIGINS", "").split(",")
@@ -24,29 +64,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-# Simple in-memory stats (for demo purposes)
-# In production, use Prometheus or a real DB table
-LATENCY_HISTORY = deque(maxlen=100)
-REQUEST_COUNT = 0
-
-@app.middleware("http")
-async def track_latency(request: Request, call_next):
-    global REQUEST_COUNT
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    LATENCY_HISTORY.append(process_time)
-    REQUEST_COUNT += 1
-    return response
-
-# Ensure tables are created on startup (with models registered)
-Base.metadata.create_all(bind=engine)
-# # seed_database()
+# Per-route latency/DB-time histograms, in-flight and websocket gauges.
+# Added last so it is outermost and times CORS handling too
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
 
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi import Request
+from fastapi.responses import PlainTextResponse
 
 # Include routers
 app.include_router(user.router)
@@ -54,20 +82,38 @@ app.include_router(session.router)
 app.include_router(word.router)
 app.include_router(auth.router)
 app.include_router(speech.router)
+app.include_router(card.router)
+app.include_router(analytics.router)
+app.include_router(leaderboard.router)
 
-# Mount separate static folder first to avoid conflict with root catch-all if needed
-# But here we just want to serve the single file app
-app.mount("/static", StaticFiles(directory="../frontend_portable"), name="static")
+# The single file app and its assets, precompressed in memory (see static_assets)
+@app.api_route("/", methods=["GET", "HEAD"], include_in_schema=False)
+async def read_index(request: Request):
+    return frontend_assets.response("index.html", request)
 
-@app.get("/")
-async def read_index():
-    return FileResponse("../frontend_portable/index.html")
+@app.api_route("/static/{name:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def read_static(name: str, request: Request):
+    return frontend_assets.response(name, request)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_prometheus_metrics():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
 
 @app.get("/stats")
 def get_system_stats():
-    avg_latency = sum(LATENCY_HISTORY) / len(LATENCY_HISTORY) if LATENCY_HISTORY else 0
+    request_metrics = metrics.stats()
     return {
-        "total_requests": REQUEST_COUNT,
-        "avg_latency": round(avg_latency, 4),
-        "active_users_mock": 42, # Mock for demo
-    }
\ No newline at end of file
+        "total_requests": request_metrics["requests"]["count"],
+        "avg_latency": round(request_metrics["requests"]["mean_ms"] / 1000, 4),
+        "active_users": user_cache.active_users(),
+        "http": request_metrics,
+        "password_hashing": hashing_stats(),
+        "user_cache": user_cache.stats(),
+        "word_index": word_index.stats(),
+        "static": frontend_assets.stats(),
+        "leaderboards": leaderboards.stats(),
+        "startup": startup_profile.report(),
+    }
+
+
+startup_profile.record("import", time.perf_counter() - _import_started)
@@ -1,3 +1,4 @@
 from .user import User
-from .session import ReadingSession
+from .session import ReadingSession, SessionCard
 from .word import Word
+from .stats import UserStat, UserWordStat, WordStat, UserDailyStat, LeaderboardEntry
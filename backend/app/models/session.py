@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, ForeignKey, JSON, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.sql import func
 from app.db.database import Base
+from app.db.types import PackedWordList
 
 class ReadingSession(Base):
     __tablename__ = "sessions"
+    __table_args__ = (
+        # Serves the per-user history listing (keyset on created_at, id)
+        Index("ix_sessions_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -11,8 +16,28 @@ class ReadingSession(Base):
     duration_seconds = Column(Integer, default=180)
     total_words = Column(Integer, default=0)
     correct_words = Column(Integer, default=0)
-    words_presented = Column(JSON, default=[])
-    words_read = Column(JSON, default=[])
+    words_presented = Column(PackedWordList, default=list)
+    words_read = Column(PackedWordList, default=list)
+    errors = Column(Integer, default=0)
+    self_corrections = Column(Integer, default=0)
+    wpm = Column(Integer, default=0)
+    accuracy = Column(Integer, default=0)
+    level = Column(Integer)  # DMT card 1/2/3 the session was read at, for single-card sessions
+
+
+class SessionCard(Base):
+    """
+    One server-scored card of a session. A test reads three cards of
+    different difficulty, so leaderboards rank these rather than sessions.
+    """
+    __tablename__ = "session_cards"
+
+    id = Column(Integer, primary_key=True)
+    session_id = Column(Integer, ForeignKey("sessions.id"), index=True)
+    level = Column(Integer)  # DMT card 1/2/3
+    duration_seconds = Column(Integer, default=0)
+    total_words = Column(Integer, default=0)
+    correct_words = Column(Integer, default=0)
     errors = Column(Integer, default=0)
     self_corrections = Column(Integer, default=0)
     wpm = Column(Integer, default=0)
@@ -0,0 +1,67 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, DateTime, Float
+from app.db.database import Base
+
+# Running per-student / per-word counters, updated incrementally on each
+# POST /session/ so the adaptivity engine never rescans session history.
+
+class UserStat(Base):
+    __tablename__ = "user_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    sessions = Column(Integer, default=0)
+    words_attempted = Column(Integer, default=0)
+    words_correct = Column(Integer, default=0)
+    level = Column(Integer, default=1)  # recommended DMT card 1/2/3
+    last_wpm = Column(Float, default=0)
+    last_accuracy = Column(Float, default=0)
+    updated_at = Column(DateTime(timezone=True))
+
+
+class UserWordStat(Base):
+    __tablename__ = "user_word_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    word = Column(String, primary_key=True)
+    attempts = Column(Integer, default=0)
+    errors = Column(Integer, default=0)
+    last_seen_at = Column(DateTime(timezone=True))
+
+
+class WordStat(Base):
+    __tablename__ = "word_stats"
+
+    word = Column(String, primary_key=True)
+    attempts = Column(Integer, default=0)
+    errors = Column(Integer, default=0)
+
+
+class UserDailyStat(Base):
+    """
+    Per-student, per-day (UTC) session rollup behind /analytics. Sums, not
+    means, so a session is one upsert; divide by sessions when reading.
+    """
+    __tablename__ = "user_daily_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    sessions = Column(Integer, default=0)
+    wpm_total = Column(Integer, default=0)
+    accuracy_total = Column(Integer, default=0)
+    words_total = Column(Integer, default=0)
+    words_correct = Column(Integer, default=0)
+    errors = Column(Integer, default=0)
+    reading_seconds = Column(Integer, default=0)
+
+
+class LeaderboardEntry(Base):
+    """
+    Best WPM per student per (week, group, level): the persisted form of
+    core/leaderboard.py, loaded a whole board at a time by primary key.
+    """
+    __tablename__ = "leaderboard_entries"
+
+    week = Column(Date, primary_key=True)  # Monday, UTC
+    school_group = Column(Integer, primary_key=True)
+    level = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    best_wpm = Column(Integer, default=0)
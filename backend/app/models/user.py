@@ -9,4 +9,4 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     name = Column(String, nullable=False)
     role = Column(String, default="student") # student, teacher, admin
-    school_group = Column(Integer) # 3-8
\ No newline at end of file
+    school_group = Column(Integer, index=True) # 3-8; indexed for class analytics
\ No newline at end of file
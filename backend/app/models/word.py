@@ -8,3 +8,5 @@ class Word(Base):
     text = Column(String, nullable=False)
     difficulty_level = Column(Integer, default=1)  # DMT 1/2/3
     pattern_tags = Column(String, default="")
+    syllables = Column(Integer)
+    frequency_rank = Column(Integer)  # 1 = most frequent; NULL for hand-added words
@@ -1,21 +1,25 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
 from app.models.user import User
-from app.schemas.user import Token, UserRead, UserCreate
-from app.core.security import verify_password, create_access_token, get_password_hash, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.schemas.user import Token, TokenData, UserRead, UserCreate
+from app.core.security import verify_password_async, create_access_token, get_password_hash_async, ACCESS_TOKEN_EXPIRE_MINUTES, SECRET_KEY, ALGORITHM
+from app.core.user_cache import CachedUser, user_cache
 
 router = APIRouter(tags=["auth"])
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    from jose import JWTError, jwt
-    from app.core.security import SECRET_KEY, ALGORITHM
-    from app.schemas.user import TokenData
-    
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    # Tokens we've already validated resolve from memory: no JWT decode, no DB hit
+    cached = user_cache.get(token)
+    if cached is not None:
+        return cached
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -30,15 +34,19 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except JWTError:
         raise credentials_exception
         
-    user = db.query(User).filter(User.email == token_data.email).first()
+    result = await db.execute(select(User).where(User.email == token_data.email))
+    user = result.scalars().first()
     if user is None:
         raise credentials_exception
-    return user
+    snapshot = CachedUser.from_orm(user)
+    user_cache.put(token, snapshot, payload.get("exp"))
+    return snapshot
 
 @router.post("/token", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == form_data.username).first() # OAuth2 form sends username, we use email
-    if not user or not verify_password(form_data.password, user.hashed_password):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(User).where(User.email == form_data.username)) # OAuth2 form sends username, we use email
+    user = result.scalars().first()
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -51,13 +59,13 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/register", response_model=UserRead)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     try:
-        db_user = db.query(User).filter(User.email == user.email).first()
-        if db_user:
+        result = await db.execute(select(User).where(User.email == user.email))
+        if result.scalars().first():
             raise HTTPException(status_code=400, detail="Email already registered")
         
-        hashed_password = get_password_hash(user.password)
+        hashed_password = await get_password_hash_async(user.password)
         new_user = User(
             email=user.email,
             hashed_password=hashed_password,
@@ -66,8 +74,9 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
             school_group=user.school_group
         )
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        await db.refresh(new_user)
+        user_cache.invalidate_email(new_user.email)
         return new_user
     except HTTPException:
         raise
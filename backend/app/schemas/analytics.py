@@ -0,0 +1,45 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import Optional
+
+
+class DailyPoint(BaseModel):
+    day: date
+    sessions: int
+    active_students: int = 1
+    avg_wpm: float
+    avg_accuracy: float
+    words_correct: int
+    reading_minutes: float
+
+
+class StudentSummary(BaseModel):
+    user_id: int
+    name: str
+    level: int = 1
+    total_sessions: int = 0
+    last_wpm: float = 0
+    last_accuracy: float = 0
+    # Over the requested window
+    sessions: int = 0
+    avg_wpm: float = 0
+    avg_accuracy: float = 0
+    last_active: Optional[date] = None
+
+
+class ClassOverview(BaseModel):
+    school_group: int
+    days: int
+    students: list[StudentSummary] = []
+    daily: list[DailyPoint] = []
+    level_distribution: dict[int, int] = {}
+
+
+class StudentTrend(BaseModel):
+    user_id: int
+    name: str
+    school_group: Optional[int] = None
+    days: int
+    level: int = 1
+    total_sessions: int = 0
+    daily: list[DailyPoint] = []
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class CardRead(BaseModel):
+    test_id: Optional[int] = None
+    level: int
+    words: list[str]
+    review_words: list[str] = []
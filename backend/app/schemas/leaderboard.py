@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import Optional
+
+
+class LeaderboardRow(BaseModel):
+    rank: int
+    user_id: int
+    name: str
+    wpm: int
+
+
+class LeaderboardRead(BaseModel):
+    school_group: int
+    week: date
+    level: int
+    size: int
+    entries: list[LeaderboardRow] = []
+    me: Optional[LeaderboardRow] = None
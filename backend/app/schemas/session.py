@@ -1,5 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, validator
 from datetime import datetime
+from typing import Optional
+
+# Well above three one-minute DMT cards (and their transcripts), far below
+# what the packed word-list format can hold (core/wordpack.py)
+MAX_SESSION_WORDS = 2000
+# A DMT test is three cards
+MAX_SESSION_CARDS = 3
 
 class SessionBase(BaseModel):
     user_id: int
@@ -10,11 +17,31 @@ class SessionBase(BaseModel):
     self_corrections: int = 0
     wpm: int = 0
     accuracy: int = 0
-    words_presented: list[str] = []
-    words_read: list[str] = []
+    words_presented: list[str] = Field([], max_items=MAX_SESSION_WORDS)
+    words_read: list[str] = Field([], max_items=MAX_SESSION_WORDS)
+    # DMT card level read, for a single card; a test sends it per card.
+    # Only server-scored cards with a level appear on the leaderboards
+    level: Optional[int] = Field(None, ge=1, le=3)
+
+class CardReading(BaseModel):
+    """One card of a test and the transcript heard while it was read"""
+    duration_seconds: int = Field(..., ge=0)
+    words_presented: list[str] = Field(..., min_items=1, max_items=MAX_SESSION_WORDS)
+    words_read: list[str] = Field([], max_items=MAX_SESSION_WORDS)
+    level: Optional[int] = Field(None, ge=1, le=3)
 
 class SessionCreate(SessionBase):
-    pass
+    # Cards sent with their transcripts are scored by the server; the
+    # client's counts are only used when no card words are sent at all
+    cards: list[CardReading] = Field([], max_items=MAX_SESSION_CARDS)
+
+    @validator("cards")
+    def cards_fit_one_session(cls, cards):
+        # Stored as one session, so the joined word lists share the cap
+        for name in ("words_presented", "words_read"):
+            if sum(len(getattr(card, name)) for card in cards) > MAX_SESSION_WORDS:
+                raise ValueError(f"at most {MAX_SESSION_WORDS} {name} per session")
+        return cards
 
 class SessionRead(SessionBase):
     id: int
@@ -2,6 +2,8 @@
 from pydantic import BaseModel, EmailStr
 from typing import Optional
 
+from app.schemas.word import BulkRowError
+
 # Schema for creating a new user (POST request)
 class UserCreate(BaseModel):
     name: str
@@ -29,3 +31,8 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
+
+class RosterImportReport(BaseModel):
+    created: list[UserRead] = []
+    existing: list[str] = []
+    errors: list[BulkRowError] = []
@@ -5,6 +5,8 @@ class WordBase(BaseModel):
     text: str
     difficulty_level: int = 1
     pattern_tags: str | None = None
+    syllables: int | None = None
+    frequency_rank: int | None = None
 
 
 class WordCreate(WordBase):
@@ -16,3 +18,14 @@ class WordRead(WordBase):
 
     class Config:
         orm_mode = True
+
+
+class BulkRowError(BaseModel):
+    line: int
+    error: str
+
+
+class BulkImportReport(BaseModel):
+    inserted: int = 0
+    duplicates: int = 0
+    errors: list[BulkRowError] = []
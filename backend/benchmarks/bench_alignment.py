@@ -0,0 +1,99 @@
+"""
+Alignment benchmark over generated DMT sheets.
+
+Simulates a reader on every sheet in dmt_tests.json (skips, misreads,
+self-corrections, repeats, fillers) and times the plain aligner and the
+phonetic-matcher path (align_card) that runs inside POST /session/.
+
+    cd backend && python benchmarks/bench_alignment.py
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(BACKEND_DIR)
+
+from app.core.alignment import align
+from app.core.matcher import vocabulary_keys
+from app.core.scoring import align_card
+
+
+def simulate_reading(card, rng):
+    spoken = []
+    skip_until = 0
+    for i, word in enumerate(card):
+        if i < skip_until:
+            continue
+        roll = rng.random()
+        if roll < 0.01:
+            skip_until = i + rng.randint(5, 10)         # skipped line
+            continue
+        if roll < 0.02:
+            spoken.extend(w[::-1] for w in card[i:i + rng.randint(5, 8)])
+            skip_until = i + 5                          # run of misreads
+            continue
+        if roll < 0.04:
+            continue                                    # skip
+        if roll < 0.08:
+            spoken.append(word[::-1])                   # misread
+            continue
+        if roll < 0.11:
+            spoken.extend([word[:-1] + "x", word])      # self-correction
+            continue
+        if roll < 0.13:
+            spoken.extend([word, word])                 # repeat
+            continue
+        if roll < 0.15:
+            spoken.append("eh")                         # filler
+        spoken.append(word)
+    return spoken
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--card-size", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with open(os.path.join(BACKEND_DIR, "dmt_tests.json"), encoding="utf-8") as f:
+        tests = json.load(f)
+    vocabulary = sorted({w for t in tests for sheet in t["sheets"].values() for w in sheet})
+
+    # Sheets in dmt_tests.json are capped by pool size; pad them to a full card
+    cards = []
+    for t in tests:
+        for sheet in t["sheets"].values():
+            card = list(sheet)
+            while len(card) < args.card_size:
+                card.append(rng.choice(vocabulary))
+            cards.append(card[:args.card_size])
+    readings = [simulate_reading(card, rng) for card in cards]
+
+    print(f"{len(cards)} cards x {args.card_size} words, "
+          f"{statistics.mean(len(r) for r in readings):.0f} spoken tokens on average")
+
+    start = time.perf_counter()
+    vocabulary_keys()
+    print(f"vocabulary keys built in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    for name, fn in (("align()", align), ("align_card()", align_card)):
+        timings = []
+        accuracy = []
+        for card, spoken in zip(cards, readings):
+            start = time.perf_counter()
+            result = fn(card, spoken)
+            timings.append(time.perf_counter() - start)
+            accuracy.append(result.correct / result.total_words)
+
+        timings_us = sorted(t * 1e6 for t in timings)
+        print(f"{name:>13}: mean={statistics.mean(timings_us):.0f}us "
+              f"p50={timings_us[len(timings_us) // 2]:.0f}us "
+              f"p99={timings_us[int(len(timings_us) * 0.99)]:.0f}us "
+              f"max={timings_us[-1]:.0f}us  "
+              f"correct={statistics.mean(accuracy) * 100:.1f}%")
@@ -0,0 +1,91 @@
+"""
+Card generation throughput: GET /card/generate vs the static dmt_tests.json.
+
+Measures the bare generator and the full endpoint by calling the ASGI app
+directly (one worker, no HTTP client or network in the numbers), plus the
+bytes each card costs.
+
+    cd backend && python benchmarks/bench_card_generation.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+from app.core.cards import generate_card, level_pools
+
+
+def bench_generator(n, size):
+    level_pools()
+    start = time.perf_counter()
+    for i in range(n):
+        generate_card(i, i % 3 + 1, size)
+    elapsed = time.perf_counter() - start
+    print(f"generate_card(): {n / elapsed:10.0f} cards/s  ({elapsed / n * 1e6:.1f}us per card)")
+
+
+async def asgi_get(app, path, query_string):
+    """Drive the ASGI app directly so only server-side work is measured"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": query_string.encode(), "root_path": "",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 0), "server": ("bench", 80),
+    }
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+
+    status, body = None, b""
+
+    async def send(message):
+        nonlocal status, body
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            body += message.get("body", b"")
+
+    await app(scope, receive, send)
+    return status, body
+
+
+async def bench_endpoint(n, size, concurrency):
+    from app.main import app
+
+    _, sample = await asgi_get(app, "/card/generate", f"test_id=1&level=2&size={size}")
+    queue = iter(range(n))
+
+    async def worker():
+        for i in queue:
+            status, _ = await asgi_get(app, "/card/generate", f"test_id={i}&level={i % 3 + 1}&size={size}")
+            assert status == 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    print(f"GET /card/generate: {n / elapsed:7.0f} cards/s  "
+          f"({elapsed / n * 1e6:.0f}us per request incl. middleware, {concurrency} concurrent)")
+    print(f"bytes per card: {len(sample)} "
+          f"vs dmt_tests.json: {os.path.getsize(os.path.join(BACKEND_DIR, 'dmt_tests.json'))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", type=int, default=5000)
+    parser.add_argument("--size", type=int, default=10, help="words per card (the frontend uses 10)")
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    bench_generator(args.n * 10, args.size)
+    asyncio.run(bench_endpoint(args.n, args.size, args.concurrency))
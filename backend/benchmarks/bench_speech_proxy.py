@@ -0,0 +1,129 @@
+"""
+Speech proxy under load: many simulated readers on /api/speech/transcribe.
+
+Starts uvicorn with SPEECH_BACKEND=mock (no network, scripted transcripts)
+unless --url points at a running server, then connects N readers that
+each stream one 100 ms audio chunk at a time like MediaRecorder.start(100).
+
+Reports time to first transcript and transcript latency: how long after
+the audio a result covers was sent the reader received it. That includes
+the mock's recognition delay (SPEECH_MOCK_LATENCY_MS, default 300 ms), so
+proxy overhead is what the tail adds on top of it.
+
+    cd backend && python benchmarks/bench_speech_proxy.py --readers 200 --seconds 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import websockets
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+CHUNK_INTERVAL = 0.1
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def reader(url, seconds, chunk_bytes, bytes_per_second, latencies, first_results, errors):
+    chunks = int(seconds / CHUNK_INTERVAL)
+    sent_at = []  # wall-clock time each chunk went out
+    try:
+        async with websockets.connect(url, max_size=None) as ws:
+            opened = time.perf_counter()
+
+            async def receive():
+                async for message in ws:
+                    now = time.perf_counter()
+                    result = json.loads(message)
+                    if "error" in result:
+                        errors.append(result["error"])
+                        return
+                    if "start" not in result:
+                        continue
+                    audio_end = result["start"] + result["duration"]
+                    chunk = min(len(sent_at) - 1, int(audio_end * bytes_per_second / chunk_bytes))
+                    if chunk >= 0:
+                        latencies.append(now - sent_at[chunk])
+                    if first_result[0] is None:
+                        first_result[0] = now - opened
+
+            first_result = [None]
+            receiver = asyncio.ensure_future(receive())
+            for _ in range(chunks):
+                sent_at.append(time.perf_counter())
+                await ws.send(b"\0" * chunk_bytes)
+                await asyncio.sleep(CHUNK_INTERVAL)
+            await asyncio.sleep(1.0)
+            await ws.close()
+            receiver.cancel()
+            if first_result[0] is not None:
+                first_results.append(first_result[0])
+    except Exception as e:
+        errors.append(repr(e))
+
+
+async def run(url, readers, seconds, chunk_bytes, bytes_per_second, ramp):
+    latencies, first_results, errors = [], [], []
+    tasks = []
+    for _ in range(readers):
+        tasks.append(asyncio.ensure_future(
+            reader(url, seconds, chunk_bytes, bytes_per_second, latencies, first_results, errors)))
+        await asyncio.sleep(ramp / readers)
+    started = time.perf_counter()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    print(f"{readers} readers x {seconds}s audio in {elapsed:.1f}s, {len(errors)} errors")
+    if errors:
+        print(f"  first error: {errors[0]}")
+    print(f"time to first transcript: p50 {percentile(first_results, 0.5) * 1000:7.1f} ms  "
+          f"p95 {percentile(first_results, 0.95) * 1000:7.1f} ms")
+    print(f"transcript latency:       p50 {percentile(latencies, 0.5) * 1000:7.1f} ms  "
+          f"p95 {percentile(latencies, 0.95) * 1000:7.1f} ms  "
+          f"p99 {percentile(latencies, 0.99) * 1000:7.1f} ms  ({len(latencies)} results)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readers", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which readers connect")
+    parser.add_argument("--url", help="ws:// URL of a running server (default: start one with the mock backend)")
+    parser.add_argument("--port", type=int, default=8791)
+    args = parser.parse_args()
+
+    bytes_per_second = float(os.environ.get("SPEECH_MOCK_BYTES_PER_SECOND", "4000"))
+    chunk_bytes = int(bytes_per_second * CHUNK_INTERVAL)
+
+    server = None
+    url = args.url
+    if url is None:
+        env = dict(os.environ, SPEECH_BACKEND="mock")
+        env.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_speech.db"))
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL,
+        )
+        url = f"ws://127.0.0.1:{args.port}/api/speech/transcribe"
+        time.sleep(5)
+    try:
+        asyncio.run(run(url, args.readers, args.seconds, chunk_bytes, bytes_per_second, args.ramp))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
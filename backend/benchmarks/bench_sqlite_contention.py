@@ -0,0 +1,122 @@
+"""
+Write-contention benchmark: default SQLite vs SQLITE_MODE=production.
+
+Simulates a class saving sessions at once (many POST /session/ writers)
+while others load their history (readers), against a database file on
+the given directory. On Render point it at the persistent disk:
+
+    cd backend && python benchmarks/bench_sqlite_contention.py --dir /data
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base, build_engine
+from app.models import ReadingSession, User
+
+WORDS = ["kat", "boom", "fiets", "school", "bibliotheek", "verjaardag"] * 20
+
+
+def run(mode, path, writers, writes_each, readers):
+    if os.path.exists(path):
+        os.remove(path)
+    engine = build_engine(f"sqlite:///{path}", mode)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    db = Session()
+    db.add_all([User(email=f"kid{i}@example.com", hashed_password="x", name=f"kid{i}", school_group=5)
+                for i in range(writers)])
+    db.commit()
+    db.close()
+
+    write_latencies, read_latencies = [], []
+    failures = [0]
+    done = threading.Event()
+    lock = threading.Lock()
+
+    def writer(user_id):
+        for _ in range(writes_each):
+            start = time.perf_counter()
+            db = Session()
+            try:
+                db.add(ReadingSession(
+                    user_id=user_id, total_words=120, correct_words=100, duration_seconds=60,
+                    words_presented=WORDS, words_read=WORDS[:100], created_at=datetime.utcnow(),
+                ))
+                db.commit()
+            except OperationalError:
+                db.rollback()
+                with lock:
+                    failures[0] += 1
+                continue
+            finally:
+                db.close()
+            with lock:
+                write_latencies.append(time.perf_counter() - start)
+
+    def reader(user_id):
+        while not done.is_set():
+            start = time.perf_counter()
+            db = Session()
+            try:
+                db.query(ReadingSession).filter(ReadingSession.user_id == user_id) \
+                    .order_by(ReadingSession.created_at.desc()).limit(20).all()
+            except OperationalError:
+                with lock:
+                    failures[0] += 1
+                continue
+            finally:
+                db.close()
+            with lock:
+                read_latencies.append(time.perf_counter() - start)
+
+    write_threads = [threading.Thread(target=writer, args=(i + 1,)) for i in range(writers)]
+    read_threads = [threading.Thread(target=reader, args=(i % writers + 1,)) for i in range(readers)]
+    start = time.perf_counter()
+    for t in read_threads + write_threads:
+        t.start()
+    for t in write_threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    for t in read_threads:
+        t.join()
+    engine.dispose()
+
+    def pct(values, q):
+        if not values:
+            return 0.0
+        return statistics.quantiles(values, n=100)[q - 1] * 1000 if len(values) > 1 else values[0] * 1000
+
+    print(f"[{mode:>10}] writes/s={len(write_latencies) / elapsed:8.1f}  "
+          f"write p50={pct(write_latencies, 50):6.2f}ms p95={pct(write_latencies, 95):7.2f}ms  "
+          f"reads={len(read_latencies):6d} read p95={pct(read_latencies, 95):6.2f}ms  "
+          f"failures={failures[0]}")
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dir", default="/data" if os.path.isdir("/data") else tempfile.gettempdir())
+    parser.add_argument("--writers", type=int, default=30)
+    parser.add_argument("--writes", type=int, default=20, help="sessions saved per writer")
+    parser.add_argument("--readers", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"Benchmarking on {args.dir}: {args.writers} writers x {args.writes} sessions, {args.readers} readers")
+    for mode in ("default", "production"):
+        run(mode, os.path.join(args.dir, f"bench_{mode}.db"), args.writers, args.writes, args.readers)
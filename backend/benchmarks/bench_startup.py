@@ -0,0 +1,128 @@
+"""
+Cold start: import-time breakdown, time to ready and first-request latency.
+
+1. `python -X importtime -c "import app.main"`, summed per top-level
+   package (app modules per module), to see what the import costs.
+2. Starts uvicorn on a fresh SQLite database --runs times with and
+   without the warm-up (STARTUP_WARMUP), and reports the median of:
+   spawn -> first 200 from /stats, then the first login, the first
+   authenticated request, the first card and the first scored session.
+
+    cd backend && python benchmarks/bench_startup.py --runs 5
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def temp_env(**extra):
+    env = dict(os.environ, **extra)
+    env["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_startup.db")
+    env.setdefault("SECRET_KEY", "bench-startup")
+    return env
+
+
+def import_breakdown(top):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=temp_env(), capture_output=True, text=True,
+    )
+    by_package = Counter()
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        parts = name.split(".")
+        key = ".".join(parts[:3]) if parts[0] == "app" else parts[0]
+        by_package[key] += int(match.group(1))
+    total = sum(by_package.values())
+    print(f"import app.main: {total / 1000:.0f} ms (self time per package)")
+    for name, us in by_package.most_common(top):
+        print(f"  {us / 1000:8.1f} ms  {name}")
+    print()
+
+
+def request(url, data=None, headers=None, json_body=None):
+    headers = dict(headers or {})
+    if json_body is not None:
+        data = json.dumps(json_body).encode()
+        headers["Content-Type"] = "application/json"
+    elif data is not None:
+        data = urllib.parse.urlencode(data).encode()
+    started = time.perf_counter()
+    with urllib.request.urlopen(urllib.request.Request(url, data=data, headers=headers)) as response:
+        body = response.read()
+    return time.perf_counter() - started, body
+
+
+def cold_start(port, warmup):
+    env = temp_env(STARTUP_WARMUP="1" if warmup else "0", SPEECH_POOL_SIZE="0")
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                request(base + "/stats")
+                break
+            except (urllib.error.URLError, ConnectionError):
+                if server.poll() is not None:
+                    raise RuntimeError("server exited during startup")
+                time.sleep(0.01)
+        timings = {"ready": time.perf_counter() - started}
+
+        request(base + "/register", json_body={
+            "name": "Bench", "email": "bench@example.com", "password": "bench", "school_group": 5,
+        })
+        timings["login"], body = request(base + "/token", data={"username": "bench@example.com", "password": "bench"})
+        auth = {"Authorization": "Bearer " + json.loads(body)["access_token"]}
+        timings["users_me"], _ = request(base + "/users/me", headers=auth)
+        timings["card"], body = request(base + "/card/generate?test_id=1&level=2")
+        words = json.loads(body)["words"]
+        timings["session"], _ = request(base + "/session/", headers=auth, json_body={
+            "user_id": 0, "total_words": len(words), "correct_words": 0, "duration_seconds": 60,
+            "words_presented": words, "words_read": words[:-1],
+        })
+        return timings
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15, help="packages to list in the import breakdown")
+    parser.add_argument("--port", type=int, default=8792)
+    args = parser.parse_args()
+
+    import_breakdown(args.top)
+
+    for warmup in (False, True):
+        runs = [cold_start(args.port, warmup) for _ in range(args.runs)]
+        median = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+        print(f"warm-up {'on ' if warmup else 'off'}: ready {median['ready'] * 1000:6.0f} ms | first "
+              + "  ".join(f"{key} {median[key] * 1000:5.1f}" for key in median if key != "ready")
+              + f"  ms (median of {args.runs})")
+
+
+if __name__ == "__main__":
+    main()
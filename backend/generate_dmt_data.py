@@ -1,32 +1,37 @@
+import argparse
 import json
+import os
 import random
 import re
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Simple Dutch vowel patterns (simplified for categorization)
 VOWELS = "aeiouyäëïöüáéíóú"
 DIPHTHONGS = ["au", "ee", "ei", "eu", "ie", "ij", "oe", "ou", "ui", "uu", "oo", "aa"]
 
+# Common Dutch complex clusters
+CLUSTERS = ["scht", "cht", "nk", "ng", "st", "str", "spr", "sch", "kr", "tr", "pr", "gr"]
+
+# Compiled once and reused for every word: a vowel group is one syllable-ish,
+# and a single alternation finds any cluster in one scan instead of one per cluster
+VOWEL_GROUP = re.compile(f"[{VOWELS}]+")
+CLUSTER_RE = re.compile("|".join(sorted(CLUSTERS, key=len, reverse=True)))
+
 def count_syllables(word):
-    word = word.lower()
     # Count vowel groups as one syllable-ish approximation
-    count = 0
-    i = 0
-    while i < len(word):
-        if word[i] in VOWELS:
-            count += 1
-            while i < len(word) and word[i] in VOWELS:
-                i += 1
-        else:
-            i += 1
-    return count
+    return len(VOWEL_GROUP.findall(word.lower()))
 
 def has_complex_cluster(word):
-    # Common Dutch complex clusters
-    clusters = ["scht", "cht", "nk", "ng", "st", "str", "spr", "sch", "kr", "tr", "pr", "gr"]
-    for c in clusters:
-        if c in word.lower():
-            return True
-    return False
+    return CLUSTER_RE.search(word.lower()) is not None
+
+def classify_level(syllables, cluster, length):
+    if syllables == 1:
+        if cluster or length > 4:
+            return 2
+        return 1
+    return 3
 
 # Top words from frequency list (manually added some for quality)
 word_pool = [
@@ -39,15 +44,9 @@ level2_pool = ["stoel", "sneeuw", "vlaai", "storm", "jurk", "grond", "korst", "v
 level3_pool = ["bankstel", "familie", "wandelingen", "banden", "aarzelen", "dromen", "keukentafel", "computer", "olifant", "vliegtuig", "telefoon", "middag", "avond", "morgen", "vandaag", "gisteren"]
 
 # Extend pools from long frequency data
+level_pools = {1: level1_pool, 2: level2_pool, 3: level3_pool}
 for w in word_pool:
-    syl = count_syllables(w)
-    if syl == 1:
-        if has_complex_cluster(w) or len(w) > 4:
-            level2_pool.append(w)
-        else:
-            level1_pool.append(w)
-    else:
-        level3_pool.append(w)
+    level_pools[classify_level(count_syllables(w), has_complex_cluster(w), len(w))].append(w)
 
 def generate_sheets():
     tests = []
@@ -71,8 +70,70 @@ def generate_sheets():
         })
     return tests
 
+# -----------------------------------------------------------------------------
+# Batch classification of whole frequency lists into the words table
+# -----------------------------------------------------------------------------
+
+def load_frequency_list(path):
+    """Words in rank order; accepts plain lists and 'word count' lines (nl_50k.txt)"""
+    with open(path, encoding="utf-8") as f:
+        words = [line.split(maxsplit=1)[0].lower() for line in f if line.strip()]
+    # Keep the first (most frequent) occurrence of each word
+    return list(dict.fromkeys(w for w in words if w.isalpha()))
+
+def classify_words(words):
+    """One row per word: level, syllables, cluster flag and frequency rank"""
+    # Each feature is one pass of a precompiled regex over the whole batch
+    syllables = [len(VOWEL_GROUP.findall(w)) for w in words]
+    clusters = [CLUSTER_RE.search(w) is not None for w in words]
+    return [
+        {
+            "text": w,
+            "difficulty_level": classify_level(syl, cluster, len(w)),
+            "pattern_tags": "consonant cluster" if cluster else "",
+            "syllables": syl,
+            "frequency_rank": rank,
+        }
+        for rank, (w, syl, cluster) in enumerate(zip(words, syllables, clusters), 1)
+    ]
+
+def import_words(rows, batch_size=5000):
+    """Bulk insert rows into the words table, skipping words already present"""
+    import sys
+    sys.path.append(BASE_DIR)
+    from sqlalchemy import select
+    from app.db.database import engine, Base
+    from app.models import Word
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        existing = set(conn.execute(select(Word.text)).scalars())
+        new_rows = [r for r in rows if r["text"] not in existing]
+        for i in range(0, len(new_rows), batch_size):
+            conn.execute(Word.__table__.insert(), new_rows[i:i + batch_size])
+    return len(new_rows)
+
 if __name__ == "__main__":
-    dmt_data = generate_sheets()
-    with open("c:/repo/dmt-app/backend/dmt_tests.json", "w", encoding="utf-8") as f:
-        json.dump(dmt_data, f, indent=2, ensure_ascii=False)
-    print(f"Generated 200 tests in c:/repo/dmt-app/backend/dmt_tests.json")
+    parser = argparse.ArgumentParser(description="Generate DMT sheets or classify a frequency list into the words table")
+    parser.add_argument("--classify", metavar="WORDLIST", help="frequency list to classify, e.g. dutch_5000.txt or nl_50k.txt")
+    parser.add_argument("--import-db", action="store_true", help="bulk insert the classified words into the words table")
+    args = parser.parse_args()
+
+    if args.classify:
+        start = time.perf_counter()
+        words = load_frequency_list(args.classify)
+        loaded = time.perf_counter()
+        rows = classify_words(words)
+        classified = time.perf_counter()
+        levels = {level: sum(r["difficulty_level"] == level for r in rows) for level in (1, 2, 3)}
+        print(f"Classified {len(rows)} words in {(classified - loaded) * 1000:.0f} ms "
+              f"(load {(loaded - start) * 1000:.0f} ms) - levels {levels}")
+        if args.import_db:
+            inserted = import_words(rows)
+            print(f"Inserted {inserted} new words in {(time.perf_counter() - classified) * 1000:.0f} ms")
+    else:
+        output_path = os.path.join(BASE_DIR, "dmt_tests.json")
+        dmt_data = generate_sheets()
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(dmt_data, f, indent=2, ensure_ascii=False)
+        print(f"Generated 200 tests in {output_path}")
@@ -0,0 +1,54 @@
+"""
+Shared fixtures. The app reads its settings from the environment at import
+time, so point it at a throwaway SQLite file before anything imports app.
+
+    cd backend && pip install -r requirements-dev.txt && python -m pytest
+"""
+import itertools
+import os
+import sys
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="leesfeest-tests-")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_tmp, "test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ["SPEECH_POOL_SIZE"] = "0"
+os.environ["STARTUP_WARMUP"] = "0"
+os.environ["METRICS_DIR"] = ""
+# Scripted in-process recognizer, fast enough for a test to read a card
+os.environ["SPEECH_BACKEND"] = "mock"
+os.environ["SPEECH_MOCK_LATENCY_MS"] = "0"
+os.environ["SPEECH_MOCK_WORDS_PER_SECOND"] = "1000"
+os.environ["SPEECH_UPSTREAM_DRAIN_SECONDS"] = "1"
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pytest
+from fastapi.testclient import TestClient
+
+_emails = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+    # Entering the client runs the lifespan (schema, migrations, warm caches)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def make_user(client):
+    """Register a user and return (user json, auth headers)"""
+
+    def make(role="student", school_group=5, name=None):
+        email = f"user{next(_emails)}@example.com"
+        response = client.post("/register", json={
+            "name": name or email.split("@")[0], "email": email, "password": "secret",
+            "school_group": school_group, "role": role,
+        })
+        assert response.status_code == 200, response.text
+        token = client.post("/token", data={"username": email, "password": "secret"}).json()["access_token"]
+        return response.json(), {"Authorization": f"Bearer {token}"}
+
+    return make
@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+from app.core.alignment import IncrementalAligner, align, normalize_phonetic
+from app.core.cards import generate_card
+from app.core.scoring import LiveScorer, align_card
+
+
+def _simulated_reading(card, rng):
+    """A child's transcript: misreads, skips, skipped lines, repeats, fillers, self-corrections, split compounds"""
+    spoken = []
+    skip_until = 0
+    for i, word in enumerate(card[:rng.randint(len(card) // 2, len(card))]):
+        if i < skip_until:
+            continue
+        roll = rng.random()
+        if roll < 0.02:
+            skip_until = i + rng.randint(5, 8)  # skipped line
+            continue
+        if roll < 0.05:
+            continue  # skipped
+        if roll < 0.10:
+            spoken.append("eh")
+        if roll < 0.15:
+            spoken.append(word[::-1])  # misread ...
+            if rng.random() < 0.5:
+                continue  # ... and left
+        if roll > 0.95:
+            spoken.append(spoken[-1] if spoken else word)  # repeat
+        if len(word) >= 8 and rng.random() < 0.3:
+            spoken.extend([word[:len(word) // 2], word[len(word) // 2:]])  # compound heard as two words
+        else:
+            spoken.append(word)
+    return spoken
+
+
+def _chunks(tokens, rng):
+    i = 0
+    while i < len(tokens):
+        size = rng.randint(1, 5)
+        yield tokens[i:i + size]
+        i += size
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_live_scoring_matches_align_card(seed):
+    rng = random.Random(seed)
+    card = generate_card(seed, 1 + seed % 3, 40)
+    spoken = _simulated_reading(card, rng)
+
+    scorer = LiveScorer(card)
+    for chunk in _chunks(spoken, rng):
+        scorer.add_transcript(" ".join(chunk))
+    alignment, metrics = scorer.finish(60)
+
+    assert alignment == align_card(card, spoken)
+    assert scorer.words_read == [w.lower() for w in spoken]
+    assert metrics["correct_words"] <= metrics["total_words"] == len(card)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_chunked_feeding_matches_align(seed):
+    rng = random.Random(seed)
+    card = generate_card(seed, 1 + seed % 3, 40)
+    spoken = _simulated_reading(card, rng)
+
+    aligner = IncrementalAligner(card)
+    settled = []
+    for chunk in _chunks(spoken, rng):
+        settled.extend(aligner.feed(chunk))
+    alignment = aligner.finish()
+
+    assert alignment == align(card, spoken)
+    assert settled == alignment.ops[:len(settled)]
+
+
+def test_counts_for_a_known_reading():
+    card = ["de", "kat", "loopt", "naar", "huis"]
+    spoken = ["de", "kat", "kat", "lopen", "loopt", "huis"]
+
+    alignment = align(card, spoken)
+
+    assert (alignment.correct, alignment.repetitions, alignment.self_corrections, alignment.skips) == (4, 1, 1, 1)
+    assert alignment.attempted == 5
+
+
+def test_ch_folds_to_g_before_c_to_k():
+    assert normalize_phonetic("lach") == normalize_phonetic("lag")
+    assert normalize_phonetic("cola") == normalize_phonetic("kola")
+
+
+def test_resyncs_after_a_skipped_line():
+    card = generate_card(3, 1, 19)
+
+    alignment = align_card(card, card[:3] + card[9:])
+
+    assert (alignment.correct, alignment.skips, alignment.substitutions) == (13, 6, 0)
+
+
+def test_resyncs_after_a_run_of_misreads():
+    card = generate_card(3, 1, 19)
+    junk = ["zebra", "appel", "xylofoon", "qwerty", "plons"]
+
+    alignment = align_card(card, junk + card[5:])
+
+    assert (alignment.correct, alignment.substitutions, alignment.insertions) == (14, 5, 0)
@@ -0,0 +1,65 @@
+from sqlalchemy import delete, select
+
+from app.db.database import engine
+from app.db.migrations import backfill_user_daily_stats
+from app.models.stats import UserDailyStat
+
+GROUP = 2
+
+
+def _post(client, headers, wpm, accuracy, duration=60):
+    response = client.post("/session/", headers=headers, json={
+        "user_id": 0, "total_words": 100, "correct_words": wpm, "duration_seconds": duration,
+        "wpm": wpm, "accuracy": accuracy,
+    })
+    assert response.status_code == 200, response.text
+
+
+def test_class_overview_aggregates_the_rollup(client, make_user):
+    _, teacher = make_user(role="teacher", school_group=GROUP)
+    anna, anna_headers = make_user(school_group=GROUP, name="Anna")
+    bram, bram_headers = make_user(school_group=GROUP, name="Bram")
+    make_user(school_group=GROUP, name="Cas")  # no sessions yet
+    _post(client, anna_headers, 60, 90)
+    _post(client, anna_headers, 80, 100, duration=120)
+    _post(client, bram_headers, 40, 70)
+
+    overview = client.get(f"/analytics/class/{GROUP}", headers=teacher).json()
+
+    students = {s["name"]: s for s in overview["students"]}
+    assert sorted(students) == ["Anna", "Bram", "Cas"]
+    assert (students["Anna"]["sessions"], students["Anna"]["avg_wpm"], students["Anna"]["avg_accuracy"]) == (2, 70.0, 95.0)
+    assert students["Cas"]["sessions"] == 0 and students["Cas"]["last_active"] is None
+    (today,) = overview["daily"]
+    assert (today["sessions"], today["active_students"], today["reading_minutes"]) == (3, 2, 4.0)
+    assert today["avg_wpm"] == 60.0
+    assert sum(overview["level_distribution"].values()) == 3
+
+    trend = client.get(f"/analytics/student/{bram['id']}", headers=anna_headers)
+    assert trend.status_code == 403
+    own = client.get(f"/analytics/student/{anna['id']}", headers=anna_headers).json()
+    assert own["total_sessions"] == 2 and own["daily"][0]["words_correct"] == 140
+
+
+def test_students_cannot_read_class_analytics(client, make_user):
+    _, headers = make_user(school_group=GROUP)
+
+    assert client.get(f"/analytics/class/{GROUP}", headers=headers).status_code == 403
+
+
+def test_backfill_rebuilds_the_incremental_rollup(client, make_user):
+    user, headers = make_user(school_group=GROUP)
+    for wpm in (30, 45, 50):
+        _post(client, headers, wpm, 80)
+
+    def rows():
+        with engine.connect() as conn:
+            result = conn.execute(select(UserDailyStat.__table__).where(UserDailyStat.user_id == user["id"]))
+            return [tuple(row) for row in result]
+
+    incremental = rows()
+    with engine.begin() as conn:
+        conn.execute(delete(UserDailyStat.__table__))
+        backfill_user_daily_stats(conn)
+
+    assert incremental and rows() == incremental
@@ -0,0 +1,109 @@
+import asyncio
+import itertools
+
+from app.core.ingest import RowError, iter_records
+
+_unique = itertools.count(1)
+
+
+def _records(body: bytes, fmt="csv", chunk_size=7):
+    """iter_records over a body delivered in small chunks, as a request stream would"""
+
+    async def stream():
+        for i in range(0, len(body), chunk_size):
+            yield body[i:i + chunk_size]
+
+    async def collect():
+        return [item async for item in iter_records(stream(), fmt)]
+
+    return asyncio.run(collect())
+
+
+def test_csv_rows_with_header_and_line_numbers():
+    records = _records(b"\xef\xbb\xbftext,difficulty_level\r\nkat,1\r\n\r\nbloem, 2\r\n")
+
+    assert records == [(2, {"text": "kat", "difficulty_level": "1"}), (4, {"text": "bloem", "difficulty_level": "2"})]
+
+
+def test_quoted_field_may_span_lines():
+    records = _records(b'text,note\n"two\nlines",x\nkat,y\n')
+
+    assert records == [(2, {"text": "two\nlines", "note": "x"}), (4, {"text": "kat", "note": "y"})]
+
+
+def test_literal_quote_inside_an_unquoted_field():
+    records = _records(b'text,difficulty_level\n5"inch,1\nkat,1\nhond,1\n')
+
+    assert [(n, r["text"]) for n, r in records] == [(2, '5"inch'), (3, "kat"), (4, "hond")]
+
+
+def test_escaped_quotes_inside_a_quoted_field():
+    records = _records(b'text,note\n"zeg ""hoi""\nen ga",x\nkat,y\n')
+
+    assert records == [(2, {"text": 'zeg "hoi"\nen ga', "note": "x"}), (4, {"text": "kat", "note": "y"})]
+
+
+def test_oversized_field_is_a_row_error_and_parsing_continues():
+    body = b'text,note\n"' + b"z" * 200_000 + b'",x\nkat,y\n'
+
+    records = _records(body, chunk_size=4096)
+
+    assert isinstance(records[0][1], RowError) and records[0][0] == 2
+    assert records[1:] == [(3, {"text": "kat", "note": "y"})]
+
+
+def test_unterminated_quote_is_reported_once():
+    records = _records(b'text\nkat\n"open\nrest of the file\n')
+
+    assert records[0] == (2, {"text": "kat"})
+    assert len(records) == 2 and isinstance(records[1][1], RowError) and records[1][0] == 3
+
+
+def test_too_many_columns():
+    (line_no, error), = _records(b"text\nkat,1,extra\n")
+
+    assert line_no == 2 and isinstance(error, RowError)
+
+
+def test_ndjson_errors_are_per_line():
+    records = _records(b'{"text": "kat"}\nnot json\n[1]\n{"text": "bloem"}\n', fmt="ndjson")
+
+    assert [type(r) for _, r in records] == [dict, RowError, RowError, dict]
+    assert [n for n, _ in records] == [1, 2, 3, 4]
+
+
+def test_word_bulk_endpoint_reports_bad_rows(client):
+    suffix = next(_unique)
+    body = (
+        "text,difficulty_level\n"
+        f"bulkwoord{suffix},1\n"
+        f"bulkwoord{suffix},1\n"
+        f"andere{suffix},9\n"
+        f'"twee\nregels{suffix}",2\n'
+        '"' + "z" * 200_000 + '",1\n'
+    ).encode()
+
+    report = client.post("/word/bulk", content=body, headers={"Content-Type": "text/csv"}).json()
+
+    assert report["inserted"] == 1
+    assert report["duplicates"] == 1
+    assert [e["line"] for e in report["errors"]] == [4, 5, 7]
+
+
+def test_roster_import_reports_bad_rows(client, make_user):
+    _, teacher = make_user(role="teacher")
+    _, student = make_user()
+    suffix = next(_unique)
+    body = (
+        "name,email,password\n"
+        f"Anna,anna{suffix}@example.com,geheim\n"
+        f"Bram,not-an-email,geheim\n"
+        f",leeg{suffix}@example.com,geheim\n"
+        f"Anna2,anna{suffix}@example.com,geheim\n"
+    ).encode()
+
+    assert client.post("/user/roster?school_group=4", content=body, headers=student).status_code == 403
+    report = client.post("/user/roster?school_group=4", content=body, headers=teacher).json()
+
+    assert [u["email"] for u in report["created"]] == [f"anna{suffix}@example.com"]
+    assert [e["line"] for e in report["errors"]] == [3, 4, 5]
@@ -0,0 +1,80 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.export import COLUMNS, ENCODERS, WORD_COLUMNS
+
+COLUMN_NAMES = list(COLUMNS) + list(WORD_COLUMNS)
+
+
+def _row(i):
+    return (
+        i, 7, 5, datetime(2026, 3, 1, 12, 0, i % 60), 1 + i % 3, 60, 10, 8, 2, 1, 80 + i, 80,
+        ["de", "kat"], ["de", "kat", "eh"],
+    )
+
+
+def _encode(fmt, batches):
+    async def source():
+        for batch in batches:
+            yield batch
+
+    async def collect():
+        return [chunk async for chunk in ENCODERS[fmt](source(), COLUMN_NAMES)]
+
+    return asyncio.run(collect())
+
+
+BATCHES = [[_row(i) for i in range(3)], [_row(i) for i in range(3, 5)], []]
+
+
+def test_csv_streams_one_chunk_per_batch():
+    chunks = _encode("csv", BATCHES)
+
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert len(chunks) == 3
+    assert rows[0] == COLUMN_NAMES
+    assert rows[1][:4] == ["0", "7", "5", "2026-03-01T12:00:00"]
+    assert rows[1][-2:] == ["de kat", "de kat eh"]
+    assert len(rows) == 6
+
+
+def test_ndjson_is_one_object_per_session():
+    lines = b"".join(_encode("ndjson", BATCHES)).decode("utf-8").splitlines()
+
+    records = [json.loads(line) for line in lines]
+    assert [r["id"] for r in records] == [0, 1, 2, 3, 4]
+    assert records[0]["created_at"] == "2026-03-01T12:00:00"
+    assert records[4]["words_read"] == ["de", "kat", "eh"]
+
+
+def test_arrow_stream_and_parquet_round_trip():
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    table = pa.ipc.open_stream(pa.py_buffer(b"".join(_encode("arrow", BATCHES)))).read_all()
+    assert table.column_names == COLUMN_NAMES
+    assert table.column("wpm").to_pylist() == [80, 81, 82, 83, 84]
+    assert table.column("created_at")[0].as_py() == datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+    parquet = pq.ParquetFile(io.BytesIO(b"".join(_encode("parquet", BATCHES))))
+    assert parquet.metadata.num_row_groups == 2
+    assert parquet.read().column("words_presented").to_pylist()[0] == ["de", "kat"]
+
+
+def test_students_only_export_their_own_sessions(client, make_user):
+    student, headers = make_user(school_group=6)
+    other, _ = make_user(school_group=6)
+    client.post("/session/", headers=headers, json={
+        "user_id": 0, "total_words": 10, "correct_words": 9, "duration_seconds": 60, "wpm": 9, "accuracy": 90,
+    })
+
+    assert client.get(f"/session/export?user_id={other['id']}", headers=headers).status_code == 403
+    response = client.get("/session/export?format=ndjson&school_group=6", headers=headers)
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["user_id"] for line in response.text.splitlines()] == [student["id"]]
@@ -0,0 +1,95 @@
+from sqlalchemy import delete, select
+
+from app.core.leaderboard import Board
+from app.db.database import engine
+from app.db.migrations import backfill_leaderboard_entries
+from app.models.stats import LeaderboardEntry
+
+WORDS = ["de", "kat", "loopt", "naar", "huis", "vis", "boom", "jas", "pen", "aap"] * 10
+
+
+def _card(level, words_read, duration=60):
+    return {"level": level, "duration_seconds": duration, "words_presented": WORDS, "words_read": WORDS[:words_read]}
+
+
+def _post(client, headers, *cards, **fields):
+    body = {"user_id": 0, "total_words": 100, "correct_words": 100, "duration_seconds": 60, "wpm": 100,
+            "accuracy": 100, "cards": list(cards), **fields}
+    response = client.post("/session/", headers=headers, json=body)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_ties_share_a_rank():
+    board = Board([(1, 90), (2, 80), (3, 80), (4, 70), (5, 80)])
+
+    assert board.top(10) == [(1, 1, 90), (2, 2, 80), (2, 3, 80), (2, 5, 80), (5, 4, 70)]
+    assert board.rank(3) == (2, 80)
+    assert board.rank(4) == (5, 70)
+    assert board.rank(99) is None
+
+
+def test_only_a_personal_best_moves_the_board():
+    board = Board([(1, 50), (2, 60)])
+
+    assert not board.update(1, 40)
+    assert board.rank(1) == (2, 50)
+    assert board.update(1, 75)
+    assert board.rank(1) == (1, 75) and board.rank(2) == (2, 60)
+    assert len(board) == 2
+
+
+def test_top_n_matches_a_brute_force_ranking():
+    scores = {user_id: (user_id * 37) % 23 for user_id in range(1, 60)}
+    board = Board(scores.items())
+
+    for user_id, wpm in scores.items():
+        assert board.rank(user_id) == (1 + sum(other > wpm for other in scores.values()), wpm)
+
+
+def test_cards_rank_on_the_level_they_were_read_at(client, make_user):
+    anna, anna_headers = make_user(school_group=7, name="Anna")
+    bram, bram_headers = make_user(school_group=7, name="Bram")
+    _post(client, anna_headers, _card(1, 80))
+    _post(client, anna_headers, _card(1, 60))
+    _post(client, bram_headers, _card(1, 80))
+    # One three-card test: each card ranks on its own board with its own WPM
+    session = _post(client, bram_headers, _card(1, 40), _card(2, 50), _card(3, 20, duration=30))
+
+    level1 = client.get("/leaderboard/?level=1", headers=anna_headers).json()
+    level2 = client.get("/leaderboard/?level=2", headers=bram_headers).json()
+    level3 = client.get("/leaderboard/?level=3", headers=bram_headers).json()
+
+    assert session["level"] is None
+    assert [(row["rank"], row["wpm"]) for row in level1["entries"]] == [(1, 80), (1, 80)]
+    assert level1["me"]["user_id"] == anna["id"] and level1["me"]["wpm"] == 80
+    assert [(row["user_id"], row["wpm"]) for row in level2["entries"]] == [(bram["id"], 50)]
+    assert [(row["user_id"], row["wpm"]) for row in level3["entries"]] == [(bram["id"], 40)]
+
+
+def test_hand_scored_and_unlevelled_sessions_stay_off_the_leaderboards(client, make_user):
+    _, headers = make_user(school_group=8)
+    _post(client, headers, level=3)  # client counts only
+    _post(client, headers, _card(None, 70))
+    assert _post(client, headers, words_presented=WORDS, words_read=WORDS[:70])["level"] is None
+
+    for level in (1, 2, 3):
+        board = client.get(f"/leaderboard/?level={level}", headers=headers).json()
+        assert board["size"] == 0 and board["me"] is None
+
+
+def test_backfill_rebuilds_the_entries_from_cards(client, make_user):
+    _, headers = make_user(school_group=9)
+    _post(client, headers, _card(1, 30), _card(2, 25))
+    _post(client, headers, _card(2, 35))
+
+    def rows():
+        with engine.connect() as conn:
+            return sorted(tuple(row) for row in conn.execute(select(LeaderboardEntry.__table__)))
+
+    incremental = rows()
+    with engine.begin() as conn:
+        conn.execute(delete(LeaderboardEntry.__table__))
+        backfill_leaderboard_entries(conn)
+
+    assert incremental and rows() == incremental
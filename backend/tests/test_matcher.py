@@ -0,0 +1,16 @@
+from app.core.matcher import CardMatcher, phonetic_key
+
+
+def test_long_words_tolerate_two_edits():
+    matcher = CardMatcher(["keukentafel", "boom"], vocabulary=set())
+
+    assert matcher.match("keukntafl", "keukentafel")
+    assert not matcher.match("keukntfl", "keukentafel")
+
+
+def test_dictionary_words_are_misreads_not_spelling_slips():
+    lenient = CardMatcher(["tafel"], vocabulary=set())
+    strict = CardMatcher(["tafel"], vocabulary={phonetic_key("tabel")})
+
+    assert lenient.match("tabel", "tafel")
+    assert not strict.match("tabel", "tafel")
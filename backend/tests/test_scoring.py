@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+from sqlalchemy import select
+
+from app.core.scoring import score_session
+from app.db.database import engine
+from app.models.stats import UserWordStat
+
+
+def _session(**fields):
+    defaults = dict(words_presented=[], words_read=[], duration_seconds=60, total_words=3, errors=0, self_corrections=0)
+    return SimpleNamespace(**dict(defaults, **fields))
+
+
+def test_both_branches_return_session_metrics():
+    aligned = score_session(_session(words_presented=["de", "kat", "loopt"], words_read=["de", "kat"]))
+    counted = score_session(_session(words_read=["de", "kat"], errors=1))
+
+    assert aligned.keys() == counted.keys() == {
+        "total_words", "correct_words", "errors", "self_corrections", "wpm", "accuracy",
+    }
+    assert aligned == {"total_words": 3, "correct_words": 2, "errors": 0, "self_corrections": 0, "wpm": 2, "accuracy": 100}
+    assert counted == {"total_words": 3, "correct_words": 1, "errors": 1, "self_corrections": 0, "wpm": 1, "accuracy": 50}
+
+
+def test_posted_cards_are_scored_by_the_server(client, make_user):
+    user, headers = make_user()
+    body = {
+        "user_id": 0, "total_words": 100, "correct_words": 99, "duration_seconds": 180, "wpm": 99, "accuracy": 100,
+        "cards": [
+            {"level": 1, "duration_seconds": 30, "words_presented": ["de", "kat", "loopt"], "words_read": ["de", "kat", "loopt"]},
+            {"level": 2, "duration_seconds": 30, "words_presented": ["vis", "boom", "jas"], "words_read": ["vis", "bloem"]},
+        ],
+    }
+
+    session = client.post("/session/", headers=headers, json=body).json()
+
+    assert (session["total_words"], session["correct_words"], session["duration_seconds"]) == (6, 4, 60)
+    assert session["wpm"] == 4 and session["words_read"] == ["de", "kat", "loopt", "vis", "bloem"]
+    with engine.connect() as conn:
+        stats = dict(conn.execute(
+            select(UserWordStat.word, UserWordStat.errors).where(UserWordStat.user_id == user["id"])
+        ).fetchall())
+    assert stats == {"de": 0, "kat": 0, "loopt": 0, "vis": 0, "boom": 1}
+
+
+def test_client_counts_are_ignored_once_the_card_is_known(client, make_user):
+    _, headers = make_user()
+    body = {
+        "user_id": 0, "total_words": 3, "correct_words": 3, "duration_seconds": 60, "wpm": 3, "accuracy": 100,
+        "words_presented": ["de", "kat", "loopt"], "words_read": [],
+    }
+
+    session = client.post("/session/", headers=headers, json=body).json()
+
+    assert (session["correct_words"], session["wpm"]) == (0, 0)
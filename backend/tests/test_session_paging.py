@@ -0,0 +1,98 @@
+from datetime import datetime
+
+from app.db.database import SessionLocal
+from app.models.session import ReadingSession
+
+
+def _store_sessions(user_id, count, created_at=None):
+    """Insert sessions directly; several share a created_at to exercise the id tie-break"""
+    db = SessionLocal()
+    try:
+        for i in range(count):
+            db.add(ReadingSession(
+                user_id=user_id,
+                created_at=created_at or datetime(2026, 1, 1 + i // 3),
+                duration_seconds=60, total_words=10, correct_words=i, errors=0,
+                self_corrections=0, wpm=i, accuracy=100,
+                words_presented=["de", "kat"], words_read=["de", "kat"],
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _walk(client, path, headers, **params):
+    pages, cursor = [], None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = client.get(path, headers=headers, params=query)
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+
+
+def test_unpaged_request_returns_whole_history(client, make_user):
+    user, headers = make_user()
+    _store_sessions(user["id"], 75)
+
+    response = client.get("/session/me", headers=headers)
+
+    assert len(response.json()) == 75
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_keyset_pages_cover_history_once_newest_first(client, make_user):
+    user, headers = make_user()
+    _store_sessions(user["id"], 23)
+    everything = client.get("/session/me", headers=headers).json()
+
+    pages = _walk(client, "/session/me", headers, limit=5)
+
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+    walked = [row["id"] for page in pages for row in page]
+    assert walked == [row["id"] for row in everything]
+    keys = [(row["created_at"], row["id"]) for page in pages for row in page]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_pages_are_stable_when_created_at_ties(client, make_user):
+    user, headers = make_user()
+    _store_sessions(user["id"], 7, created_at=datetime(2026, 2, 1, 12, 0))
+
+    pages = _walk(client, f"/session/user/{user['id']}", headers, limit=3)
+
+    walked = [row["id"] for page in pages for row in page]
+    assert len(walked) == len(set(walked)) == 7
+    assert walked == sorted(walked, reverse=True)
+
+
+def test_cursor_without_limit_uses_default_page_size(client, make_user):
+    from app.api.session import DEFAULT_PAGE_SIZE
+
+    user, headers = make_user()
+    _store_sessions(user["id"], DEFAULT_PAGE_SIZE + 12)
+    first = client.get("/session/me", headers=headers, params={"limit": 1})
+
+    second = client.get("/session/me", headers=headers, params={"cursor": first.headers["X-Next-Cursor"]})
+
+    assert len(second.json()) == DEFAULT_PAGE_SIZE
+    assert "X-Next-Cursor" in second.headers
+
+
+def test_summary_rows_omit_word_lists(client, make_user):
+    user, headers = make_user()
+    _store_sessions(user["id"], 2)
+
+    rows = client.get("/session/me", headers=headers, params={"limit": 2, "summary": "true"}).json()
+
+    assert rows and all("words_presented" not in row and "words_read" not in row for row in rows)
+
+
+def test_invalid_cursor_is_rejected(client, make_user):
+    user, headers = make_user()
+
+    response = client.get(f"/session/user/{user['id']}", headers=headers, params={"cursor": "bm90LWEtY3Vyc29y"})
+
+    assert response.status_code == 400
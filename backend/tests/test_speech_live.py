@@ -0,0 +1,59 @@
+import json
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.core.speech_mock import default_script
+from app.schemas.session import MAX_SESSION_WORDS
+
+
+def _read_card(ws, chunks=40):
+    for _ in range(chunks):
+        ws.send_bytes(b"\0" * 12)  # 480 bytes of "audio" is the 120 scripted words at the test pace
+
+
+def test_live_mode_scores_a_card_without_storing_it(client, make_user):
+    _, headers = make_user()
+    token = headers["Authorization"].split()[1]
+    card = default_script()
+
+    with client.websocket_connect("/api/speech/transcribe?mode=live") as ws:
+        ws.send_text(json.dumps({"type": "start", "token": token, "words": card, "level": 1}))
+        _read_card(ws)
+        ws.send_text(json.dumps({"type": "stop", "duration_seconds": 60}))
+        messages = []
+        while True:
+            message = json.loads(ws.receive_text())
+            messages.append(message)
+            if message.get("type") == "final":
+                break
+
+    progress = [m for m in messages if m["type"] == "progress"]
+    assert progress and messages[-1]["correct_words"] == progress[-1]["correct"] > 0
+    assert len(messages[-1]["words_read"]) == len(card)
+    # The test as a whole is stored once, through POST /session/
+    assert client.get("/session/me", headers=headers).json() == []
+
+
+def test_live_mode_rejects_a_bad_token(client):
+    with client.websocket_connect("/api/speech/transcribe?mode=live") as ws:
+        ws.send_text(json.dumps({"type": "start", "token": "not-a-jwt", "words": ["de"]}))
+        assert "error" in ws.receive_json()
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_text()
+
+    assert closed.value.code == 1008
+
+
+@pytest.mark.parametrize("words", [None, "de kat", ["de", 1], ["de"] * (MAX_SESSION_WORDS + 1)])
+def test_live_mode_rejects_bad_start_words(client, make_user, words):
+    _, headers = make_user()
+    token = headers["Authorization"].split()[1]
+
+    with client.websocket_connect("/api/speech/transcribe?mode=live") as ws:
+        ws.send_text(json.dumps({"type": "start", "token": token, "words": words}))
+        assert "error" in ws.receive_json()
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_text()
+
+    assert closed.value.code == 1008
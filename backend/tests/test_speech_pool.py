@@ -0,0 +1,60 @@
+import asyncio
+
+from app.core.speech_pool import SpeechSessionPool
+
+
+class FakeUpstream:
+    closed = False
+
+    async def send(self, message):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBackend:
+    name = "fake"
+    configured = True
+
+    def __init__(self):
+        self.opened = []
+
+    async def connect(self):
+        upstream = FakeUpstream()
+        self.opened.append(upstream)
+        return upstream
+
+
+def test_sessions_older_than_max_idle_are_replaced():
+    async def scenario():
+        backend = FakeBackend()
+        pool = SpeechSessionPool(backend, size=1, keepalive_seconds=3600, max_idle_seconds=0.05)
+        pool.start()
+        await asyncio.sleep(0.01)
+        stale = backend.opened[0]
+
+        await asyncio.sleep(0.1)
+        upstream, warm = await pool.acquire()
+        await asyncio.sleep(0)
+
+        assert upstream is not stale and not warm
+        assert stale.closed and pool.expired == 1
+        await pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_fresh_sessions_are_handed_out_warm():
+    async def scenario():
+        backend = FakeBackend()
+        pool = SpeechSessionPool(backend, size=1, keepalive_seconds=3600, max_idle_seconds=60)
+        pool.start()
+        await asyncio.sleep(0.01)
+
+        upstream, warm = await pool.acquire()
+
+        assert warm and upstream is backend.opened[0]
+        await pool.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,11 @@
+def test_admin_creates_a_user(client, make_user):
+    _, admin = make_user(role="admin")
+    _, student = make_user()
+    body = {"name": "Nieuw", "email": "nieuw@example.com", "password": "geheim", "age": 9, "school_group": 5}
+
+    assert client.post("/user/", json=body, headers=student).status_code == 403
+    response = client.post("/user/", json=body, headers=admin)
+
+    assert response.status_code == 200, response.text
+    assert response.json()["email"] == "nieuw@example.com"
+    assert client.post("/token", data={"username": "nieuw@example.com", "password": "geheim"}).status_code == 200
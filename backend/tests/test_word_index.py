@@ -0,0 +1,60 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.core.word_index import WordIndex
+
+
+def _index():
+    index = WordIndex()
+    index._build([
+        SimpleNamespace(id=1, text="kat", difficulty_level=1, pattern_tags="kort", syllables=1, frequency_rank=10),
+        SimpleNamespace(id=2, text="bloem", difficulty_level=2, pattern_tags="kort,bl", syllables=1, frequency_rank=20),
+    ])
+    return index
+
+
+def test_filters_match_the_words():
+    index = _index()
+
+    assert index.list_body(tag="bl").body.decode().count('"text"') == 1
+    assert index.list_body(level=1).body.decode().count('"text"') == 1
+    assert index.list_body().body.decode().count('"text"') == 2
+
+
+def test_unknown_filter_values_are_not_cached():
+    index = _index()
+
+    for i in range(100):
+        assert index.list_body(tag=f"tag-{i}").body == b"[]"
+        assert index.list_body(level=1, length=1000 + i).body == b"[]"
+
+    assert index.stats()["cached_bodies"] == 0
+
+
+def test_repeat_fetch_is_served_from_cache():
+    index = _index()
+
+    assert index.list_body(tag="kort") is index.list_body(tag="kort")
+    assert index.stats()["cached_bodies"] == 1
+
+
+def test_reloads_after_the_refresh_interval():
+    index = WordIndex(refresh_seconds=0)
+    calls = []
+
+    class Result:
+        def scalars(self):
+            return self
+
+        def all(self):
+            return [SimpleNamespace(id=len(calls), text="kat", difficulty_level=1, pattern_tags="", syllables=1, frequency_rank=1)]
+
+    class Db:
+        async def execute(self, statement):
+            calls.append(statement)
+            return Result()
+
+    asyncio.run(index.ensure_loaded(Db()))
+    asyncio.run(index.ensure_loaded(Db()))
+
+    assert len(calls) == 2 and list(index.by_id) == [2]
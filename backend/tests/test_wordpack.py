@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from app.core.wordpack import ESCAPE, MAX_WORDS, WORDS, pack_words, unpack_words
+
+
+@pytest.mark.parametrize("words", [
+    [],
+    WORDS[:50],
+    ["onbekendwoord", "zeeëgel", "café"],
+    [WORDS[0], "buiten-het-woordenboek", WORDS[1], "", WORDS[0]],
+])
+def test_round_trip(words):
+    assert unpack_words(pack_words(words)) == words
+
+
+def test_dictionary_words_take_two_bytes():
+    words = WORDS[:100]
+
+    assert len(pack_words(words)) == 3 + 2 * len(words)
+
+
+def test_newline_inside_a_word_cannot_break_the_inline_section():
+    packed = pack_words(["een\ntwee", WORDS[0]])
+
+    assert unpack_words(packed) == ["een twee", WORDS[0]]
+
+
+def test_legacy_json_rows_still_decode():
+    assert unpack_words(json.dumps(["de", "kat"]).encode()) == ["de", "kat"]
+    assert unpack_words(b"") == []
+
+
+def test_the_escape_id_is_not_a_dictionary_word():
+    assert len(WORDS) < ESCAPE
+
+
+def test_too_many_words_is_a_value_error():
+    assert unpack_words(pack_words([WORDS[0]] * MAX_WORDS)) == [WORDS[0]] * MAX_WORDS
+    with pytest.raises(ValueError):
+        pack_words([WORDS[0]] * (MAX_WORDS + 1))
+
+
+def test_session_post_caps_word_lists(client, make_user):
+    from app.schemas.session import MAX_SESSION_WORDS
+
+    _, headers = make_user()
+    response = client.post("/session/", headers=headers, json={
+        "user_id": 0, "total_words": 1, "correct_words": 1, "duration_seconds": 60,
+        "words_presented": ["de"] * (MAX_SESSION_WORDS + 1), "words_read": [],
+    })
+
+    assert response.status_code == 422
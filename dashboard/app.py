@@ -2,26 +2,62 @@ import streamlit as st
 import pandas as pd
 import requests
 import plotly.express as px
+import os
 import time
 
 # Configuration
 API_URL = "http://127.0.0.1:8000"
+# Teacher/admin bearer token for the analytics endpoints; without it, log in from the sidebar
+DASHBOARD_API_TOKEN = os.environ.get("DASHBOARD_API_TOKEN", "")
 st.set_page_config(page_title="DMT Dashboard", page_icon="📊", layout="wide")
 
+if "api_token" not in st.session_state:
+    st.session_state.api_token = DASHBOARD_API_TOKEN
+
+def auth_headers():
+    token = st.session_state.api_token
+    return {"Authorization": f"Bearer {token}"} if token else {}
+
 # Helper to fetch data
 def fetch_api(endpoint):
     try:
-        response = requests.get(f"{API_URL}{endpoint}", timeout=2)
+        response = requests.get(f"{API_URL}{endpoint}", headers=auth_headers(), timeout=2)
         if response.status_code == 200:
             return response.json()
     except requests.exceptions.RequestException:
         pass
     return None
 
+def login(email, password):
+    try:
+        response = requests.post(f"{API_URL}/token", data={"username": email, "password": password}, timeout=5)
+        if response.status_code == 200:
+            st.session_state.api_token = response.json()["access_token"]
+            return True
+    except requests.exceptions.RequestException:
+        pass
+    return False
+
 # Sidebar Navigation
 st.sidebar.title("DMT Admin")
 page = st.sidebar.radio("Go to", ["Overview (KPIs)", "Student Progress", "Content Management"])
 
+# Class analytics need a teacher or admin account
+if st.session_state.api_token:
+    if st.sidebar.button("Log out"):
+        st.session_state.api_token = ""
+        st.rerun()
+else:
+    with st.sidebar.form("login"):
+        st.write("Teacher login")
+        email = st.text_input("Email")
+        password = st.text_input("Password", type="password")
+        if st.form_submit_button("Log in"):
+            if login(email, password):
+                st.rerun()
+            else:
+                st.error("Login failed.")
+
 # -----------------------------------------------------------------------------
 # PAGE: OVERVIEW (KPIs)
 # -----------------------------------------------------------------------------
@@ -34,9 +70,10 @@ if page == "Overview (KPIs)":
     col1, col2, col3 = st.columns(3)
     
     if stats:
-        col1.metric("Active Users", stats.get("active_users_mock", 0), "+5%")
+        col1.metric("Active Users", stats.get("active_users", 0))
         col2.metric("Total Requests", stats.get("total_requests", 0), "Live")
-        col3.metric("Avg Latency", f"{stats.get('avg_latency', 0) * 1000:.1f} ms", "-5 ms")
+        p95 = stats.get("http", {}).get("requests", {}).get("p95_ms", 0)
+        col3.metric("Avg Latency", f"{stats.get('avg_latency', 0) * 1000:.1f} ms", f"p95 {p95:.1f} ms", delta_color="off")
     else:
         st.error("⚠️ Backend is offline. Ensure FastAPI is running on port 8000.")
         col1.metric("Active Users", "-", "-")
@@ -58,53 +95,70 @@ if page == "Overview (KPIs)":
 elif page == "Student Progress":
     st.title("🎓 Student Achievements")
 
-    # Fetch users
-    users = fetch_api("/user/")
-    if users:
-        user_options = {u['name']: u['id'] for u in users}
+    school_group = st.selectbox("Group", [3, 4, 5, 6, 7, 8], index=2)
+    days = st.slider("Days", 7, 180, 30)
+
+    # One request for the whole class, served from the daily rollup
+    overview = fetch_api(f"/analytics/class/{school_group}?days={days}")
+    if overview and overview["students"]:
+        students = pd.DataFrame(overview["students"])
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Students", len(students))
+        col2.metric("Active (period)", int((students["sessions"] > 0).sum()))
+        col3.metric("Sessions (period)", int(students["sessions"].sum()))
+
+        if overview["daily"]:
+            st.subheader("📈 Class Trend")
+            daily = pd.DataFrame(overview["daily"])
+            fig = px.line(daily, x="day", y=["avg_wpm", "avg_accuracy"], markers=True)
+            st.plotly_chart(fig, use_container_width=True)
+            st.bar_chart(daily.set_index("day")["sessions"])
+
+        st.subheader("📊 Level Distribution")
+        levels = pd.DataFrame(
+            [{"Level": f"DMT {level}", "Students": n} for level, n in sorted(overview["level_distribution"].items())]
+        )
+        st.bar_chart(levels.set_index("Level"))
+
+        st.dataframe(
+            students[["name", "level", "sessions", "avg_wpm", "avg_accuracy", "last_wpm", "last_active"]],
+            use_container_width=True,
+        )
+
+        user_options = {row["name"]: row["user_id"] for row in overview["students"]}
         selected_name = st.selectbox("Select Student", list(user_options.keys()))
-        
+
         if selected_name:
-            user_id = user_options[selected_name]
-            
-            # Fetch sessions
-            # sessions = fetch_api(f"/session/user/{user_id}") # Endpoint exists
-            # Using mock data for better visualization if no sessions exist
-            
+            trend = fetch_api(f"/analytics/student/{user_options[selected_name]}?days={days}")
+
             st.divider()
-            
+
             # Student Profile Header
             col1, col2 = st.columns([1, 3])
             with col1:
                 st.image("https://api.dicebear.com/7.x/avataaars/svg?seed=" + selected_name, width=150)
             with col2:
                 st.subheader(f"{selected_name}")
-                st.write("Group 5 | Level: DMT 2")
-                st.progress(75, text="Progress directly to Level 3")
+                if trend:
+                    st.write(f"Group {trend['school_group']} | Level: DMT {trend['level']} | {trend['total_sessions']} sessions")
 
             # Charts
             st.divider()
             st.subheader("📈 Reading Speed (WPM) Trend")
-            
-            # Mock trend data
-            trend_data = pd.DataFrame({
-                "Date": ["Jan 1", "Jan 3", "Jan 5", "Jan 7", "Jan 9"],
-                "WPM": [45, 48, 47, 52, 55],
-                "Accuracy": [90, 92, 91, 95, 96]
-            })
-            
-            fig = px.line(trend_data, x="Date", y=["WPM", "Accuracy"], markers=True)
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Badges
-            st.subheader("🏆 Earned Badges")
-            cols = st.columns(4)
-            cols[0].success("🚀 Speedster")
-            cols[1].info("📚 Bookworm")
-            cols[2].warning("🔥 Streak: 5 Days")
-    
+            if trend and trend["daily"]:
+                trend_data = pd.DataFrame(trend["daily"]).rename(
+                    columns={"day": "Date", "avg_wpm": "WPM", "avg_accuracy": "Accuracy"}
+                )
+                fig = px.line(trend_data, x="Date", y=["WPM", "Accuracy"], markers=True)
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("No sessions in this period.")
+
+    elif not st.session_state.api_token:
+        st.info("Log in with a teacher account (sidebar) to see class progress.")
     else:
-        st.warning("No users found or backend offline.")
+        st.warning("No students found for this group, no teacher access, or backend offline.")
 
 # -----------------------------------------------------------------------------
 # PAGE: CONTENT MANAGEMENT
@@ -131,40 +185,25 @@ elif page == "Content Management":
         if uploaded_file is not None:
             if st.button("Upload Words"):
                 try:
-                    df = pd.read_csv(uploaded_file)
-                    required_cols = {'text'}
-                    if not required_cols.issubset(df.columns):
-                        st.error(f"CSV must contain columns: {required_cols}")
+                    # One streamed request; the backend validates, dedupes and batches the rows
+                    res = requests.post(
+                        f"{API_URL}/word/bulk",
+                        data=uploaded_file.getvalue(),
+                        headers={"Content-Type": "text/csv"},
+                        timeout=120,
+                    )
+                    if res.status_code == 200:
+                        report = res.json()
+                        st.success(f"Uploaded {report['inserted']} words successfully!")
+                        if report['duplicates']:
+                            st.info(f"Skipped {report['duplicates']} words that already exist.")
+                        if report['errors']:
+                            st.warning(f"Failed to upload {len(report['errors'])} rows.")
+                            st.dataframe(pd.DataFrame(report['errors']), use_container_width=True)
                     else:
-                        success_count = 0
-                        fail_count = 0
-                        progress_bar = st.progress(0)
-                        
-                        for i, row in df.iterrows():
-                            # Default values if missing
-                            payload = {
-                                "text": str(row['text']),
-                                "difficulty_level": int(row.get('difficulty_level', 1)),
-                                "pattern_tags": str(row.get('pattern_tags', "")) if pd.notna(row.get('pattern_tags')) else None
-                            }
-                            
-                            try:
-                                res = requests.post(f"{API_URL}/word/", json=payload)
-                                if res.status_code == 200:
-                                    success_count += 1
-                                else:
-                                    fail_count += 1
-                            except:
-                                fail_count += 1
-                            
-                            progress_bar.progress((i + 1) / len(df))
-                        
-                        st.success(f"Uploaded {success_count} words successfully!")
-                        if fail_count > 0:
-                            st.warning(f"Failed to upload {fail_count} words.")
-                            
-                except Exception as e:
-                    st.error(f"Error parsing CSV: {e}")
+                        st.error(f"Upload failed: {res.text}")
+                except requests.exceptions.RequestException as e:
+                    st.error(f"Error uploading CSV: {e}")
 
 # Footer
 st.markdown("---")
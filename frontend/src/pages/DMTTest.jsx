@@ -24,6 +24,8 @@ const DMTTest = () => {
     const [timeLeft, setTimeLeft] = useState(CARD_DURATION)
     const [isActive, setIsActive] = useState(false)
     const [results, setResults] = useState({}) // { 1: score, 2: score, 3: score }
+    // Auto mode: each card's words and transcript, scored again by the server
+    const [readings, setReadings] = useState({})
 
     // Manual scoring state
     const [manualScore, setManualScore] = useState('')
@@ -110,14 +112,21 @@ const DMTTest = () => {
             setPhase('manual_score')
         } else {
             // Calculate automatic score
-            const words = recognizedText.trim().split(/\s+/).length
-            const score = Math.min(words, MOCK_CARDS[currentCard].length)
-            finishCard(score)
+            const spoken = recognizedText.trim().split(/\s+/).filter(w => w.length > 0)
+            const score = Math.min(spoken.length, MOCK_CARDS[currentCard].length)
+            finishCard(score, {
+                level: currentCard,
+                duration_seconds: CARD_DURATION - timeLeft,
+                words_presented: MOCK_CARDS[currentCard],
+                words_read: spoken
+            })
         }
     }
 
-    const finishCard = (score) => {
+    const finishCard = (score, reading = null) => {
         setResults(prev => ({ ...prev, [currentCard]: score }))
+        const finalReadings = reading ? { ...readings, [currentCard]: reading } : readings
+        setReadings(finalReadings)
 
         if (currentCard < 3) {
             setCurrentCard(c => c + 1)
@@ -132,7 +141,7 @@ const DMTTest = () => {
                 spread: 100,
                 origin: { y: 0.6 }
             })
-            saveResults({ ...results, [currentCard]: score })
+            saveResults({ ...results, [currentCard]: score }, Object.values(finalReadings))
         }
     }
 
@@ -157,7 +166,7 @@ const DMTTest = () => {
         })
     }
 
-    const saveResults = async (finalResults) => {
+    const saveResults = async (finalResults, cards) => {
         const totalScore = Object.values(finalResults).reduce((a, b) => a + b, 0)
         try {
             await fetch(`${API_BASE}/session/`, {
@@ -173,8 +182,10 @@ const DMTTest = () => {
                     duration_seconds: 180,
                     wpm: Math.round(totalScore / 3),
                     accuracy: 100,
-                    words_presented: [],
-                    words_read: [],
+                    // Sent in auto mode; the server then scores the transcripts
+                    // itself, ignores the counts above and ranks each card at
+                    // its level. Hand-scored tests stay off the leaderboards
+                    cards,
                     scoring_mode: isManualMode ? 'manual' : 'auto'
                 })
             })